@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the memory footprint and serialization cost of PhotoMetadata.
+
+Builds N in-memory records (the photo yamls under data/, cycled with a
+unique path each) two ways and measures what they hold with tracemalloc:
+
+    dict     plain __dict__ classes laid out like PhotoMetadata / Location
+             before they got __slots__
+    slots    photo_metadata.PhotoMetadata / Location
+
+then times converting every record back to the YAML schema: the old
+reflective obj_to_dict() over __dict__ against PhotoMetadata.to_dict().
+
+Usage:
+    python3 benchmarks/bench_memory.py [--count 20000] [--runs 5]
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts' / 'atomic' / 'utils'))
+
+from photo_metadata import PhotoMetadata  # noqa: E402
+from yaml_io import load_yaml  # noqa: E402
+
+
+class DictLocation:
+    def __init__(self, sublocation=None, city=None, state=None, country=None):
+        self.sublocation = sublocation
+        self.city = city
+        self.state = state
+        self.country = country
+
+
+class DictPhotoMetadata:
+    def __init__(self, path):
+        self.path = path
+        self.keywords = []
+        self.location = None
+        self.rating = None
+        self.date = None
+        self.camera_make = None
+        self.camera_model = None
+        self.lens_model = None
+        self.focal_length = None
+        self.aperture = None
+        self.shutter_speed = None
+        self.iso = None
+        self.dhash = None
+
+
+def dict_from_record(record):
+    metadata = DictPhotoMetadata(record['path'])
+    metadata.keywords = list(record.get('keywords') or [])
+    if record.get('location') is not None:
+        metadata.location = DictLocation(**record['location'])
+    for field in PhotoMetadata.SCALAR_FIELDS:
+        setattr(metadata, field, record.get(field))
+    return metadata
+
+
+def obj_to_dict(obj):
+    """The reflective conversion generate_photo_metadata_files used to do."""
+    if obj is None:
+        return None
+    elif isinstance(obj, (str, int, float, bool)):
+        return obj
+    elif isinstance(obj, Path):
+        return str(obj)
+    elif isinstance(obj, list):
+        return [obj_to_dict(item) for item in obj]
+    elif hasattr(obj, '__dict__'):
+        return {key: obj_to_dict(value) for key, value in obj.__dict__.items()}
+    else:
+        return obj
+
+
+def load_records(count):
+    templates = [r for r in (load_yaml(p) for p in sorted((REPO_ROOT / 'data' / 'photos').rglob('*.yaml')))
+                 if isinstance(r, dict) and r.get('path')]
+    if not templates:
+        print("No photo yamls under data/photos", file=sys.stderr)
+        sys.exit(1)
+    records = []
+    for i in range(count):
+        record = dict(templates[i % len(templates)])
+        record['path'] = f"{i:06d}/{record['path']}"
+        records.append(record)
+    return records
+
+
+def measure(build, records):
+    """Bytes allocated to hold build(record) for every record."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(r) for r in records]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, after - before
+
+
+def best_of(fn, objects, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for obj in objects:
+            fn(obj)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark PhotoMetadata memory and to_dict')
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_records(args.count)
+
+    dict_objects, dict_bytes = measure(dict_from_record, records)
+    slot_objects, slot_bytes = measure(PhotoMetadata.from_dict, records)
+
+    # Both conversions must produce the yaml schema exactly
+    for old, new in zip(dict_objects, slot_objects):
+        assert obj_to_dict(old) == new.to_dict()
+
+    print(f"Records: {args.count}  Runs: {args.runs}")
+    print("-" * 60)
+    print(f"  dict   {dict_bytes / 1024 / 1024:7.2f} MiB   {dict_bytes / args.count:6.0f} B/record")
+    print(f"  slots  {slot_bytes / 1024 / 1024:7.2f} MiB   {slot_bytes / args.count:6.0f} B/record")
+    print(f"  Saved: {(dict_bytes - slot_bytes) / args.count:.0f} B/record "
+          f"({1 - slot_bytes / dict_bytes:.0%})")
+    print("-" * 60)
+
+    before = best_of(obj_to_dict, dict_objects, args.runs)
+    after = best_of(PhotoMetadata.to_dict, slot_objects, args.runs)
+    print(f"  obj_to_dict  best {before * 1000:7.1f} ms")
+    print(f"  to_dict      best {after * 1000:7.1f} ms")
+    print(f"  Speedup: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
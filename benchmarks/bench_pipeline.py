@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the photo pipeline stages on synthetic corpora.
+
+Generates a corpus of JPGs laid out like an ingested library
+(photos/<year>/<state>/<city>/<name>.jpg), each carrying an EXIF block and a
+Lightroom Classic style XMP packet (develop settings, location, keywords,
+rating, padding) with varied values. Pixel data is a handful of textured
+images encoded once; only the metadata differs between files, so building
+even the 10k corpus takes seconds. Smaller corpora are hard links into the
+largest one.
+
+For each corpus size it times:
+
+    get_metadata              per photo, cache bypassed (header parse only)
+    generate_metadata_files   per run, from an empty data/ and metadata cache
+    scan_photos               per run, sync_collection's filter query over
+                              data/catalog.json
+    generate_one              per photo, both webp variants, over a sample of
+                              --encode-sample photos
+    sync_to_r2                per run, r2/ (two variants per photo) into an
+                              empty bucket on a local S3 stand-in (moto;
+                              skipped if it isn't installed)
+
+Each stage runs in a fresh process, so imports are cold and its peak RSS
+(the larger of the process and its worker pool) is its own. Reported per
+stage: throughput, p50/p95 latency (per photo or per run as noted) and peak
+RSS. Results are written as JSON keyed by the current commit, and --compare
+prints the change against an earlier results file.
+
+Nothing under the repo's photos/, data/, r2/ or .cache/ is touched.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py [--sizes 100,1000,10000]
+        [--resolution 1200x800] [--runs 3] [--encode-sample 50] [--jobs N]
+        [--stages get_metadata,...] [--output FILE] [--compare FILE]
+
+Requires Pillow and PyYAML; moto (pip3 install moto) for sync_to_r2.
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import struct
+import argparse
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts' / 'atomic' / 'utils'))
+
+from parallel import default_jobs  # noqa: E402
+
+RESULTS_DIR = REPO_ROOT / 'benchmarks' / 'results'
+
+STAGES = ('get_metadata', 'generate_metadata_files', 'scan_photos', 'generate_one', 'sync_to_r2')
+
+# Distinct pixel payloads the corpus cycles through
+BASE_IMAGES = 8
+
+PLACES = [
+    ('Pike Place Market', 'Seattle', 'Washington', 'USA'),
+    (None, 'Seattle', 'Washington', 'USA'),
+    (None, 'Tacoma', 'Washington', 'USA'),
+    ('Mission District', 'San Francisco', 'California', 'USA'),
+    (None, 'Los Angeles', 'California', 'USA'),
+    (None, 'Portland', 'Oregon', 'USA'),
+    ('Shibuya', 'Tokyo', 'Tokyo', 'Japan'),
+    (None, 'Kyoto', 'Kyoto', 'Japan'),
+    (None, 'Reykjavik', 'Capital Region', 'Iceland'),
+    (None, None, None, None),
+]
+KEYWORDS = ['street', 'urban', 'night', 'portrait', 'landscape', 'architecture', 'rain', 'neon',
+            'film', 'black and white', 'people', 'water', 'mountains', 'travel', 'food']
+CAMERAS = [
+    ('SONY', 'ILCE-7CM2', 'FE 40mm F2.5 G'),
+    ('SONY', 'ILCE-7CM2', 'FE 24-105mm F4 G OSS'),
+    ('FUJIFILM', 'X100V', None),
+    ('Canon', 'Canon EOS R6', 'RF24-70mm F2.8 L IS USM'),
+]
+SHUTTER_SPEEDS = [(1, 1000), (1, 500), (1, 250), (1, 125), (1, 60), (1, 15), (2, 1)]
+APERTURES = [(14, 10), (2, 1), (28, 10), (4, 1), (56, 10), (8, 1), (11, 1)]
+ISOS = [100, 200, 400, 800, 1600, 3200, 6400]
+
+# Lightroom writes the full develop settings into every export
+CRS_SETTINGS = ''.join(f'\n   crs:{name}="{value}"' for name, value in [
+    ('Version', '16.0'), ('ProcessVersion', '15.4'), ('WhiteBalance', 'As Shot'),
+    ('Temperature', '5350'), ('Tint', '+8'), ('Exposure2012', '+0.35'), ('Contrast2012', '+12'),
+    ('Highlights2012', '-48'), ('Shadows2012', '+31'), ('Whites2012', '+9'), ('Blacks2012', '-14'),
+    ('Texture', '+6'), ('Clarity2012', '+10'), ('Dehaze', '+4'), ('Vibrance', '+11'),
+    ('Saturation', '-3'), ('ParametricShadows', '0'), ('ParametricDarks', '0'),
+    ('ParametricLights', '0'), ('ParametricHighlights', '0'), ('ParametricShadowSplit', '25'),
+    ('ParametricMidtoneSplit', '50'), ('ParametricHighlightSplit', '75'), ('Sharpness', '40'),
+    ('SharpenRadius', '+1.0'), ('SharpenDetail', '25'), ('SharpenEdgeMasking', '0'),
+    ('LuminanceSmoothing', '0'), ('ColorNoiseReduction', '25'), ('ColorNoiseReductionDetail', '50'),
+    ('ColorNoiseReductionSmoothness', '50'), ('HueAdjustmentRed', '0'), ('HueAdjustmentOrange', '-4'),
+    ('HueAdjustmentYellow', '0'), ('HueAdjustmentGreen', '+6'), ('HueAdjustmentAqua', '0'),
+    ('HueAdjustmentBlue', '-8'), ('SaturationAdjustmentRed', '0'), ('SaturationAdjustmentOrange', '+5'),
+    ('SaturationAdjustmentBlue', '-12'), ('LuminanceAdjustmentOrange', '+7'),
+    ('LuminanceAdjustmentBlue', '-10'), ('SplitToningShadowHue', '220'),
+    ('SplitToningShadowSaturation', '8'), ('SplitToningHighlightHue', '45'),
+    ('SplitToningHighlightSaturation', '6'), ('SplitToningBalance', '+10'),
+    ('ColorGradeMidtoneHue', '0'), ('ColorGradeGlobalHue', '0'), ('ColorGradeBlending', '50'),
+    ('GrainAmount', '12'), ('GrainSize', '25'), ('GrainFrequency', '50'),
+    ('LensProfileEnable', '1'), ('LensManualDistortionAmount', '0'), ('VignetteAmount', '0'),
+    ('PostCropVignetteAmount', '-11'), ('PostCropVignetteMidpoint', '50'),
+    ('PostCropVignetteFeather', '50'), ('PostCropVignetteRoundness', '0'),
+    ('PostCropVignetteStyle', '1'), ('ShadowTint', '0'), ('RedHue', '0'), ('RedSaturation', '0'),
+    ('GreenHue', '0'), ('GreenSaturation', '0'), ('BlueHue', '0'), ('BlueSaturation', '0'),
+    ('AutoLateralCA', '1'), ('Exposure', '+0.35'), ('Contrast', '+12'), ('ConvertToGrayscale', 'False'),
+    ('OverrideLookVignette', 'False'), ('ToneCurveName2012', 'Linear'), ('CameraProfile', 'Adobe Standard'),
+    ('HasSettings', 'True'), ('CropTop', '0.02'), ('CropLeft', '0.01'), ('CropBottom', '0.98'),
+    ('CropRight', '0.99'), ('CropAngle', '0'), ('CropConstrainToWarp', '0'), ('HasCrop', 'True'),
+    ('AlreadyApplied', 'True'),
+])
+
+XMP_TEMPLATE = '''<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>
+<x:xmpmeta xmlns:x="adobe:ns:meta/" x:xmptk="Adobe XMP Core 7.0-c000 1.000000, 0000/00/00-00:00:00        ">
+ <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+  <rdf:Description rdf:about=""
+    xmlns:xmp="http://ns.adobe.com/xap/1.0/"
+    xmlns:xmpMM="http://ns.adobe.com/xap/1.0/mm/"
+    xmlns:stEvt="http://ns.adobe.com/xap/1.0/sType/ResourceEvent#"
+    xmlns:dc="http://purl.org/dc/elements/1.1/"
+    xmlns:photoshop="http://ns.adobe.com/photoshop/1.0/"
+    xmlns:Iptc4xmpCore="http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/"
+    xmlns:lr="http://ns.adobe.com/lightroom/1.0/"
+    xmlns:crs="http://ns.adobe.com/camera-raw-settings/1.0/"
+   xmp:CreatorTool="Adobe Photoshop Lightroom Classic 13.0 (Macintosh)"
+   xmp:ModifyDate="{date_iso}"
+   xmp:CreateDate="{date_iso}"
+   xmp:MetadataDate="{date_iso}"
+   xmp:Rating="{rating}"
+   xmpMM:DocumentID="xmp.did:{doc_id}"
+   xmpMM:OriginalDocumentID="{original_id}"
+   xmpMM:InstanceID="xmp.iid:{instance_id}"
+   photoshop:DateCreated="{date_iso}"{location}{crs}>
+   <xmpMM:History>
+    <rdf:Seq>
+     <rdf:li stEvt:action="derived" stEvt:parameters="converted from image/x-sony-arw to image/jpeg, saved to new location"/>
+     <rdf:li stEvt:action="saved" stEvt:instanceID="xmp.iid:{instance_id}" stEvt:when="{date_iso}"
+      stEvt:softwareAgent="Adobe Photoshop Lightroom Classic 13.0 (Macintosh)" stEvt:changed="/"/>
+    </rdf:Seq>
+   </xmpMM:History>
+   <dc:subject>
+    <rdf:Bag>{subjects}
+    </rdf:Bag>
+   </dc:subject>
+   <lr:hierarchicalSubject>
+    <rdf:Bag>{hierarchical}
+    </rdf:Bag>
+   </lr:hierarchicalSubject>
+  </rdf:Description>
+ </rdf:RDF>
+</x:xmpmeta>
+{padding}
+<?xpacket end="w"?>'''
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def _app1(payload):
+    """A JPEG APP1 segment holding payload."""
+    return b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+
+
+def base_jpegs(resolution, seed):
+    """Encode BASE_IMAGES textured images once, without metadata."""
+    from PIL import Image, ImageFilter
+
+    width, height = resolution
+    rnd = random.Random(seed)
+    encoded = []
+    for _ in range(BASE_IMAGES):
+        coarse = Image.new('RGB', (48, 32))
+        coarse.putdata([(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)) for _ in range(48 * 32)])
+        img = coarse.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+        noise = Image.effect_noise((width, height), 24).convert('RGB')
+        img = Image.blend(img, noise, 0.15)
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality=90)
+        encoded.append(buf.getvalue())
+    return encoded
+
+
+def exif_block(rnd, date):
+    """An EXIF APP1 payload with Lightroom's usual camera fields."""
+    from PIL import Image
+    from PIL.TiffImagePlugin import IFDRational
+
+    make, model, lens = rnd.choice(CAMERAS)
+    exif = Image.Exif()
+    exif[0x010F] = make
+    exif[0x0110] = model
+    exif[0x0131] = 'Adobe Photoshop Lightroom Classic 13.0 (Macintosh)'
+    exif[0x0132] = date
+    ifd = exif.get_ifd(0x8769)
+    ifd[0x9003] = date
+    ifd[0x9004] = date
+    if lens:
+        ifd[0xA434] = lens
+    ifd[0x920A] = IFDRational(rnd.choice([24, 35, 40, 50, 70, 85, 105]), 1)
+    ifd[0x829D] = IFDRational(*rnd.choice(APERTURES))
+    ifd[0x829A] = IFDRational(*rnd.choice(SHUTTER_SPEEDS))
+    ifd[0x8827] = rnd.choice(ISOS)
+    return exif.tobytes()
+
+
+def xmp_block(rnd, index, date, place):
+    """A Lightroom-style XMP APP1 payload."""
+    sublocation, city, state, country = place
+    location = ''
+    if sublocation:
+        location += f'\n   Iptc4xmpCore:Location="{sublocation}"'
+    if city:
+        location += f'\n   photoshop:City="{city}"\n   photoshop:State="{state}"\n   photoshop:Country="{country}"'
+    keywords = rnd.sample(KEYWORDS, rnd.randint(1, 5))
+    date_iso = date.replace(':', '-', 2).replace(' ', 'T')
+    packet = XMP_TEMPLATE.format(
+        date_iso=date_iso,
+        rating=rnd.randint(0, 5),
+        doc_id=f'{rnd.getrandbits(128):032x}',
+        original_id=f'{rnd.getrandbits(128):032X}',
+        instance_id=f'{index:08x}-{rnd.getrandbits(64):016x}',
+        location=location,
+        crs=CRS_SETTINGS,
+        subjects=''.join(f'\n     <rdf:li>{kw.title()}</rdf:li>' for kw in keywords),
+        hierarchical=''.join(f'\n     <rdf:li>Subjects|{kw.title()}</rdf:li>' for kw in keywords),
+        padding=(' ' * 99 + '\n') * 20,
+    )
+    return b'http://ns.adobe.com/xap/1.0/\x00' + packet.encode('utf-8')
+
+
+def build_corpus(corpus_dir, count, resolution, seed):
+    """
+    Write count JPGs under corpus_dir/photos.
+
+    Returns:
+        Photo paths relative to photos/, in creation order
+    """
+    from ingest_photos import sanitize_location
+
+    rnd = random.Random(seed)
+    bases = base_jpegs(resolution, seed)
+    photos_dir = corpus_dir / 'photos'
+    rel_paths = []
+    for i in range(count):
+        year = rnd.randint(2019, 2025)
+        date = (f'{year}:{rnd.randint(1, 12):02d}:{rnd.randint(1, 28):02d} '
+                f'{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}')
+        place = rnd.choice(PLACES)
+        parts = [sanitize_location(p) for p in (place[2], place[1]) if p] or ['unknown-location']
+        name = f"{place[1] or 'Untitled'}-{place[2] or 'Unknown'}-{i:05d}.jpg".replace(' ', '-')
+        rel = '/'.join([str(year)] + parts + [name])
+
+        base = bases[i % len(bases)]
+        data = base[:2] + _app1(exif_block(rnd, date)) + _app1(xmp_block(rnd, i, date, place)) + base[2:]
+        dest = photos_dir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(data)
+        rel_paths.append(rel)
+    return rel_paths
+
+
+def link_tree(source_root, dest_root, rel_paths):
+    """Hard-link (or copy) the given files from one tree into another."""
+    for rel in rel_paths:
+        dest = dest_root / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source_root / rel, dest)
+        except OSError:
+            shutil.copy2(source_root / rel, dest)
+
+
+def build_r2_tree(r2_dir, rel_paths, resolution, seed):
+    """Fill r2/{large,small}/ with a webp per photo (hard links to a few encodes)."""
+    from PIL import Image
+
+    encoded = {}
+    for name, size in (('large', 2400), ('small', 800)):
+        encoded[name] = []
+        for i, jpeg in enumerate(base_jpegs(resolution, seed)[:4]):
+            img = Image.open(io.BytesIO(jpeg))
+            img.thumbnail((size, size))
+            path = r2_dir / '.bench' / f'{name}-{i}.webp'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            img.save(path, 'WEBP', quality=85)
+            encoded[name].append(path)
+    for i, rel in enumerate(rel_paths):
+        for name, sources in encoded.items():
+            dest = r2_dir / name / Path(rel).with_suffix('.webp')
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.link(sources[i % len(sources)], dest)
+    shutil.rmtree(r2_dir / '.bench')
+
+
+# ============================================================================
+# Stages (each run in a fresh process by run_stage)
+# ============================================================================
+
+def _use_scratch_cache(root):
+    """Point the metadata cache at a database under root."""
+    import metadata_cache
+    import photo_metadata
+
+    db_path = Path(root) / '.cache' / 'photo-metadata.sqlite'
+    if db_path.exists():
+        db_path.unlink()
+    photo_metadata._cache = metadata_cache.MetadataCache(db_path=db_path, root=root)
+    return photo_metadata._cache
+
+
+def stage_get_metadata(ctx):
+    from photo_metadata import get_metadata
+
+    photos_dir = Path(ctx['root']) / 'photos'
+    timings = []
+    for rel in ctx['rel_paths']:
+        start = time.perf_counter()
+        metadata = get_metadata(photos_dir / rel, use_cache=False)
+        timings.append(time.perf_counter() - start)
+        assert metadata is not None, rel
+    return timings
+
+
+def stage_generate_metadata_files(ctx):
+    from generate_photo_metadata_files import generate_metadata_files
+
+    root = Path(ctx['root'])
+    timings = []
+    for _ in range(ctx['runs']):
+        shutil.rmtree(root / 'data', ignore_errors=True)
+        cache = _use_scratch_cache(root)
+        start = time.perf_counter()
+        stats = generate_metadata_files(root / 'photos', root / 'data' / 'photos', jobs=ctx['jobs'])
+        cache.commit()
+        timings.append(time.perf_counter() - start)
+        assert stats['created'] == len(ctx['rel_paths']) and not stats['errors'], stats
+        cache.close()
+    return timings
+
+
+def stage_scan_photos(ctx):
+    from sync_collection import scan_photos
+
+    root = Path(ctx['root'])
+    _use_scratch_cache(root)
+    filters = {'keywords': 'street', 'rating': '3+'}
+    timings = []
+    for _ in range(ctx['runs']):
+        start = time.perf_counter()
+        scan_photos(root, filters)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def stage_generate_one(ctx):
+    from build_r2 import generate_one
+
+    root = Path(ctx['root'])
+    r2_dir = root / 'r2-encode'
+    timings = []
+    for rel in ctx['rel_paths'][:ctx['encode_sample']]:
+        start = time.perf_counter()
+        _, status, _, _ = generate_one(str(root / 'photos' / rel), str(root / 'photos'), str(r2_dir))
+        timings.append(time.perf_counter() - start)
+        assert not status.startswith('error'), status
+    shutil.rmtree(r2_dir, ignore_errors=True)
+    return timings
+
+
+def stage_sync_to_r2(ctx):
+    import boto3
+    from moto import mock_aws
+    from sync_to_r2 import sync_directory
+
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    r2_dir = Path(ctx['root']) / 'r2'
+    timings = []
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        for run in range(ctx['runs']):
+            bucket = f'bench-{run}'
+            client.create_bucket(Bucket=bucket)
+            (r2_dir / '.sync-state.json').unlink(missing_ok=True)
+            start = time.perf_counter()
+            ok = sync_directory(r2_dir, '', workers=ctx['workers'], client=client, bucket_name=bucket)
+            timings.append(time.perf_counter() - start)
+            assert ok
+    return timings
+
+
+# Stage -> (function, unit its latencies are measured per)
+STAGE_FUNCTIONS = {
+    'get_metadata': (stage_get_metadata, 'photo'),
+    'generate_metadata_files': (stage_generate_metadata_files, 'run'),
+    'scan_photos': (stage_scan_photos, 'run'),
+    'generate_one': (stage_generate_one, 'photo'),
+    'sync_to_r2': (stage_sync_to_r2, 'run'),
+}
+
+
+def peak_rss_mb():
+    """Peak RSS of this process or its largest finished child, in MiB."""
+    import resource
+
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    try:
+        # On Linux ru_maxrss carries over the spawning parent's RSS; VmHWM
+        # starts over at exec
+        with open('/proc/self/status') as f:
+            own = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = max(own, children)
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _stage_process(stage, ctx):
+    fn, _ = STAGE_FUNCTIONS[stage]
+    # The stages' own progress output would bury the results
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        timings = fn(ctx)
+    return timings, peak_rss_mb()
+
+
+def run_stage(stage, ctx):
+    """Run one stage in a fresh interpreter; returns (timings, peak RSS MiB)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as ex:
+        return ex.submit(_stage_process, stage, ctx).result()
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def percentile(values, fraction):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(size, stage, unit, timings, rss_mb):
+    """One result row."""
+    total = sum(timings)
+    if unit == 'photo':
+        throughput = len(timings) / total if total else None
+    else:
+        throughput = size / percentile(timings, 0.5) if timings else None
+    return {
+        'size': size,
+        'stage': stage,
+        'unit': unit,
+        'samples': len(timings),
+        'throughput_per_s': throughput,
+        'p50_ms': percentile(timings, 0.5) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'total_s': total,
+        'peak_rss_mb': rss_mb,
+    }
+
+
+def git_commit():
+    """(commit sha, working tree dirty) of the repo, or (None, None)."""
+    try:
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return sha, bool(status.strip())
+
+
+def print_row(row):
+    throughput = f"{row['throughput_per_s']:9.1f}/s" if row['throughput_per_s'] else '        -  '
+    print(f"  {row['stage']:24s} {throughput}  p50 {row['p50_ms']:9.1f} ms  p95 {row['p95_ms']:9.1f} ms"
+          f"  /{row['unit']:5s}  {row['peak_rss_mb']:7.1f} MiB")
+
+
+def print_comparison(results, baseline):
+    """Print p50 / throughput changes against an earlier results file."""
+    before = {(r['size'], r['stage']): r for r in baseline['results']}
+    print(f"Against {str(baseline.get('commit'))[:12]}:")
+    for row in results:
+        old = before.get((row['size'], row['stage']))
+        if old is None:
+            continue
+        speedup = old['p50_ms'] / row['p50_ms'] if row['p50_ms'] else float('inf')
+        rss = row['peak_rss_mb'] - old['peak_rss_mb']
+        print(f"  {row['size']:6d}  {row['stage']:24s} p50 {old['p50_ms']:9.1f} → {row['p50_ms']:9.1f} ms"
+              f"  Speedup: {speedup:.2f}x  RSS {rss:+.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the photo pipeline on synthetic corpora')
+    parser.add_argument('--sizes', default='100,1000,10000', help='Corpus sizes (default: 100,1000,10000)')
+    parser.add_argument('--resolution', default='1200x800', help='Photo size WxH (default: 1200x800)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs of each per-run stage (default: 3)')
+    parser.add_argument('--encode-sample', type=int, default=50,
+                        help='Photos encoded by generate_one per size (default: 50)')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for generate_metadata_files (default: one per core)')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent uploads for sync_to_r2 (default: 16)')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Stages to run (default: all)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', type=Path, help='Keep corpora here instead of a temp dir')
+    parser.add_argument('--output', type=Path, help='Results file (default: benchmarks/results/pipeline-<commit>.json)')
+    parser.add_argument('--compare', type=Path, metavar='FILE', help='Earlier results file to compare with')
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(','))
+    resolution = tuple(int(v) for v in args.resolution.lower().split('x'))
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGE_FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (expected {', '.join(STAGES)})")
+    if 'sync_to_r2' in stages:
+        try:
+            import moto  # noqa: F401
+        except ImportError:
+            print("moto is not installed (pip3 install moto): skipping sync_to_r2", file=sys.stderr)
+            stages.remove('sync_to_r2')
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix='bench-pipeline-'))
+    workdir.mkdir(parents=True, exist_ok=True)
+    commit, dirty = git_commit()
+
+    print(f"Sizes: {', '.join(map(str, sizes))}  Resolution: {resolution[0]}x{resolution[1]}  "
+          f"Runs: {args.runs}  Jobs: {args.jobs}")
+    print(f"Commit: {(commit or 'unknown')[:12]}{' (dirty)' if dirty else ''}  Workdir: {workdir}")
+
+    results = []
+    try:
+        start = time.perf_counter()
+        corpus = workdir / 'corpus'
+        shutil.rmtree(corpus, ignore_errors=True)
+        rel_paths = build_corpus(corpus, sizes[-1], resolution, args.seed)
+        print(f"Corpus: {len(rel_paths)} photos in {time.perf_counter() - start:.1f}s")
+
+        for size in sizes:
+            root = workdir / f'n{size}'
+            shutil.rmtree(root, ignore_errors=True)
+            subset = rel_paths[:size]
+            link_tree(corpus / 'photos', root / 'photos', subset)
+            if 'sync_to_r2' in stages:
+                build_r2_tree(root / 'r2', subset, resolution, args.seed)
+            ctx = {'root': str(root), 'rel_paths': subset, 'runs': args.runs, 'jobs': args.jobs,
+                   'workers': args.workers, 'encode_sample': args.encode_sample}
+
+            print("-" * 60)
+            print(f"{size} photos")
+            # scan_photos reads the catalog generate_metadata_files writes
+            if 'scan_photos' in stages and 'generate_metadata_files' not in stages:
+                run_stage('generate_metadata_files', dict(ctx, runs=1))
+            for stage in STAGES:
+                if stage not in stages:
+                    continue
+                timings, rss_mb = run_stage(stage, ctx)
+                row = summarize(size, stage, STAGE_FUNCTIONS[stage][1], timings, rss_mb)
+                results.append(row)
+                print_row(row)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {'sizes': sizes, 'resolution': list(resolution), 'runs': args.runs,
+                   'encode_sample': args.encode_sample, 'jobs': args.jobs, 'workers': args.workers,
+                   'seed': args.seed},
+        'results': results,
+    }
+    output = args.output or RESULTS_DIR / f"pipeline-{(commit or 'unknown')[:12]}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + '\n')
+    print("-" * 60)
+    print(f"Results: {output}")
+
+    if args.compare:
+        print_comparison(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark build_r2's variant pipeline against the per-variant full-res path.
+
+Generates a synthetic full-resolution JPG, then times producing every
+variant in VARIANTS two ways:
+
+    baseline  decode at full size, resize each variant from full-res
+    pipeline  build_r2.open_for_variants + resize_variants (draft decode,
+              cascaded resizes)
+
+Encoding to webp is excluded by default since it is the same for both;
+pass --encode to include it.
+
+Usage:
+    python3 benchmarks/bench_resize.py [--width 6000] [--height 4000]
+        [--runs 5] [--encode]
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'atomic' / 'utils'))
+
+from PIL import Image, ImageFilter, ImageOps  # noqa: E402
+import build_r2  # noqa: E402
+
+
+def make_source(path, width, height):
+    """Write a noisy full-res JPG (noise keeps the encoder honest)."""
+    noise = Image.effect_noise((width, height), 64).convert('RGB')
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    Image.blend(noise, gradient, 0.5).save(path, 'JPEG', quality=92)
+
+
+def encode(img):
+    img.save(io.BytesIO(), 'WEBP', quality=build_r2.QUALITY, method=6)
+
+
+def run_baseline(src, do_encode):
+    with Image.open(src) as img:
+        img = ImageOps.exif_transpose(img)
+        for spec in build_r2.VARIANTS.values():
+            longest = max(img.width, img.height)
+            if longest <= spec['size']:
+                resized = img
+            else:
+                scale = spec['size'] / longest
+                resized = img.resize((round(img.width * scale), round(img.height * scale)), Image.LANCZOS)
+                resized = resized.filter(ImageFilter.UnsharpMask(**build_r2.UNSHARP))
+            if do_encode:
+                encode(resized)
+
+
+def run_pipeline(src, do_encode):
+    with build_r2.open_for_variants(src) as img:
+        img = ImageOps.exif_transpose(img)
+        for _, resized in build_r2.resize_variants(img):
+            if do_encode:
+                encode(resized)
+
+
+def time_runs(fn, src, runs, do_encode):
+    fn(src, do_encode)  # warm up
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(src, do_encode)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark build_r2 variant generation')
+    parser.add_argument('--width', type=int, default=6000)
+    parser.add_argument('--height', type=int, default=4000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--encode', action='store_true', help='Include webp encoding in the timings')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / 'source.jpg'
+        make_source(src, args.width, args.height)
+
+        sizes = ', '.join(f"{name} {spec['size']}px" for name, spec in build_r2.VARIANTS.items())
+        print(f"Source: {args.width}x{args.height}  Variants: {sizes}")
+        print(f"Runs: {args.runs}{'  (including webp encode)' if args.encode else ''}")
+        print("-" * 60)
+
+        results = {}
+        for label, fn in (('baseline', run_baseline), ('pipeline', run_pipeline)):
+            timings = time_runs(fn, src, args.runs, args.encode)
+            best = min(timings)
+            results[label] = best
+            print(f"  {label:<9} best {best * 1000:8.1f} ms   {1 / best:6.2f} photos/s")
+
+        print("-" * 60)
+        print(f"Speedup: {results['baseline'] / results['pipeline']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
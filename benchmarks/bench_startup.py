@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the import cost of every atomic entry point against a budget.
+
+For each wrapper in scripts/atomic/, imports the util module it runs in a
+fresh interpreter under `python -X importtime` and takes that module's
+cumulative import time, best of --runs. This is what a script pays before
+its first line of work: usage errors, --help and "nothing to do" runs
+cost little more. Interpreter startup and site-packages .pth files are
+excluded, since no script can do anything about them.
+
+Also lists which heavy dependencies (PyYAML, PIL, boto3, ...) each import
+pulled in; all of them are meant to load at first use, not at import.
+
+Exits 1 if any entry point is over its budget in BUDGETS_MS.
+
+Usage:
+    python3 benchmarks/bench_startup.py [--runs 5]
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ATOMIC_DIR = REPO_ROOT / 'scripts' / 'atomic'
+UTILS_DIR = ATOMIC_DIR / 'utils'
+
+# Import budget per wrapper, in ms: about twice what each costs today, and
+# well under what importing PyYAML (~25 ms), PIL or boto3 eagerly adds
+BUDGETS_MS = {
+    'add-to-collection': 25,
+    'build-and-sync-r2': 30,
+    'build-r2': 25,
+    'create-collection': 25,
+    'delete-photo': 25,
+    'generate-photo-metadata-files': 25,
+    'ingest-photos': 20,
+    'rebuild-collection-index': 25,
+    'remove-from-collection': 25,
+    'sync-collection': 25,
+    'sync-to-r2': 25,
+    'update-collection': 25,
+    'watch-imports': 40,
+}
+
+HEAVY_MODULES = ('yaml', 'PIL', 'boto3', 'botocore', 'watchdog', 'concurrent.futures', 'sqlite3')
+
+WRAPPER_TARGET = re.compile(r'utils/(\w+)\.py')
+IMPORT_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def entry_points():
+    """Return (wrapper name, util module) for every atomic wrapper."""
+    entries = []
+    for wrapper in sorted(ATOMIC_DIR.iterdir()):
+        if not wrapper.is_file():
+            continue
+        match = WRAPPER_TARGET.search(wrapper.read_text())
+        if match:
+            entries.append((wrapper.name, match.group(1)))
+    return entries
+
+
+def import_profile(module, env):
+    """
+    Import module in a fresh interpreter with -X importtime.
+
+    Returns:
+        (cumulative import time of module in ms, set of modules imported)
+    """
+    code = f"import sys; sys.path.insert(0, {str(UTILS_DIR)!r}); import {module}"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    total = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(3))
+        if not match.group(2) and match.group(3) == module:
+            total = int(match.group(1)) / 1000
+    return total, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark atomic entry point import time')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    # Let the first run write bytecode so compiling isn't counted
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    entries = entry_points()
+    print(f"Entry points: {len(entries)}  Runs: {args.runs}")
+    print("-" * 60)
+
+    over = []
+    for wrapper, module in entries:
+        import_profile(module, env)
+        timings = []
+        for _ in range(args.runs):
+            ms, imported = import_profile(module, env)
+            timings.append(ms)
+        best = min(timings)
+        budget = BUDGETS_MS.get(wrapper)
+        heavy = [name for name in HEAVY_MODULES if name in imported]
+
+        if budget is None:
+            status = 'no budget'
+        elif best > budget:
+            status = 'OVER'
+            over.append(wrapper)
+        else:
+            status = 'ok'
+        budget_text = f"{budget:4d}" if budget is not None else '   -'
+        print(f"  {wrapper:32s} {best:6.1f} ms / {budget_text} ms  {status}")
+        if heavy:
+            print(f"  {'':32s} loads {', '.join(heavy)}")
+
+    print("-" * 60)
+    if over:
+        print(f"Over budget: {', '.join(over)}")
+        sys.exit(1)
+    print("All entry points within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark yaml_io against plain yaml.safe_load / yaml.dump on the real data/.
+
+Reads every yaml under data/ (read-only) and times, per pass over all of
+them:
+
+    load  yaml.safe_load          vs  yaml_io.load_yaml
+    dump  yaml.dump(... repo style) vs  yaml_io.dump_yaml
+
+It also checks that yaml_io renders every document byte-for-byte the same
+as yaml.dump, and exits non-zero if any differ.
+
+Usage:
+    python3 benchmarks/bench_yaml.py [--data data] [--runs 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts' / 'atomic' / 'utils'))
+
+import yaml  # noqa: E402
+import yaml_io  # noqa: E402
+
+
+def baseline_load(path):
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def baseline_dump(data):
+    return yaml.dump(data, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+
+def best_of(fn, items, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark yaml_io on the data/ tree')
+    parser.add_argument('--data', type=Path, default=REPO_ROOT / 'data')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    files = sorted(args.data.rglob('*.yaml'))
+    if not files:
+        print(f"No yaml files under {args.data}", file=sys.stderr)
+        sys.exit(1)
+    documents = [baseline_load(p) for p in files]
+    total_bytes = sum(p.stat().st_size for p in files)
+
+    mismatches = [p for p, doc in zip(files, documents) if yaml_io.dump_yaml(doc) != baseline_dump(doc)]
+
+    print(f"Files: {len(files)} ({total_bytes / 1024:.0f} KiB) under {args.data}")
+    print(f"libyaml: {'yes' if yaml_io.LIBYAML else 'no (pure-Python fallback)'}  Runs: {args.runs}")
+    print("-" * 60)
+
+    for label, baseline, candidate, items in (
+        ('load', baseline_load, yaml_io.load_yaml, files),
+        ('dump', baseline_dump, yaml_io.dump_yaml, documents),
+    ):
+        before = best_of(baseline, items, args.runs)
+        after = best_of(candidate, items, args.runs)
+        print(f"  {label}  yaml {before * 1000:8.1f} ms   yaml_io {after * 1000:8.1f} ms   "
+              f"{before / after:5.2f}x")
+
+    print("-" * 60)
+    if mismatches:
+        print(f"✗ {len(mismatches)} document(s) render differently:", file=sys.stderr)
+        for p in mismatches[:10]:
+            print(f"  {p.relative_to(args.data)}", file=sys.stderr)
+        sys.exit(1)
+    print("✓ Output byte-identical for every document")
+
+
+if __name__ == '__main__':
+    main()
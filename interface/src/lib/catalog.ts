@@ -1,7 +1,7 @@
 import fs from 'node:fs/promises';
 import path from 'node:path';
 import { parse as parseYaml } from 'yaml';
-import { DATA_PHOTOS_DIR, R2_SMALL_DIR, R2_LARGE_DIR, stripExtension } from './paths';
+import { DATA_CATALOG_FILE, DATA_PHOTOS_DIR, R2_SMALL_DIR, R2_LARGE_DIR, stripExtension } from './paths';
 import { listCollections } from './collections';
 import type { Photo } from '../types';
 
@@ -24,6 +24,30 @@ async function walkYaml(dir: string): Promise<string[]> {
   return out;
 }
 
+const CATALOG_VERSION = 1;
+
+// Photo records as stored in data/photos/**/*.yaml
+type PhotoRecord = Record<string, any>;
+
+// One read of the data/catalog.json snapshot written by
+// generate-photo-metadata-files; falls back to parsing every yaml under
+// data/photos when it's missing or from another format version
+async function readPhotoRecords(): Promise<PhotoRecord[]> {
+  try {
+    const catalog = JSON.parse(await fs.readFile(DATA_CATALOG_FILE, 'utf8'));
+    if (catalog?.version === CATALOG_VERSION && Array.isArray(catalog.photos)) {
+      return catalog.photos;
+    }
+  } catch {
+    // missing or unreadable: fall through to the yamls
+  }
+
+  const yamlFiles = await walkYaml(DATA_PHOTOS_DIR);
+  return Promise.all(
+    yamlFiles.map(async (file) => parseYaml(await fs.readFile(file, 'utf8')) ?? {}),
+  );
+}
+
 async function exists(p: string): Promise<boolean> {
   try {
     await fs.access(p);
@@ -34,16 +58,26 @@ async function exists(p: string): Promise<boolean> {
 }
 
 export async function listPhotos(): Promise<Photo[]> {
-  const [yamlFiles, collections] = await Promise.all([
-    walkYaml(DATA_PHOTOS_DIR),
+  const [records, collections] = await Promise.all([
+    readPhotoRecords(),
     listCollections(),
   ]);
 
+  // Reverse index: photo id -> names of collections containing it, so
+  // membership is a lookup per photo instead of a scan of every collection
+  const memberOf = new Map<string, string[]>();
+  for (const c of collections) {
+    for (const p of c.photos) {
+      const id = stripExtension(p.path);
+      const names = memberOf.get(id);
+      if (!names) memberOf.set(id, [c.name]);
+      else if (!names.includes(c.name)) names.push(c.name);
+    }
+  }
+
   const photos = await Promise.all(
-    yamlFiles.map(async (file) => {
-      const raw = await fs.readFile(file, 'utf8');
-      const data = parseYaml(raw) ?? {};
-      if (!data.path) return null;
+    records.map(async (data) => {
+      if (!data?.path) return null;
 
       const id = stripExtension(data.path);
       const webp = `${id}.webp`;
@@ -52,12 +86,6 @@ export async function listPhotos(): Promise<Photo[]> {
         exists(path.join(R2_LARGE_DIR, webp)),
       ]);
 
-      const memberOf = collections
-        .filter((c) =>
-          c.photos.some((p) => stripExtension(p.path) === id),
-        )
-        .map((c) => c.name);
-
       const photo: Photo = {
         id,
         path: data.path,
@@ -80,7 +108,7 @@ export async function listPhotos(): Promise<Photo[]> {
         iso: data.iso ?? null,
         hasSmall,
         hasLarge,
-        collections: memberOf,
+        collections: memberOf.get(id) ?? [],
       };
       return photo;
     }),
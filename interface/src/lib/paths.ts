@@ -16,6 +16,7 @@ export const REPO_ROOT = findRepoRoot();
 export const DATA_DIR = path.join(REPO_ROOT, 'data');
 export const DATA_PHOTOS_DIR = path.join(DATA_DIR, 'photos');
 export const DATA_COLLECTIONS_DIR = path.join(DATA_DIR, 'collections');
+export const DATA_CATALOG_FILE = path.join(DATA_DIR, 'catalog.json');
 export const PHOTOS_DIR = path.join(REPO_ROOT, 'photos');
 export const R2_DIR = path.join(REPO_ROOT, 'r2');
 export const R2_SMALL_DIR = path.join(R2_DIR, 'small');
@@ -1,6 +1,7 @@
 import { spawn } from 'node:child_process';
 import type { ChildProcessWithoutNullStreams } from 'node:child_process';
 import path from 'node:path';
+import readline from 'node:readline';
 import { REPO_ROOT, SCRIPTS_DIR } from './paths';
 
 export interface ScriptResult {
@@ -20,15 +21,123 @@ function spawnIn(name: string, args: string[]): ChildProcessWithoutNullStreams {
   });
 }
 
+// JSON-RPC "method not found": the worker doesn't run this script in-process
+const METHOD_NOT_FOUND = -32601;
+
+interface WorkerReply {
+  id: number;
+  result?: ScriptResult;
+  error?: { code: number; message: string };
+}
+
+// Resolves with the worker's reply, or with null if the worker failed to
+// start (nothing ran) or 'exited' if it died while the request was in flight
+type PendingReply = (reply: WorkerReply | null | 'exited') => void;
+
+let worker: ChildProcessWithoutNullStreams | null = null;
+let workerDisabled = process.env.PHOTO_SCRIPT_WORKER === '0';
+let nextRequestId = 1;
+const pending = new Map<number, PendingReply>();
+
+/**
+ * The resident `scripts/atomic/utils/worker.py` process, started on first
+ * use and restarted after it exits. It runs the short atomic scripts
+ * in-process (same main(), same output and exit codes) so a mutation
+ * doesn't pay for a new Python interpreter and its imports.
+ */
+function getWorker(): ChildProcessWithoutNullStreams | null {
+  if (workerDisabled) return null;
+  if (worker) return worker;
+
+  const child = spawn('python3', [path.join(SCRIPTS_DIR, 'atomic', 'utils', 'worker.py')], {
+    cwd: REPO_ROOT,
+    env: { ...process.env, PYTHONUNBUFFERED: '1' },
+  });
+  const settleAll = (reply: null | 'exited'): void => {
+    if (worker === child) worker = null;
+    for (const [id, done] of pending) {
+      pending.delete(id);
+      done(reply);
+    }
+  };
+
+  readline.createInterface({ input: child.stdout }).on('line', (line) => {
+    let reply: WorkerReply;
+    try {
+      reply = JSON.parse(line);
+    } catch {
+      return;
+    }
+    const done = pending.get(reply.id);
+    if (done) {
+      pending.delete(reply.id);
+      done(reply);
+    }
+  });
+  // Script output is captured per request; this is the worker's own
+  child.stderr.on('data', (d) => process.stderr.write(d));
+  child.stdin.on('error', () => {
+    // Worker went away; 'exit' settles whatever was pending
+  });
+  child.on('exit', () => settleAll('exited'));
+  child.on('error', () => {
+    // Couldn't start python3 at all: spawn each script instead
+    workerDisabled = true;
+    settleAll(null);
+  });
+
+  worker = child;
+  return child;
+}
+
+/**
+ * Run a script through the worker. Resolves with null when the worker
+ * can't run it (not one of its scripts, or no worker), so the caller can
+ * spawn it instead.
+ */
+function runInWorker(name: string, args: string[]): Promise<ScriptResult | null> {
+  const child = getWorker();
+  if (!child) return Promise.resolve(null);
+
+  const id = nextRequestId++;
+  return new Promise((resolve) => {
+    pending.set(id, (reply) => {
+      if (reply === null) {
+        resolve(null);
+      } else if (reply === 'exited') {
+        // It may have written before dying; don't run it a second time
+        resolve({ ok: false, code: -1, stdout: '', stderr: `script worker exited while running ${name}` });
+      } else if (reply.error) {
+        resolve(reply.error.code === METHOD_NOT_FOUND
+          ? null
+          : { ok: false, code: -1, stdout: '', stderr: reply.error.message });
+      } else {
+        resolve(reply.result ?? null);
+      }
+    });
+    child.stdin.write(
+      JSON.stringify({ jsonrpc: '2.0', id, method: 'run', params: { script: name, args } }) + '\n',
+    );
+  });
+}
+
 /**
  * Invoke a script under `scripts/` and buffer its output. The CLI is the
  * source of truth for all mutations; this is the only place in the
  * interface that touches state.
+ *
+ * Short atomic scripts run in the resident worker; anything it doesn't
+ * handle (or everything, with PHOTO_SCRIPT_WORKER=0) is spawned.
  */
-export function runScript(
+export async function runScript(
   name: string,
   args: string[] = [],
 ): Promise<ScriptResult> {
+  const result = await runInWorker(name, args);
+  return result ?? spawnScript(name, args);
+}
+
+function spawnScript(name: string, args: string[]): Promise<ScriptResult> {
   return new Promise((resolve) => {
     const child = spawnIn(name, args);
     let stdout = '';
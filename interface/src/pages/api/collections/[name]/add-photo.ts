@@ -10,7 +10,7 @@ export const POST: APIRoute = async ({ params, request }) => {
 
   const body = await request.json().catch(() => ({}));
   const photoPath = body?.path;
-  if (typeof photoPath !== 'string' || !photoPath) {
+  if (typeof photoPath !== 'string' || !photoPath || photoPath.startsWith('-')) {
     return new Response('missing path', { status: 400 });
   }
 
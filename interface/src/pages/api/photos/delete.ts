@@ -2,20 +2,28 @@ import type { APIRoute } from 'astro';
 import { runScript } from '../../../lib/runScript';
 
 /**
- * Cascading delete of a single photo from the entire portfolio:
+ * Cascading delete of photos from the entire portfolio:
  *   photos/ jpg + data/photos/ yaml + r2/{small,large} + every collection ref.
  *
- * Delegates to `scripts/delete-photo <path>`. The script must perform the full
- * cascade — the interface never writes to data/ or r2/ directly.
+ * Accepts `{ path }` for one photo or `{ paths }` for many; either way it's a
+ * single `scripts/delete-photo <path>...` call, so each collection is
+ * rewritten at most once. The script must perform the full cascade — the
+ * interface never writes to data/ or r2/ directly. Paths starting with `-`
+ * are refused so they can't be read as options (e.g. `--paths-from -`).
  */
 export const POST: APIRoute = async ({ request }) => {
   const body = await request.json().catch(() => ({}));
-  const photoPath = body?.path;
-  if (typeof photoPath !== 'string' || !photoPath) {
+  const photoPaths: unknown[] = Array.isArray(body?.paths) ? body.paths : [body?.path];
+  if (
+    photoPaths.length === 0 ||
+    !photoPaths.every(
+      (p): p is string => typeof p === 'string' && p.length > 0 && !p.startsWith('-'),
+    )
+  ) {
     return new Response('missing path', { status: 400 });
   }
 
-  const result = await runScript('atomic/delete-photo', [photoPath]);
+  const result = await runScript('atomic/delete-photo', photoPaths);
   if (!result.ok) {
     return new Response(result.stderr || result.stdout || 'delete failed', {
       status: 500,
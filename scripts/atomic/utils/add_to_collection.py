@@ -2,9 +2,12 @@
 
 import os
 import sys
-import yaml
 from pathlib import Path
 
+from photo_paths import read_path_list
+from yaml_io import load_yaml, write_yaml
+from collection_index import record_collection
+
 def get_relative_photo_path(absolute_path, project_root):
     """Convert absolute path to relative path from photos directory."""
     abs_path = Path(absolute_path).resolve()
@@ -21,10 +24,9 @@ def get_relative_photo_path(absolute_path, project_root):
 def load_or_create_collection(collection_file, collection_name):
     """Load existing collection or create a new one."""
     if os.path.exists(collection_file):
-        with open(collection_file, 'r') as f:
-            collection = yaml.safe_load(f)
-            if collection is None:
-                collection = create_new_collection(collection_name)
+        collection = load_yaml(collection_file)
+        if collection is None:
+            collection = create_new_collection(collection_name)
     else:
         collection = create_new_collection(collection_name)
 
@@ -46,13 +48,21 @@ def create_new_collection(collection_name):
         'photos': []
     }
 
-def add_photo_to_collection(collection, photo_path):
-    """Add photo to collection if not already present."""
+def add_photo_to_collection(collection, photo_path, existing_paths=None):
+    """
+    Add photo to collection if not already present.
+
+    When adding many photos, pass existing_paths (the set of paths already
+    in the collection); it's kept up to date, so the photos list is only
+    scanned once rather than once per photo.
+    """
     # Check if photo already exists
-    existing_paths = {photo['path'] for photo in collection['photos']}
+    if existing_paths is None:
+        existing_paths = {photo['path'] for photo in collection['photos']}
 
     if photo_path in existing_paths:
         return False
+    existing_paths.add(photo_path)
 
     # Add new photo
     collection['photos'].append({
@@ -69,18 +79,29 @@ def add_photo_to_collection(collection, photo_path):
 
 def save_collection(collection_file, collection):
     """Save collection to YAML file."""
-    os.makedirs(os.path.dirname(collection_file), exist_ok=True)
-
-    with open(collection_file, 'w') as f:
-        yaml.dump(collection, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_yaml(collection_file, collection)
+    record_collection(collection_file, collection)
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: add_to_collection.py <collection-name> <photo-path> [photo-path...]")
+    usage = "Usage: add_to_collection.py <collection-name> (<photo-path> [photo-path...] | --paths-from FILE|-)"
+    args = sys.argv[1:]
+    paths_from = None
+    if '--paths-from' in args:
+        i = args.index('--paths-from')
+        if i + 1 >= len(args):
+            print(usage)
+            sys.exit(1)
+        paths_from = args[i + 1]
+        del args[i:i + 2]
+
+    if not args or (len(args) < 2 and paths_from is None):
+        print(usage)
         sys.exit(1)
 
-    collection_name = sys.argv[1]
-    photo_paths_input = sys.argv[2:]
+    collection_name = args[0]
+    photo_paths_input = args[1:]
+    if paths_from is not None:
+        photo_paths_input += read_path_list(paths_from)
 
     # Get project root (2 levels up from this script)
     script_dir = Path(__file__).parent
@@ -90,6 +111,9 @@ def main():
     collection_file = project_root / 'data' / 'collections' / f'{collection_name}.yaml'
     collection = load_or_create_collection(collection_file, collection_name)
 
+    # Paths already in the collection, checked and extended as photos are added
+    existing_paths = {photo['path'] for photo in collection['photos']}
+
     # Track results
     added_photos = []
     skipped_photos = []
@@ -111,7 +135,7 @@ def main():
             continue
 
         # Add photo to collection
-        added = add_photo_to_collection(collection, relative_path)
+        added = add_photo_to_collection(collection, relative_path, existing_paths)
 
         if added:
             added_photos.append(relative_path)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Atomic file writes shared by the atomic utils.
+
+Content goes to a temp file in the destination directory which is then
+renamed over the destination, so readers never see a partially written
+file. The temp file is given the permissions a plain open() would have
+created (0666 minus the umask) rather than mkstemp's 0600.
+
+Public API:
+    write_file_atomic(path, content, fsync=False)
+        Write bytes to path via temp file + rename.
+
+    write_json_atomic(path, data)
+        Write data as indented, key-sorted JSON, fsynced.
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+
+
+# os.umask can only be read by setting it, which would race with files
+# other threads create; read it once at import, before any of them run
+_umask = os.umask(0)
+os.umask(_umask)
+_DEFAULT_MODE = 0o666 & ~_umask
+del _umask
+
+
+def write_file_atomic(path, content, fsync=False):
+    """
+    Write bytes to path via a temp file + rename.
+
+    Args:
+        path: Destination path (parent directories are created)
+        content: Bytes to write
+        fsync: Flush the temp file to disk before the rename
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        os.fchmod(fd, _DEFAULT_MODE)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    """
+    Write JSON to path via a temp file + rename so the file is never torn.
+
+    Args:
+        path: Destination Path
+        data: JSON-serializable object
+    """
+    content = json.dumps(data, indent=1, sort_keys=True) + '\n'
+    write_file_atomic(path, content.encode('utf-8'), fsync=True)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+"""
+Build r2/ variants and upload them to R2 as they are produced.
+
+Equivalent to build-r2 followed by sync-to-r2, but the two overlap: every
+variant the build_r2 process pool finishes goes straight onto an upload
+queue drained by a pool of upload threads, so encoding (CPU-bound) and
+uploading (network-bound) run at the same time and a new batch takes
+roughly as long as the slower of the two rather than their sum.
+
+The upload queue is bounded. When uploads fall behind, handing a finished
+variant to the queue blocks, which stops new sources from being submitted
+to the encoders, so neither finished images nor in-flight work pile up.
+
+Only variants written in this run are streamed. Once the build finishes, a
+regular sync_directory pass over r2/ reconciles everything else (deletions,
+outputs built earlier but never uploaded); it reuses the build manifest's
+digests and the remote snapshot, so it costs one request per remaining
+change.
+
+Usage:
+    python3 scripts/utils/build_and_sync_r2.py
+
+    # Use 32 concurrent transfers
+    python3 scripts/utils/build_and_sync_r2.py --workers 32
+
+    # List the bucket first instead of trusting the remote snapshot
+    python3 scripts/utils/build_and_sync_r2.py --verify
+
+    # Only the photos listed in a file (or '-' for stdin), e.g. the
+    # --output-paths file from ingest-photos
+    python3 scripts/utils/build_and_sync_r2.py --paths-from ingested.txt
+"""
+
+import sys
+import queue
+import argparse
+import threading
+from pathlib import Path
+
+from build_r2 import VARIANTS, collect_sources, select_sources, build_variants, prune_manifest
+from photo_paths import read_photo_paths
+from r2_manifest import load_manifest, save_manifest, load_sync_state, save_sync_state
+from sync_to_r2 import (
+    DEFAULT_WORKERS, get_r2_client, list_r2_objects, head_r2_objects, remote_snapshot, record_listing,
+    mark_snapshot_complete, upload_file, sync_directory, variant_keys,
+)
+
+
+class UploadQueue:
+    """
+    A bounded queue of (key, path, md5) uploads drained by worker threads.
+
+    put() blocks while the queue is full. Each successful upload is recorded
+    in the remote snapshot so the final sync pass doesn't repeat it.
+    """
+    def __init__(self, client, bucket_name, snapshot, workers, maxsize):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.snapshot = snapshot
+        self.failed = {}
+        self.uploaded = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def put(self, r2_key, local_path, md5, size):
+        self._queue.put((r2_key, local_path, md5, size))
+
+    def close(self):
+        """Wait for queued uploads to finish and stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            r2_key, local_path, md5, size = item
+            error = upload_file(self.client, self.bucket_name, local_path, r2_key, md5)
+            with self._lock:
+                if error:
+                    self.failed[r2_key] = error
+                    print(f"  ! {r2_key}  {error}", file=sys.stderr)
+                else:
+                    self.uploaded += 1
+                    self.snapshot[r2_key] = {'md5': md5, 'size': size}
+                    print(f"  ↑ {r2_key} ({size / (1024 * 1024):.2f} MB)")
+
+
+def build_and_sync(photos_root, r2_root, workers=DEFAULT_WORKERS, queue_size=None, jobs=None,
+                   verify=False, client=None, bucket_name=None, only=None):
+    """
+    Build every stale variant, streaming each one to R2 as it is written.
+
+    Args:
+        photos_root: photos/ root
+        r2_root: r2/ root
+        workers: Concurrent uploads
+        queue_size: Finished variants allowed to wait for upload (default:
+            2 per upload worker)
+        jobs: Encoder processes (default: one per core)
+        verify: List the bucket instead of trusting the remote snapshot
+        client: S3 client to use instead of the .r2config one; requires
+            bucket_name
+        bucket_name: Bucket to sync to when passing client
+        only: Optional photo paths relative to photos_root; only these are
+            built and only their variants are synced (nothing is scanned,
+            listed or pruned)
+
+    Returns:
+        True if every source built and every object synced, False otherwise
+    """
+    photos_root = Path(photos_root)
+    r2_root = Path(r2_root)
+    if client is None:
+        client, bucket_name = get_r2_client(workers)
+
+    if only is None:
+        sources = collect_sources(photos_root)
+        keys = None
+    else:
+        sources = select_sources(photos_root, only)
+        keys = variant_keys(r2_root, only) if r2_root.exists() else []
+    print(f"Found {len(sources)} photos")
+    print(f"Generating {', '.join(VARIANTS.keys())} variants → {r2_root}/ and uploading to '{bucket_name}'")
+    print("-" * 80)
+
+    manifest = load_manifest(r2_root)
+    state = load_sync_state(r2_root)
+    snapshot, complete = remote_snapshot(state, bucket_name)
+    if (verify or not complete) and keys is not None:
+        print("Looking up R2 objects...")
+        record_listing(snapshot, head_r2_objects(client, bucket_name, keys), prefix=None)
+        save_sync_state(r2_root, state)
+    elif verify or not complete:
+        print("Listing R2 objects...")
+        record_listing(snapshot, list_r2_objects(client, bucket_name))
+        mark_snapshot_complete(state)
+        # Save right away so a crash mid-build doesn't force another listing
+        save_sync_state(r2_root, state)
+
+    ok = 0
+    skipped = 0
+    failed = 0
+    uploads = UploadQueue(client, bucket_name, snapshot, workers, queue_size or workers * 2)
+    try:
+        results = build_variants(sources, photos_root, r2_root, manifest, jobs=jobs)
+        for i, (rel, status, records) in enumerate(results, start=1):
+            if status == 'ok':
+                ok += 1
+                print(f"  [{i}/{len(sources)}] ✓ {rel}")
+            elif status == 'skip':
+                skipped += 1
+            else:
+                failed += 1
+                print(f"  [{i}/{len(sources)}] ✗ {rel}  {status}", file=sys.stderr)
+
+            for key, record in records.items():
+                remote = snapshot.get(key)
+                if remote and remote.get('md5') == record['md5']:
+                    continue
+                uploads.put(key, r2_root / key, record['md5'], record['size'])
+
+        if only is None:
+            prune_manifest(manifest, sources, photos_root)
+    finally:
+        uploads.close()
+        save_manifest(r2_root, manifest)
+        save_sync_state(r2_root, state)
+
+    print("-" * 80)
+    print(f"Generated: {ok}")
+    if skipped:
+        print(f"Skipped:   {skipped} (already up to date)")
+    if failed:
+        print(f"Failed:    {failed}")
+    print(f"Uploaded:  {uploads.uploaded} while building")
+    print()
+
+    # Deletions, retries of failed uploads, and anything built earlier
+    if keys is not None:
+        # Variant dirs may not have existed before this build
+        keys = variant_keys(r2_root, only)
+    synced = sync_directory(r2_root, '', workers=workers, client=client, bucket_name=bucket_name, keys=keys)
+    return synced and not failed
+
+
+def main():
+    repo_root = Path(__file__).resolve().parent.parent.parent.parent
+    photos_root = repo_root / 'photos'
+    r2_root = repo_root / 'r2'
+
+    parser = argparse.ArgumentParser(
+        description='Build r2/ variants and upload each one to R2 as soon as it is written',
+    )
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent transfers (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Encoder processes (default: one per core)')
+    parser.add_argument('--queue-size', type=int, default=None,
+                        help='Finished variants allowed to wait for upload (default: 2 per worker)')
+    parser.add_argument('--verify', action='store_true',
+                        help='List the whole bucket and reconcile the local snapshot of it')
+    parser.add_argument('--paths-from', metavar='FILE',
+                        help="Only build and sync the photos listed in FILE, one per line ('-' for stdin)")
+    args = parser.parse_args()
+
+    if not photos_root.exists():
+        print(f"Error: {photos_root} not found", file=sys.stderr)
+        sys.exit(1)
+
+    only = None
+    if args.paths_from:
+        only, rejected = read_photo_paths(args.paths_from, photos_root)
+        for path in rejected:
+            print(f"Warning: not within photos/, ignoring: {path}", file=sys.stderr)
+
+    try:
+        if not build_and_sync(photos_root, r2_root, workers=args.workers, queue_size=args.queue_size,
+                              jobs=args.jobs, verify=args.verify, only=only):
+            sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
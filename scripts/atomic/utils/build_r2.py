@@ -11,65 +11,255 @@ Quality 100. Preserves ICC color profile. Applies EXIF orientation.
 Resizes by longest side so landscape and portrait produce similar pixel counts.
 Does not upscale: if source longest side is smaller than target, keeps source size.
 
+Variants are produced largest-first from a single decode: large is resampled
+from the full-res image, small from large (see VARIANTS). Sources much larger
+than the biggest variant are decoded at reduced size via JPEG draft mode.
+
 Skips photos/imports/ (Lightroom drop) and photos/dev/.
 
+Rebuilds are decided by content, not mtime: r2/.manifest.json records each
+variant's source hash and encode parameter hash (see r2_manifest.py), and a
+variant is only re-encoded when one of them changes.
+
 Local only — does not upload to R2.
 
 Usage:
     python3 scripts/utils/build_r2.py
+
+    # Only the photos listed in a file (or '-' for stdin), e.g. the
+    # --output-paths file from ingest-photos; nothing else is scanned
+    python3 scripts/utils/build_r2.py --paths-from ingested.txt
 """
 
+import io
 import sys
+import math
+import hashlib
+import argparse
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from PIL import Image, ImageFilter, ImageOps
+from typing import Optional
+
+from atomic_file import write_file_atomic
+from parallel import unordered_map
+from photo_paths import read_photo_paths
+from r2_manifest import load_manifest, save_manifest, file_digest, params_hash
 
-SIZES = {
-    'small': 800,
-    'large': 2400,
+# Per-variant settings, by name:
+#   size     longest side in pixels (never upscaled)
+#   cascade  resample from the next larger variant instead of the full-res
+#            source; much cheaper, and visually equivalent for downscales
+#   sharpen  apply UNSHARP after resizing
+#   quality  webp quality (defaults to QUALITY)
+VARIANTS = {
+    'small': {'size': 800, 'cascade': True, 'sharpen': True},
+    'large': {'size': 2400, 'cascade': True, 'sharpen': True},
 }
 
 QUALITY = 100
-UNSHARP = ImageFilter.UnsharpMask(radius=1, percent=100, threshold=2)
+WEBP_METHOD = 6
+# ImageFilter.UnsharpMask settings
+UNSHARP = {'radius': 1, 'percent': 100, 'threshold': 2}
+# Let libjpeg downscale in the DCT domain while decoding, as long as the
+# decoded image stays at least this many times larger than the largest
+# variant (same idea as Image.thumbnail's reducing_gap). None disables it.
+DRAFT_REDUCING_GAP = 2.0
 SKIP_DIRS = {'imports', 'dev'}
 JPG_SUFFIXES = {'.jpg', '.jpeg'}
 
 
-def generate_one(src_str: str, photos_root_str: str, r2_root_str: str) -> tuple[str, str]:
+def open_for_variants(src, variants=VARIANTS, draft_reducing_gap=DRAFT_REDUCING_GAP):
+    """
+    Open a source image, decoding at reduced size when the variants allow.
+
+    Args:
+        src: Path to the source image
+        variants: Variant settings (see VARIANTS)
+        draft_reducing_gap: See DRAFT_REDUCING_GAP
+
+    Returns:
+        Opened (not yet loaded) PIL image; use as a context manager
+    """
+    from PIL import Image
+
+    img = Image.open(src)
+    if draft_reducing_gap and img.format == 'JPEG':
+        largest = max(spec['size'] for spec in variants.values())
+        scale = min(1.0, largest * draft_reducing_gap / max(img.size))
+        if scale < 0.5:
+            img.draft(img.mode, (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+    return img
+
+
+def resize_variants(img, variants=VARIANTS):
+    """
+    Produce every variant of an (EXIF-transposed) image, largest first.
+
+    Each variant is resized with LANCZOS either from the full-res image or,
+    for cascading variants, from the unsharpened result of the next larger
+    variant, so the full-res resample is paid once per photo rather than
+    once per variant.
+
+    Args:
+        img: Full-resolution PIL image
+        variants: Variant settings (see VARIANTS)
+
+    Yields:
+        (variant_name, image to save) tuples
+    """
+    from PIL import Image, ImageFilter
+
+    unsharp = ImageFilter.UnsharpMask(**UNSHARP)
+    previous = None
+    for name, spec in sorted(variants.items(), key=lambda item: -item[1]['size']):
+        base = previous if spec.get('cascade') and previous is not None else img
+        target_size = spec['size']
+        longest = max(base.width, base.height)
+        if longest <= target_size:
+            resized = base
+            out = base
+        else:
+            scale = target_size / longest
+            new_w = round(base.width * scale)
+            new_h = round(base.height * scale)
+            resized = base.resize((new_w, new_h), Image.LANCZOS)
+            out = resized.filter(unsharp) if spec.get('sharpen', True) else resized
+        previous = resized
+        yield name, out
+
+
+def variant_params(variant_name: str) -> str:
+    """
+    Hash of everything that affects how a variant is encoded.
+
+    Covers the variant's own settings, the shared encode settings and, for
+    cascading variants, the larger variants they are resampled from.
+    """
+    ordered = sorted(VARIANTS.items(), key=lambda item: -item[1]['size'])
+    position = [name for name, _ in ordered].index(variant_name)
+    if VARIANTS[variant_name].get('cascade'):
+        chain = ordered[:position + 1]
+    else:
+        chain = ordered[position:position + 1]
+    return params_hash({
+        'chain': chain,
+        'quality': QUALITY,
+        'method': WEBP_METHOD,
+        'unsharp': (UNSHARP['radius'], UNSHARP['percent'], UNSHARP['threshold']),
+        'draft_reducing_gap': DRAFT_REDUCING_GAP,
+        'largest': max(spec['size'] for spec in VARIANTS.values()),
+    })
+
+
+def source_record(src: Path, known: Optional[dict]) -> dict:
+    """Return the manifest source record for src, re-hashing only if it changed."""
+    st = src.stat()
+    if known and known.get('size') == st.st_size and known.get('mtime_ns') == st.st_mtime_ns:
+        return known
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': file_digest(src)}
+
+
+def output_record(out_path: Path, rel: Path, source: dict, params: str, md5: Optional[str] = None) -> dict:
+    st = out_path.stat()
+    return {
+        'source': str(rel),
+        'source_sha256': source['sha256'],
+        'params': params,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'md5': md5 or file_digest(out_path, 'md5'),
+    }
+
+
+def generate_one(src_str: str, photos_root_str: str, r2_root_str: str,
+                 known_source: Optional[dict] = None,
+                 known_outputs: Optional[dict] = None) -> tuple[str, str, Optional[dict], dict]:
+    """
+    Build whichever variants of one source are stale.
+
+    A variant is stale when it has no manifest record, its recorded source
+    hash or encode parameter hash differs from the current ones, or the file
+    on disk no longer matches the recorded size. Outputs that predate the
+    manifest are adopted without re-encoding if they are newer than the
+    source.
+
+    Args:
+        src_str: Path to the source jpg
+        photos_root_str: photos/ root
+        r2_root_str: r2/ root
+        known_source: The source's manifest record, if any
+        known_outputs: Manifest records of this source's outputs, by key
+
+    Returns:
+        (relative source path, status, source record, {key: output record})
+        where status is 'ok', 'skip' or 'error: ...', and the output records
+        cover every variant that was written or adopted
+    """
     src = Path(src_str)
     photos_root = Path(photos_root_str)
     r2_root = Path(r2_root_str)
     rel = src.relative_to(photos_root)
     rel_webp = rel.with_suffix('.webp')
+    known_outputs = known_outputs or {}
 
-    src_mtime = src.stat().st_mtime
-    out_paths = [r2_root / variant / rel_webp for variant in SIZES]
-    if all(o.exists() and o.stat().st_mtime >= src_mtime for o in out_paths):
-        return (str(rel), 'skip')
+    try:
+        source = source_record(src, known_source)
+    except OSError as e:
+        return (str(rel), f'error: {e}', None, {})
+
+    records = {}
+    stale = set()
+    for variant_name in VARIANTS:
+        key = f'{variant_name}/{rel_webp.as_posix()}'
+        out_path = r2_root / variant_name / rel_webp
+        params = variant_params(variant_name)
+        record = known_outputs.get(key)
+        try:
+            out_stat = out_path.stat()
+        except FileNotFoundError:
+            stale.add(variant_name)
+            continue
+
+        if record is None:
+            # Built before the manifest existed: trust it if it's newer
+            # than the source, like the old mtime check did
+            if out_stat.st_mtime_ns >= source['mtime_ns']:
+                records[key] = output_record(out_path, rel, source, params)
+            else:
+                stale.add(variant_name)
+        elif (record.get('source_sha256') != source['sha256']
+              or record.get('params') != params
+              or record.get('size') != out_stat.st_size):
+            stale.add(variant_name)
+
+    if not stale:
+        return (str(rel), 'skip', source, records)
+
+    # PIL is imported here, in the worker, so a build with nothing stale
+    # never loads it
+    from PIL import ImageOps
 
     try:
-        with Image.open(src) as img:
+        with open_for_variants(src) as img:
             img = ImageOps.exif_transpose(img)
             icc_profile = img.info.get('icc_profile')
-            for variant_name, target_size in SIZES.items():
+            for variant_name, resized in resize_variants(img):
+                if variant_name not in stale:
+                    continue
                 out_path = r2_root / variant_name / rel_webp
-                out_path.parent.mkdir(parents=True, exist_ok=True)
-                longest = max(img.width, img.height)
-                if longest <= target_size:
-                    resized = img
-                else:
-                    scale = target_size / longest
-                    new_w = round(img.width * scale)
-                    new_h = round(img.height * scale)
-                    resized = img.resize((new_w, new_h), Image.LANCZOS)
-                    resized = resized.filter(UNSHARP)
-                save_kwargs = {'quality': QUALITY, 'method': 6}
+                save_kwargs = {'quality': VARIANTS[variant_name].get('quality', QUALITY), 'method': WEBP_METHOD}
                 if icc_profile:
                     save_kwargs['icc_profile'] = icc_profile
-                resized.save(out_path, 'WEBP', **save_kwargs)
-        return (str(rel), 'ok')
+                buf = io.BytesIO()
+                resized.save(buf, 'WEBP', **save_kwargs)
+                data = buf.getvalue()
+                write_file_atomic(out_path, data)
+                key = f'{variant_name}/{rel_webp.as_posix()}'
+                records[key] = output_record(
+                    out_path, rel, source, variant_params(variant_name), hashlib.md5(data).hexdigest()
+                )
+        return (str(rel), 'ok', source, records)
     except Exception as e:
-        return (str(rel), f'error: {e}')
+        return (str(rel), f'error: {e}', source, records)
 
 
 def collect_sources(photos_root: Path) -> list[Path]:
@@ -86,30 +276,107 @@ def collect_sources(photos_root: Path) -> list[Path]:
     return sorted(sources)
 
 
+def select_sources(photos_root: Path, rel_paths: list[str]) -> list[Path]:
+    """The subset of rel_paths (relative to photos_root) collect_sources would return."""
+    sources: list[Path] = []
+    for rel in rel_paths:
+        p = photos_root / rel
+        if p.suffix.lower() not in JPG_SUFFIXES or not p.is_file():
+            continue
+        rel_parts = Path(rel).parts
+        if rel_parts and rel_parts[0] in SKIP_DIRS:
+            continue
+        sources.append(p)
+    return sorted(sources)
+
+
+def _generate_one(args):
+    return generate_one(*args)
+
+
+def build_variants(sources: list[Path], photos_root: Path, r2_root: Path, manifest: dict,
+                   jobs: Optional[int] = None):
+    """
+    Run generate_one for every source across a process pool.
+
+    Results are merged into manifest as they arrive. At most a few sources
+    per worker are in flight, and none are submitted while the caller is
+    handling a result, so a slow consumer (e.g. an upload queue) throttles
+    encoding.
+
+    Args:
+        sources: Source jpgs (from collect_sources)
+        photos_root: photos/ root
+        r2_root: r2/ root
+        manifest: Build manifest (r2_manifest.load_manifest), updated in place
+        jobs: Worker processes (default: one per core)
+
+    Yields:
+        (relative source path, status, {key: output record}) as each
+        source finishes, where the records are the outputs written or
+        adopted for it
+    """
+    outputs_by_source = {}
+    for key, record in manifest['outputs'].items():
+        outputs_by_source.setdefault(record.get('source'), {})[key] = record
+
+    def tasks():
+        for p in sources:
+            rel = str(p.relative_to(photos_root))
+            yield (str(p), str(photos_root), str(r2_root),
+                   manifest['sources'].get(rel), outputs_by_source.get(rel))
+
+    for rel, status, source, records in unordered_map(_generate_one, tasks(), jobs=jobs):
+        if source is not None:
+            manifest['sources'][rel] = source
+        manifest['outputs'].update(records)
+        yield rel, status, records
+
+
+def prune_manifest(manifest: dict, sources: list[Path], photos_root: Path) -> None:
+    """Forget sources that are gone, and outputs of removed variants."""
+    current = {str(p.relative_to(photos_root)) for p in sources}
+    manifest['sources'] = {k: v for k, v in manifest['sources'].items() if k in current}
+    manifest['outputs'] = {
+        k: v for k, v in manifest['outputs'].items()
+        if v.get('source') in current and k.split('/', 1)[0] in VARIANTS
+    }
+
+
 def main():
     repo_root = Path(__file__).resolve().parent.parent.parent.parent
     photos_root = repo_root / 'photos'
     r2_root = repo_root / 'r2'
 
+    parser = argparse.ArgumentParser(description='Build r2/ webp variants for every photo under photos/')
+    parser.add_argument('--paths-from', metavar='FILE',
+                        help="Only build the photos listed in FILE, one per line ('-' for stdin)")
+    args = parser.parse_args()
+
     if not photos_root.exists():
         print(f"Error: {photos_root} not found", file=sys.stderr)
         sys.exit(1)
 
-    sources = collect_sources(photos_root)
+    targeted = args.paths_from is not None
+    if targeted:
+        rel_paths, rejected = read_photo_paths(args.paths_from, photos_root)
+        for path in rejected:
+            print(f"Warning: not within photos/, ignoring: {path}", file=sys.stderr)
+        sources = select_sources(photos_root, rel_paths)
+    else:
+        sources = collect_sources(photos_root)
     print(f"Found {len(sources)} photos")
-    print(f"Generating {', '.join(SIZES.keys())} variants → {r2_root}/")
+    print(f"Generating {', '.join(VARIANTS.keys())} variants → {r2_root}/")
     print("-" * 80)
 
+    manifest = load_manifest(r2_root)
+
     ok = 0
     skipped = 0
     failed = 0
-    with ProcessPoolExecutor() as ex:
-        futures = {
-            ex.submit(generate_one, str(p), str(photos_root), str(r2_root)): p
-            for p in sources
-        }
-        for i, fut in enumerate(as_completed(futures), start=1):
-            rel, status = fut.result()
+    try:
+        results = build_variants(sources, photos_root, r2_root, manifest)
+        for i, (rel, status, _) in enumerate(results, start=1):
             if status == 'ok':
                 ok += 1
                 print(f"  [{i}/{len(sources)}] ✓ {rel}")
@@ -120,6 +387,12 @@ def main():
                 failed += 1
                 print(f"  [{i}/{len(sources)}] ✗ {rel}  {status}", file=sys.stderr)
 
+        if not targeted:
+            prune_manifest(manifest, sources, photos_root)
+    finally:
+        # Save progress even if interrupted, so finished work isn't redone
+        save_manifest(r2_root, manifest)
+
     print("-" * 80)
     print(f"Generated: {ok}")
     if skipped:
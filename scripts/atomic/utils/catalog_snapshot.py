@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+"""
+Consolidated photo catalog snapshot at data/catalog.json.
+
+A single file holding every record from data/photos/**/*.yaml, so consumers
+(the interface, the site build) can load the whole catalog with one read
+instead of walking and parsing thousands of small yamls:
+
+    {"version": 1, "revision": "3f2a...", "photos": [
+    {"path": "2025/washington/foo.jpg", "keywords": [...], "date": ..., ...},
+    ...
+    ]}
+
+"photos" is sorted newest first by date (photos without a date last), then
+by path, and holds one record per line so diffs stay readable. "revision"
+is a hash of the records, so it changes exactly when the catalog content
+does and consumers can use it to tell whether anything changed.
+
+generate-photo-metadata-files keeps the snapshot in step with the yamls it
+writes and deletes (rebuilding it from the yamls if it's missing), and
+delete-photo drops the records of the photos it deletes. It is only
+rewritten (atomically) when its bytes change.
+
+Alongside it, generate-photo-metadata-files records the size and mtime_ns
+each photo had when its record was rendered, in .cache/catalog-sources.json
+(per machine, so it's kept out of the committed data/). A record is only
+current while its photo still has exactly that size and mtime, the same
+check metadata_cache.py makes.
+
+Public API:
+    load_catalog(catalog_path) -> dict or None
+        Records keyed by photo path, or None if missing or unreadable.
+
+    build_from_yamls(data_photos_dir) -> dict
+        Records keyed by photo path, read from every photo yaml.
+
+    render_catalog(records) -> bytes
+        The snapshot file contents for a set of records.
+
+    write_catalog(catalog_path, records) -> bool
+        Write the snapshot if it changed; True if it was written.
+
+    update_catalog(catalog_path, data_photos_dir, upserts=None, removals=()) -> bool
+        Load (or rebuild), apply changes and write if anything changed.
+
+    load_sources(sources_path) -> dict
+        (size, mtime_ns) of each photo when its record was rendered.
+
+    write_sources(sources_path, sources) / update_sources(sources_path, upserts=None, removals=())
+        Replace or patch those stamps.
+
+Usage:
+    # Rebuild data/catalog.json from data/photos/
+    python3 scripts/atomic/utils/catalog_snapshot.py
+"""
+
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+from atomic_file import write_file_atomic
+from yaml_io import load_yaml, YAMLError
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+DATA_PHOTOS_DIR = REPO_ROOT / 'data' / 'photos'
+CATALOG_NAME = 'catalog.json'
+CATALOG_VERSION = 1
+SOURCES_NAME = 'catalog-sources.json'
+
+
+def default_catalog_path(data_photos_dir):
+    """<repo>/data/catalog.json for <repo>/data/photos."""
+    return Path(data_photos_dir).parent / CATALOG_NAME
+
+
+def default_sources_path(data_photos_dir):
+    """<repo>/.cache/catalog-sources.json for <repo>/data/photos."""
+    return Path(data_photos_dir).parent.parent / '.cache' / SOURCES_NAME
+
+
+def load_catalog(catalog_path):
+    """
+    Load the snapshot.
+
+    Args:
+        catalog_path: Path to catalog.json
+
+    Returns:
+        Dict mapping photo path to its record, or None if the file is
+        missing, unreadable or from another format version
+    """
+    try:
+        with open(catalog_path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != CATALOG_VERSION:
+        return None
+    return {record['path']: record for record in data.get('photos') or [] if record.get('path')}
+
+
+def build_from_yamls(data_photos_dir):
+    """
+    Read every photo yaml into catalog records.
+
+    Args:
+        data_photos_dir: Path to data/photos
+
+    Returns:
+        Dict mapping photo path to its record
+    """
+    records = {}
+    data_photos_dir = Path(data_photos_dir)
+    if not data_photos_dir.exists():
+        return records
+    for yaml_path in sorted(data_photos_dir.rglob('*.yaml')):
+        try:
+            record = load_yaml(yaml_path)
+        except (OSError, YAMLError) as e:
+            print(f"Warning: could not read {yaml_path}: {e}", file=sys.stderr)
+            continue
+        if isinstance(record, dict) and record.get('path'):
+            records[record['path']] = record
+    return records
+
+
+def render_catalog(records):
+    """
+    Render records as the snapshot file.
+
+    Args:
+        records: Dict mapping photo path to its record
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    # Newest first: reverse-sort the dates, keep paths ascending within one
+    ordered = sorted(records.values(), key=lambda r: r['path'])
+    ordered.sort(key=lambda r: str(r.get('date') or ''), reverse=True)
+    ordered.sort(key=lambda r: r.get('date') is None)
+
+    lines = [json.dumps(record, ensure_ascii=False, default=str) for record in ordered]
+    revision = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()[:16]
+    body = '[\n' + ',\n'.join(lines) + '\n]' if lines else '[]'
+    text = f'{{"version": {CATALOG_VERSION}, "revision": "{revision}", "photos": {body}}}\n'
+    return text.encode('utf-8')
+
+
+def write_catalog(catalog_path, records):
+    """
+    Write the snapshot via temp file + rename, unless it's unchanged.
+
+    Args:
+        catalog_path: Path to catalog.json
+        records: Dict mapping photo path to its record
+
+    Returns:
+        True if the file was written
+    """
+    catalog_path = Path(catalog_path)
+    content = render_catalog(records)
+    try:
+        if catalog_path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    write_file_atomic(catalog_path, content)
+    return True
+
+
+def update_catalog(catalog_path, data_photos_dir, upserts=None, removals=()):
+    """
+    Patch the snapshot with changed and removed photos.
+
+    Starts from the existing snapshot, or rebuilds it from the yamls in
+    data_photos_dir if it's missing.
+
+    Args:
+        catalog_path: Path to catalog.json
+        data_photos_dir: Path to data/photos (for a rebuild)
+        upserts: Dict mapping photo path to its new record
+        removals: Photo paths to drop
+
+    Returns:
+        True if the file was written
+    """
+    records = load_catalog(catalog_path)
+    if records is None:
+        records = build_from_yamls(data_photos_dir)
+    records.update(upserts or {})
+    for path in removals:
+        records.pop(path, None)
+    return write_catalog(catalog_path, records)
+
+
+def load_sources(sources_path):
+    """
+    Load the source stamps.
+
+    Args:
+        sources_path: Path to catalog-sources.json
+
+    Returns:
+        Dict mapping photo path to (size, mtime_ns); empty if the file is
+        missing, unreadable or from another format version
+    """
+    try:
+        with open(sources_path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != CATALOG_VERSION:
+        return {}
+    return {path: tuple(stamp) for path, stamp in (data.get('photos') or {}).items()}
+
+
+def write_sources(sources_path, sources):
+    """
+    Write the source stamps via temp file + rename, unless they're unchanged.
+
+    Args:
+        sources_path: Path to catalog-sources.json
+        sources: Dict mapping photo path to (size, mtime_ns)
+
+    Returns:
+        True if the file was written
+    """
+    sources_path = Path(sources_path)
+    photos = {path: list(sources[path]) for path in sorted(sources)}
+    content = json.dumps({'version': CATALOG_VERSION, 'photos': photos}).encode('utf-8')
+    try:
+        if sources_path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    write_file_atomic(sources_path, content)
+    return True
+
+
+def update_sources(sources_path, upserts=None, removals=()):
+    """
+    Patch the source stamps with changed and removed photos.
+
+    Args:
+        sources_path: Path to catalog-sources.json
+        upserts: Dict mapping photo path to its new (size, mtime_ns)
+        removals: Photo paths to drop
+
+    Returns:
+        True if the file was written
+    """
+    sources = load_sources(sources_path)
+    sources.update(upserts or {})
+    for path in removals:
+        sources.pop(path, None)
+    return write_sources(sources_path, sources)
+
+
+def main():
+    catalog_path = default_catalog_path(DATA_PHOTOS_DIR)
+    records = build_from_yamls(DATA_PHOTOS_DIR)
+    written = write_catalog(catalog_path, records)
+    state = 'Wrote' if written else 'Unchanged'
+    print(f"{state}: {catalog_path.relative_to(REPO_ROOT)} ({len(records)} photos)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""
+Reverse index from photo path to the collections that reference it.
+
+Answers "which collections contain this photo?" with a dictionary lookup
+instead of loading and scanning every collection yaml. The index lives at
+.cache/collection-index.json (gitignored):
+
+    {
+      "version": 1,
+      "collections": {
+        "favorites": {"size": ..., "mtime_ns": ...,
+                      "cover_path": "2025/...jpg",
+                      "photos": ["2025/...jpg", ...]}
+      }
+    }
+
+Each entry is stamped with its collection file's size and mtime. Loading
+the index stats every collection yaml and re-reads only those whose stamp
+changed (including ones edited by hand or by git), drops collections that
+no longer exist and picks up new ones, so it is never stale. The atomic
+collection scripts record each collection they write, keeping the stamps
+current so the next load doesn't re-read it.
+
+Public API:
+    CollectionIndex.load(collections_root=COLLECTIONS_ROOT) -> CollectionIndex
+        Load the index, refreshing any stale entries.
+
+    CollectionIndex.rebuild(collections_root=COLLECTIONS_ROOT) -> CollectionIndex
+        Build the index from scratch.
+
+    index.collections_for(photo_path) -> list
+        Sorted names of collections that list photo_path or use it as cover.
+
+    index.record(collection_file, collection)
+        Update the entry for a collection that was just written.
+
+    index.save()
+        Write the index to disk.
+
+    record_collection(collection_file, collection)
+        load + record + save, for scripts that write one collection.
+
+The index file sits in the .cache/ directory of the repo that
+collections_root belongs to (<repo>/data/collections).
+
+Usage:
+    # Rebuild the index from scratch
+    python3 scripts/utils/collection_index.py --rebuild
+
+    # Which collections reference a photo
+    python3 scripts/utils/collection_index.py 2025/washington/seattle/foo.jpg
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from atomic_file import write_json_atomic
+from yaml_io import load_yaml, YAMLError
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+COLLECTIONS_ROOT = REPO_ROOT / 'data' / 'collections'
+INDEX_NAME = 'collection-index.json'
+INDEX_VERSION = 1
+
+
+def default_index_path(collections_root):
+    """<repo>/.cache/collection-index.json for <repo>/data/collections."""
+    return Path(collections_root).resolve().parent.parent / '.cache' / INDEX_NAME
+
+
+class CollectionIndex:
+    """
+    Photo path → collection names, backed by per-collection entries.
+
+    Attributes:
+        collections: Dict mapping collection name to its entry (size,
+            mtime_ns, cover_path, photos)
+    """
+    def __init__(self, collections_root=COLLECTIONS_ROOT, index_path=None):
+        self.collections_root = Path(collections_root)
+        self.index_path = Path(index_path) if index_path else default_index_path(collections_root)
+        self.collections = {}
+        self._by_photo = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, collections_root=COLLECTIONS_ROOT, index_path=None):
+        """
+        Load the index from disk, re-reading only stale collections.
+
+        Returns:
+            CollectionIndex in sync with the collection yamls on disk
+        """
+        index = cls(collections_root, index_path)
+        index._read()
+        index.refresh()
+        return index
+
+    def _read(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            self.collections = data.get('collections') or {}
+
+    @classmethod
+    def rebuild(cls, collections_root=COLLECTIONS_ROOT, index_path=None):
+        """Build the index from scratch, reading every collection yaml."""
+        index = cls(collections_root, index_path)
+        index.refresh()
+        index._dirty = True
+        return index
+
+    def refresh(self):
+        """
+        Bring entries in line with the collection yamls on disk.
+
+        Returns:
+            Number of collections that were (re-)read or dropped
+        """
+        seen = set()
+        changed = 0
+        files = sorted(self.collections_root.glob('*.yaml')) if self.collections_root.exists() else []
+        for col_file in files:
+            name = col_file.stem
+            seen.add(name)
+            try:
+                st = col_file.stat()
+            except OSError:
+                continue
+            entry = self.collections.get(name)
+            if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+                continue
+            try:
+                col = load_yaml(col_file) or {}
+            except (OSError, YAMLError):
+                col = {}
+            self._set(name, st, col)
+            changed += 1
+
+        for name in [n for n in self.collections if n not in seen]:
+            del self.collections[name]
+            self._by_photo = None
+            self._dirty = True
+            changed += 1
+
+        return changed
+
+    def _set(self, name, st, col):
+        self.collections[name] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'cover_path': col.get('cover_path') or '',
+            'photos': [p['path'] for p in (col.get('photos') or []) if (p or {}).get('path')],
+        }
+        self._by_photo = None
+        self._dirty = True
+
+    def record(self, collection_file, collection):
+        """
+        Update the entry for a collection that was just written.
+
+        Args:
+            collection_file: Path of the collection yaml
+            collection: The collection dictionary that was written
+        """
+        collection_file = Path(collection_file)
+        try:
+            st = collection_file.stat()
+        except OSError:
+            return
+        self._set(collection_file.stem, st, collection)
+
+    def collections_for(self, photo_path):
+        """
+        Names of collections that reference a photo.
+
+        Args:
+            photo_path: Path relative to photos/
+
+        Returns:
+            Sorted list of collection names that list the photo or use it
+            as cover
+        """
+        if self._by_photo is None:
+            by_photo = {}
+            for name, entry in self.collections.items():
+                for path in entry['photos']:
+                    by_photo.setdefault(path, set()).add(name)
+                if entry.get('cover_path'):
+                    by_photo.setdefault(entry['cover_path'], set()).add(name)
+            self._by_photo = by_photo
+        return sorted(self._by_photo.get(photo_path, ()))
+
+    def save(self):
+        """Write the index to disk if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            write_json_atomic(self.index_path, {'version': INDEX_VERSION, 'collections': self.collections})
+        except OSError:
+            return
+        self._dirty = False
+
+
+def record_collection(collection_file, collection):
+    """
+    Record a just-written collection in the index and save it.
+
+    Args:
+        collection_file: Path of the collection yaml
+        collection: The collection dictionary that was written
+    """
+    # Record first so refresh() doesn't re-parse the file just written
+    index = CollectionIndex(Path(collection_file).parent)
+    index._read()
+    index.record(collection_file, collection)
+    index.refresh()
+    index.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain the photo → collections reverse index')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from scratch')
+    parser.add_argument('photo_paths', nargs='*', help='Photo paths (relative to photos/) to look up')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        index = CollectionIndex.rebuild()
+        index.save()
+        print(f"Indexed {len(index.collections)} collection(s) → {index.index_path.relative_to(REPO_ROOT)}")
+    else:
+        index = CollectionIndex.load()
+        index.save()
+
+    for photo_path in args.photo_paths:
+        photo_path = photo_path.strip().lstrip('/')
+        names = index.collections_for(photo_path)
+        print(f"{photo_path}: {', '.join(names) if names else '(none)'}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
-import os
 import sys
-import yaml
 import argparse
 from pathlib import Path
 
+from collection_index import record_collection
+from yaml_io import write_yaml
+
 def parse_filters(args):
     """Parse filter arguments into a filters dictionary."""
     filters = {}
@@ -47,10 +48,8 @@ def create_collection_structure(collection_name, title, description, filters):
 
 def save_collection(collection_file, collection):
     """Save collection to YAML file."""
-    os.makedirs(os.path.dirname(collection_file), exist_ok=True)
-
-    with open(collection_file, 'w') as f:
-        yaml.dump(collection, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_yaml(collection_file, collection)
+    record_collection(collection_file, collection)
 
 def main():
     parser = argparse.ArgumentParser(
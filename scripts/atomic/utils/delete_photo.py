@@ -1,59 +1,66 @@
 #!/usr/bin/env python3
 
 """
-Cascade-delete a photo from the entire portfolio.
+Cascade-delete photos from the entire portfolio.
 
-Removes:
+For each photo, removes:
 - The source jpg in photos/<path>
 - The metadata yaml in data/photos/<path-with-yaml-suffix>
+- Its record in the data/catalog.json snapshot
 - The small + large webp variants in r2/{small,large}/<path-with-webp-suffix>
 - Every reference to <path> in every collection yaml in data/collections/
   (entries in `photos:` and `cover_path:` if it matched; cover falls back
   to the first remaining photo, else empty string)
 
+Any number of photos can be deleted in one run: every collection yaml is
+read once, filtered against the whole set, and written at most once.
+
 Idempotent: missing pieces are skipped, not errors.
 
 Usage:
-    python3 scripts/utils/delete_photo.py <photo-path>
+    python3 scripts/utils/delete_photo.py <photo-path> [photo-path...]
+    python3 scripts/utils/delete_photo.py --paths-from FILE   # '-' for stdin
 
 Where <photo-path> is the path relative to photos/, e.g.
 "2025/washington/puyallup/Puyallup-Washington-835.jpg".
 """
 
 import sys
-import yaml
 from pathlib import Path
 
+from photo_paths import read_path_list
+from yaml_io import load_yaml, write_yaml
+from collection_index import CollectionIndex
+from catalog_snapshot import default_catalog_path, update_catalog
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python3 scripts/utils/delete_photo.py <photo-path>", file=sys.stderr)
-        sys.exit(1)
+USAGE = "Usage: python3 scripts/utils/delete_photo.py (<photo-path> [photo-path...] | --paths-from FILE|-)"
 
-    photo_path = sys.argv[1].strip().lstrip('/')
-    if not photo_path:
-        print("Error: empty photo path", file=sys.stderr)
-        sys.exit(1)
 
-    project_root = Path(__file__).resolve().parent.parent.parent.parent
-    photos_root = project_root / 'photos'
-    data_photos_root = project_root / 'data' / 'photos'
-    r2_root = project_root / 'r2'
-    collections_root = project_root / 'data' / 'collections'
+def delete_artifacts(project_root, photo_path):
+    """
+    Unlink a photo and every file derived from it.
 
+    Args:
+        project_root: Repository root
+        photo_path: Path relative to photos/
+
+    Returns:
+        (removed, skipped) lists of repo-relative paths
+    """
     rel = Path(photo_path)
     rel_yaml = rel.with_suffix('.yaml')
     rel_webp = rel.with_suffix('.webp')
-
-    removed = []
-    skipped = []
+    r2_root = project_root / 'r2'
 
     targets = [
-        photos_root / rel,
-        data_photos_root / rel_yaml,
+        project_root / 'photos' / rel,
+        project_root / 'data' / 'photos' / rel_yaml,
         r2_root / 'small' / rel_webp,
         r2_root / 'large' / rel_webp,
     ]
+
+    removed = []
+    skipped = []
     for t in targets:
         rel_label = t.relative_to(project_root)
         if t.exists():
@@ -61,29 +68,100 @@ def main():
             removed.append(str(rel_label))
         else:
             skipped.append(str(rel_label))
+    return removed, skipped
+
+
+def remove_from_collections(collections_root, photo_paths):
+    """
+    Drop every reference to the given photos from every collection.
+
+    Only the collections the reverse index says reference one of the
+    photos are loaded, each once, and rewritten only if it changed.
 
-    collections_updated = []
-    for col_file in sorted(collections_root.glob('*.yaml')):
-        with open(col_file) as f:
-            col = yaml.safe_load(f) or {}
+    Args:
+        collections_root: data/collections directory
+        photo_paths: Set of paths relative to photos/
+
+    Returns:
+        Dict mapping each updated collection name to the number of entries
+        removed from it
+    """
+    index = CollectionIndex.load(collections_root)
+    names = set()
+    for photo_path in photo_paths:
+        names.update(index.collections_for(photo_path))
+
+    collections_updated = {}
+    for name in sorted(names):
+        col_file = collections_root / f'{name}.yaml'
+        col = load_yaml(col_file) or {}
 
         changed = False
         photos_list = col.get('photos') or []
-        new_photos = [p for p in photos_list if (p or {}).get('path') != photo_path]
+        new_photos = [p for p in photos_list if (p or {}).get('path') not in photo_paths]
         if len(new_photos) != len(photos_list):
             col['photos'] = new_photos
             changed = True
 
-        if col.get('cover_path') == photo_path:
+        if col.get('cover_path') in photo_paths:
             col['cover_path'] = (new_photos[0]['path'] if new_photos else '')
             changed = True
 
         if changed:
-            with open(col_file, 'w') as f:
-                yaml.dump(col, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
-            collections_updated.append(col_file.stem)
+            write_yaml(col_file, col)
+            index.record(col_file, col)
+            collections_updated[col_file.stem] = len(photos_list) - len(new_photos)
+
+    index.save()
+    return collections_updated
+
+
+def main():
+    args = sys.argv[1:]
+    photo_paths_input = []
+    if '--paths-from' in args:
+        i = args.index('--paths-from')
+        if i + 1 >= len(args):
+            print(USAGE, file=sys.stderr)
+            sys.exit(1)
+        photo_paths_input += read_path_list(args[i + 1])
+        del args[i:i + 2]
+    photo_paths_input = args + photo_paths_input
+
+    if not photo_paths_input:
+        print(USAGE, file=sys.stderr)
+        sys.exit(1)
+
+    photo_paths = []
+    for photo_path in photo_paths_input:
+        photo_path = photo_path.strip().lstrip('/')
+        if not photo_path:
+            print("Error: empty photo path", file=sys.stderr)
+            sys.exit(1)
+        if photo_path not in photo_paths:
+            photo_paths.append(photo_path)
+
+    project_root = Path(__file__).resolve().parent.parent.parent.parent
+    collections_root = project_root / 'data' / 'collections'
+
+    removed = []
+    skipped = []
+    for photo_path in photo_paths:
+        r, s = delete_artifacts(project_root, photo_path)
+        removed += r
+        skipped += s
 
-    print(f"=== Deleted '{photo_path}' ===")
+    data_photos_dir = project_root / 'data' / 'photos'
+    catalog_path = default_catalog_path(data_photos_dir)
+    if catalog_path.exists() and update_catalog(catalog_path, data_photos_dir, removals=photo_paths):
+        removed.append(f"{catalog_path.relative_to(project_root)} record(s)")
+
+    collections_updated = remove_from_collections(collections_root, set(photo_paths))
+
+    if len(photo_paths) == 1:
+        print(f"=== Deleted '{photo_paths[0]}' ===")
+    else:
+        print(f"=== Deleted {len(photo_paths)} photos ===")
     if removed:
         print("Removed:")
         for r in removed:
@@ -93,9 +171,15 @@ def main():
         for s in skipped:
             print(f"  - {s}")
     if collections_updated:
-        print(f"Collections updated: {', '.join(collections_updated)}")
+        if len(photo_paths) == 1:
+            print(f"Collections updated: {', '.join(collections_updated)}")
+        else:
+            print("Collections updated:")
+            for name, count in collections_updated.items():
+                print(f"  {name}: {count} photo(s) removed")
     else:
-        print("No collections referenced this photo.")
+        print("No collections referenced these photos." if len(photo_paths) > 1
+              else "No collections referenced this photo.")
 
 
 if __name__ == '__main__':
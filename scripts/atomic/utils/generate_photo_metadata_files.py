@@ -6,11 +6,23 @@ Generate YAML metadata files for all photos.
 Recursively scans the photos directory and creates a mirrored structure in
 data/photos/ with YAML files containing metadata for each photo.
 
+Runs incrementally: a YAML is only written when its rendered contents
+differ from the file on disk, and YAMLs whose photo no longer exists are
+deleted. Reports created, updated, unchanged and deleted counts.
+
+Also keeps data/catalog.json, a single-file snapshot of every photo's
+record (see catalog_snapshot.py), in step with the YAMLs, and records the
+size and mtime each photo had when its record was rendered.
+
 Usage:
-    python3 generate_metadata_files.py [--dry-run]
+    python3 generate_metadata_files.py [--dry-run] [--jobs N] [--paths-from FILE]
 
 Options:
-    --dry-run    Show what would be created without actually writing files
+    --dry-run          Show what would change without actually writing files
+    --jobs N           Worker processes for metadata extraction (default: one per core)
+    --paths-from FILE  Only process the photos listed in FILE ('-' for stdin),
+                       e.g. the --output-paths file from ingest-photos. No
+                       other YAMLs are scanned or deleted.
 
 Example:
     # Preview what files would be created
@@ -20,54 +32,71 @@ Example:
     python3 generate_metadata_files.py
 """
 
+import os
 import sys
-import yaml
-import shutil
 from pathlib import Path
 
 # Import from the same directory
-from photo_metadata import get_metadata
+from atomic_file import write_file_atomic
+from photo_metadata import get_metadata_many, prune_metadata_cache
+from parallel import default_jobs
+from photo_paths import read_photo_paths
+from catalog_snapshot import (default_catalog_path, load_catalog, build_from_yamls, write_catalog, update_catalog,
+                              default_sources_path, write_sources, update_sources)
+from yaml_io import dump_yaml
 
 
-def obj_to_dict(obj):
+def render_yaml(yaml_data):
     """
-    Recursively convert an object to a dictionary for YAML serialization.
+    Render a photo's metadata dictionary to the YAML bytes written to disk.
 
     Args:
-        obj: Any object
+        yaml_data: Dictionary from PhotoMetadata.to_dict()
 
     Returns:
-        Dictionary representation, recursively processing nested objects
+        UTF-8 encoded YAML document
     """
-    if obj is None:
-        return None
-    elif isinstance(obj, (str, int, float, bool)):
-        return obj
-    elif isinstance(obj, Path):
-        return str(obj)
-    elif isinstance(obj, list):
-        return [obj_to_dict(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        # Recursively convert object attributes to dict
-        return {key: obj_to_dict(value) for key, value in obj.__dict__.items()}
-    else:
-        return obj
+    return dump_yaml(yaml_data).encode('utf-8')
+
 
+def remove_empty_dirs(root):
+    """Remove empty directories under root (bottom-up), keeping root itself."""
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if Path(dirpath) != root and not os.listdir(dirpath):
+            os.rmdir(dirpath)
 
-def generate_metadata_files(photos_dir, data_dir, dry_run=False):
+
+def generate_metadata_files(photos_dir, data_dir, dry_run=False, jobs=None, only=None):
     """
-    Generate YAML metadata files for all photos.
+    Bring data/photos in line with photos/ incrementally.
+
+    Every photo's YAML is rendered (cheap with the metadata cache) and only
+    written when the bytes differ from what's already on disk, so unchanged
+    files keep their mtimes. YAMLs with no corresponding photo are deleted.
+
+    With `only`, just the listed photos are considered: their YAMLs are
+    written, or deleted if the photo no longer exists, and nothing else
+    under photos/ or data/photos/ is scanned.
+
+    data/catalog.json is rewritten from the rendered records on a full run
+    and patched with just the listed photos on a targeted one, in both
+    cases only if its contents change.
 
     Args:
         photos_dir: Path to photos directory
         data_dir: Path to data/photos directory (will be created)
-        dry_run: If True, only show what would be created
+        dry_run: If True, only show what would change
+        jobs: Worker processes for metadata extraction (default: one per core)
+        only: Optional list of photo paths relative to photos_dir
 
     Returns:
         Dictionary with statistics:
-            - created: Number of files created
-            - updated: Number of files updated
+            - created: Number of new files
+            - updated: Number of files whose contents changed
+            - unchanged: Number of files left as they were
+            - deleted: Number of orphaned files removed
             - errors: Number of errors
+            - catalog: 'updated' or 'unchanged' (absent on a dry run)
     """
     photos_dir = Path(photos_dir)
     data_dir = Path(data_dir)
@@ -77,65 +106,152 @@ def generate_metadata_files(photos_dir, data_dir, dry_run=False):
 
     stats = {
         'created': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'deleted': 0,
         'errors': 0
     }
 
-    # Find all image files (excluding imports directory)
-    photo_files = []
-    for ext in image_extensions:
-        photo_files.extend(photos_dir.rglob(f'*{ext}'))
-
-    # Filter out imports directory
-    photo_files = [p for p in photo_files if 'imports' not in p.parts]
+    missing_yamls = []
+    missing_photos = []
+    if only is not None:
+        photo_files = []
+        for rel in only:
+            photo_path = photos_dir / rel
+            if photo_path.suffix not in image_extensions or 'imports' in Path(rel).parts:
+                continue
+            if photo_path.is_file():
+                photo_files.append(photo_path)
+            else:
+                missing_yamls.append(data_dir / Path(rel).with_suffix('.yaml'))
+                missing_photos.append(str(rel))
+    else:
+        # Find all image files (excluding imports directory)
+        photo_files = []
+        for ext in image_extensions:
+            photo_files.extend(photos_dir.rglob(f'*{ext}'))
 
-    # Delete existing metadata files before regenerating
-    if data_dir.exists():
-        print("Deleting existing metadata files...")
-        if not dry_run:
-            shutil.rmtree(data_dir)
-        print()
+        # Filter out imports directory
+        photo_files = [p for p in photo_files if 'imports' not in p.parts]
 
     print(f"Found {len(photo_files)} photos to process")
     print()
 
-    for photo_path in sorted(photo_files):
+    expected_yamls = set()
+    records = {}
+    sources = {}
+    failed = []
+
+    # Each record is stamped with its photo's size and mtime from before the
+    # read, so a photo that changes mid-run never looks current
+    stamps = {}
+    for photo_path in photo_files:
+        try:
+            stat = photo_path.stat()
+        except OSError:
+            continue
+        stamps[photo_path] = (stat.st_size, stat.st_mtime_ns)
+
+    # Metadata is extracted across worker processes but comes back in
+    # sorted order, so output is the same as a serial run
+    for photo_path, metadata in get_metadata_many(sorted(photo_files), jobs=jobs, with_dhash=True):
         # Get relative path from photos directory
         rel_path = photo_path.relative_to(photos_dir)
 
         # Create corresponding YAML path in data/photos
         yaml_path = data_dir / rel_path.with_suffix('.yaml')
+        expected_yamls.add(yaml_path)
 
-        # Read metadata
-        metadata = get_metadata(photo_path)
         if not metadata:
             print(f"Error: Could not read metadata from {rel_path}")
             stats['errors'] += 1
+            failed.append(str(rel_path))
             continue
 
-        # Convert metadata object to dictionary dynamically
-        yaml_data = obj_to_dict(metadata)
+        yaml_data = metadata.to_dict()
 
         # Override path to be relative to photos directory (not absolute)
         yaml_data['path'] = str(rel_path)
+        records[yaml_data['path']] = yaml_data
+        if photo_path in stamps:
+            sources[yaml_data['path']] = stamps[photo_path]
+
+        content = render_yaml(yaml_data)
+        label = yaml_path.relative_to(data_dir.parent)
+
+        try:
+            existing = yaml_path.read_bytes()
+        except FileNotFoundError:
+            existing = None
+
+        if existing == content:
+            stats['unchanged'] += 1
+            continue
+
+        action = 'created' if existing is None else 'updated'
 
         if dry_run:
-            print(f"Create: {yaml_path.relative_to(data_dir.parent)}")
-            stats['created'] += 1
-        else:
-            # Create parent directory if needed
-            yaml_path.parent.mkdir(parents=True, exist_ok=True)
+            print(f"{'Create' if existing is None else 'Update'}: {label}")
+            stats[action] += 1
+            continue
 
-            # Write YAML file
-            try:
-                with open(yaml_path, 'w') as f:
-                    yaml.dump(yaml_data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        try:
+            write_file_atomic(yaml_path, content)
+            print(f"{action.capitalize()}: {label}")
+            stats[action] += 1
+        except Exception as e:
+            print(f"Error writing {yaml_path}: {e}")
+            stats['errors'] += 1
+            sources.pop(yaml_data['path'], None)
+
+    # Delete YAMLs whose photo no longer exists
+    if only is not None:
+        orphans = [p for p in missing_yamls if p.exists()]
+    elif data_dir.exists():
+        orphans = [p for p in sorted(data_dir.rglob('*.yaml')) if p not in expected_yamls]
+    else:
+        orphans = []
+
+    if orphans:
+        for yaml_path in orphans:
+            label = yaml_path.relative_to(data_dir.parent)
+            if dry_run:
+                print(f"Delete: {label}")
+            else:
+                yaml_path.unlink()
+                print(f"Deleted: {label}")
+            stats['deleted'] += 1
+
+        if not dry_run and stats['deleted']:
+            remove_empty_dirs(data_dir)
+
+    if not dry_run:
+        catalog_path = default_catalog_path(data_dir)
+        if only is None:
+            # Every photo was just rendered; ones that failed to read keep
+            # their previous record, as they keep their YAML
+            if failed:
+                previous = load_catalog(catalog_path)
+                if previous is None:
+                    previous = build_from_yamls(data_dir)
+                for path in failed:
+                    if path in previous:
+                        records[path] = previous[path]
+            written = write_catalog(catalog_path, records)
+        else:
+            written = update_catalog(catalog_path, data_dir, records, missing_photos)
+        stats['catalog'] = 'updated' if written else 'unchanged'
 
-                print(f"Created: {yaml_path.relative_to(data_dir.parent)}")
-                stats['created'] += 1
+        sources_path = default_sources_path(data_dir)
+        if only is None:
+            write_sources(sources_path, sources)
+        else:
+            update_sources(sources_path, sources, missing_photos + failed)
 
-            except Exception as e:
-                print(f"Error writing {yaml_path}: {e}")
-                stats['errors'] += 1
+    # Forget cached metadata for photos that were deleted or moved (a
+    # targeted run leaves that to the next full one)
+    if not dry_run and only is None:
+        prune_metadata_cache()
 
     return stats
 
@@ -145,7 +261,11 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Generate YAML metadata files for all photos')
-    parser.add_argument('--dry-run', action='store_true', help='Show what would be created without writing files')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would change without writing files')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for metadata extraction (default: one per core)')
+    parser.add_argument('--paths-from', metavar='FILE',
+                        help="Only process the photos listed in FILE, one per line ('-' for stdin)")
     args = parser.parse_args()
 
     # Get repository root (two levels up from this script)
@@ -165,14 +285,25 @@ def main():
         print("DRY RUN - No files will be created")
         print()
 
-    stats = generate_metadata_files(photos_dir, data_dir, dry_run=args.dry_run)
+    only = None
+    if args.paths_from:
+        only, rejected = read_photo_paths(args.paths_from, photos_dir)
+        for path in rejected:
+            print(f"Warning: not within photos directory, ignoring: {path}")
+
+    stats = generate_metadata_files(photos_dir, data_dir, dry_run=args.dry_run, jobs=args.jobs, only=only)
 
     # Print summary
     print()
     print("=" * 60)
     print("Summary:")
-    print(f"  Created: {stats['created']}")
-    print(f"  Errors:  {stats['errors']}")
+    print(f"  Created:   {stats['created']}")
+    print(f"  Updated:   {stats['updated']}")
+    print(f"  Unchanged: {stats['unchanged']}")
+    print(f"  Deleted:   {stats['deleted']}")
+    print(f"  Errors:    {stats['errors']}")
+    if 'catalog' in stats:
+        print(f"  Catalog:   {stats['catalog']}")
     print("=" * 60)
 
     if args.dry_run:
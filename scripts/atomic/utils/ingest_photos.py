@@ -13,14 +13,48 @@ Uses metadata to determine:
 Falls back to:
     - Year: "unknown-year" if no date metadata
     - Location: "unknown-location" if no city metadata
+
+Runs in two phases. First metadata is read for every import (in parallel)
+and the whole move plan is worked out: each destination, whether it
+replaces an existing photo, and whether it's on another filesystem. Imports
+that would land on the same destination as each other are refused rather
+than silently overwriting one another. Then the moves are executed, as
+plain renames wherever source and destination share a filesystem.
+
+Each import's perceptual hash (read along with its metadata) is looked up
+among the photos in data/catalog.json and the imports planned before it.
+A near-duplicate, such as a Lightroom re-export under a new name, is
+reported, or with --block-duplicates left in imports/, before it costs an
+encode and an upload. An import replacing the very photo it matches is
+not a duplicate.
+
+Usage:
+    python3 ingest_photos.py [--dry-run [--json]] [--jobs N] [--output-paths FILE]
+        [--block-duplicates] [--duplicate-distance N]
+
+Options:
+    --dry-run               Show the plan without moving anything
+    --json                  With --dry-run, print the plan as JSON instead
+    --jobs N                Worker processes for metadata extraction (default: one per core)
+    --output-paths FILE     Write the destination of every moved photo to FILE
+    --block-duplicates      Leave near-duplicates in imports/ instead of ingesting them
+    --duplicate-distance N  Maximum differing hash bits for a near-duplicate (default: 4)
 """
 
+import os
 import sys
+import json
 import shutil
+import argparse
 from pathlib import Path
 
 # Import metadata utilities
-from photo_metadata import get_metadata
+from photo_metadata import get_metadata, get_metadata_many, move_cached_metadata
+from parallel import default_jobs
+from perceptual_hash import DUPLICATE_DISTANCE, library_index
+
+# Files in imports/ that get ingested
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.JPG', '.JPEG', '.PNG', '.GIF'}
 
 
 def extract_year_from_date(date_string):
@@ -68,23 +102,18 @@ def sanitize_location(location):
     return sanitized if sanitized else None
 
 
-def ingest_photo(photo_path, photos_root, dry_run=False):
+def destination_for(photo_path, metadata, photos_root):
     """
-    Ingest a single photo by moving it to the appropriate year/location directory.
+    Work out where an import belongs: photos_root/year/state/city/filename.
 
     Args:
         photo_path: Path to the photo in imports folder
+        metadata: The photo's PhotoMetadata
         photos_root: Root photos directory (e.g., /path/to/photos)
-        dry_run: If True, only print what would happen without moving files
 
     Returns:
-        Tuple of (success: bool, message: str, destination: Path or None, replaced: bool)
+        Destination Path
     """
-    # Read metadata
-    metadata = get_metadata(photo_path)
-    if not metadata:
-        return False, f"Could not read metadata from {photo_path.name}", None, False
-
     # Determine year
     year = extract_year_from_date(metadata.date)
     if not year:
@@ -111,7 +140,163 @@ def ingest_photo(photo_path, photos_root, dry_run=False):
     else:
         dest_dir = photos_root / year / "unknown-location"
 
-    dest_path = dest_dir / photo_path.name
+    return dest_dir / photo_path.name
+
+
+def is_cross_device(source, dest):
+    """
+    Check whether moving source to dest crosses a filesystem boundary.
+
+    The destination directory may not exist yet, so its nearest existing
+    ancestor is compared instead.
+    """
+    existing = dest.parent
+    while not existing.exists() and existing != existing.parent:
+        existing = existing.parent
+    try:
+        return os.stat(source).st_dev != os.stat(existing).st_dev
+    except OSError:
+        return True
+
+
+def _relative_name(path, photos_root):
+    """path relative to photos_root as a posix string (its name if outside)."""
+    try:
+        return path.relative_to(photos_root).as_posix()
+    except ValueError:
+        return path.name
+
+
+def plan_ingest(photos, photos_root, jobs=None, block_duplicates=False, duplicate_distance=DUPLICATE_DISTANCE):
+    """
+    Work out the full move plan before anything is moved.
+
+    Args:
+        photos: Paths of the photos in imports folder
+        photos_root: Root photos directory
+        jobs: Worker processes for metadata extraction (default: one per core)
+        block_duplicates: Refuse imports that near-duplicate a photo in the
+            catalog or an earlier import, instead of only reporting them
+        duplicate_distance: Maximum differing hash bits for a near-duplicate
+
+    Returns:
+        List of plan entries (one per photo, sorted by source), each a dict:
+            - source: Path in imports
+            - dest: Destination Path, or None if metadata couldn't be read
+            - action: 'move', 'replace' (dest exists and will be
+              overwritten), 'collision' (another import has the same
+              dest; refused), 'duplicate' (near-duplicate, refused with
+              block_duplicates) or 'error'
+            - cross_device: True if dest is on another filesystem
+            - duplicate_of: Closest near-duplicate (path relative to
+              photos_root), or None
+            - distance: Hash distance to duplicate_of, or None
+            - error: Reason for 'collision' / 'duplicate' / 'error', else None
+    """
+    index = library_index(photos_root)
+
+    plan = []
+    for photo_path, metadata in get_metadata_many(sorted(photos), jobs=jobs, with_dhash=True):
+        entry = {'source': photo_path, 'dest': None, 'action': 'error', 'cross_device': False,
+                 'duplicate_of': None, 'distance': None, 'error': None}
+        if not metadata:
+            entry['error'] = f"Could not read metadata from {photo_path.name}"
+        else:
+            dest = destination_for(photo_path, metadata, photos_root)
+            entry['dest'] = dest
+            entry['action'] = 'replace' if dest.exists() else 'move'
+            entry['cross_device'] = is_cross_device(photo_path, dest)
+
+            if metadata.dhash:
+                dest_name = _relative_name(dest, photos_root)
+                matches = [m for m in index.find(metadata.dhash, duplicate_distance) if m[1] != dest_name]
+                if matches:
+                    entry['distance'], entry['duplicate_of'] = matches[0]
+                    if block_duplicates:
+                        entry['action'] = 'duplicate'
+                        entry['error'] = f"Duplicate of {entry['duplicate_of']} (hash distance {entry['distance']})"
+                # Later imports are checked against this one too, unless it stays behind
+                if entry['action'] != 'duplicate':
+                    index.add(metadata.dhash, _relative_name(photo_path, photos_root))
+        plan.append(entry)
+
+    # Imports that map onto the same file (compared case-insensitively, as
+    # on the default macOS filesystem) would overwrite each other
+    by_dest = {}
+    for entry in plan:
+        if entry['dest'] is not None:
+            by_dest.setdefault(str(entry['dest']).casefold(), []).append(entry)
+    for entries in by_dest.values():
+        if len(entries) < 2:
+            continue
+        for entry in entries:
+            others = ', '.join(e['source'].name for e in entries if e is not entry)
+            entry['action'] = 'collision'
+            entry['error'] = f"Same destination as {others}"
+
+    return plan
+
+
+def execute_move(entry, photos_root):
+    """
+    Carry out one 'move' or 'replace' plan entry.
+
+    Uses an atomic rename when source and destination share a filesystem,
+    and shutil.move (copy + delete) otherwise. The photo's cached metadata
+    follows it to the new path.
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    source, dest = entry['source'], entry['dest']
+    try:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if entry['cross_device']:
+            shutil.move(str(source), str(dest))
+        else:
+            os.replace(source, dest)
+    except Exception as e:
+        return False, f"Error moving file: {e}"
+
+    move_cached_metadata(source, dest)
+    action = "Replaced" if entry['action'] == 'replace' else "Moved to"
+    return True, f"{action}: {dest.relative_to(photos_root)}"
+
+
+def plan_to_json(plan, photos_root):
+    """Render a plan as JSON, with destinations relative to photos_root."""
+    return json.dumps([
+        {
+            'source': entry['source'].name,
+            'dest': str(entry['dest'].relative_to(photos_root)) if entry['dest'] else None,
+            'action': entry['action'],
+            'cross_device': entry['cross_device'],
+            'duplicate_of': entry['duplicate_of'],
+            'distance': entry['distance'],
+            'error': entry['error'],
+        }
+        for entry in plan
+    ], indent=2)
+
+
+def ingest_photo(photo_path, photos_root, dry_run=False):
+    """
+    Ingest a single photo by moving it to the appropriate year/location directory.
+
+    Args:
+        photo_path: Path to the photo in imports folder
+        photos_root: Root photos directory (e.g., /path/to/photos)
+        dry_run: If True, only print what would happen without moving files
+
+    Returns:
+        Tuple of (success: bool, message: str, destination: Path or None, replaced: bool)
+    """
+    # Read metadata
+    metadata = get_metadata(photo_path)
+    if not metadata:
+        return False, f"Could not read metadata from {photo_path.name}", None, False
+
+    dest_path = destination_for(photo_path, metadata, photos_root)
 
     # Check if destination already exists (will be replaced)
     replaced = dest_path.exists()
@@ -120,25 +305,37 @@ def ingest_photo(photo_path, photos_root, dry_run=False):
     if dry_run:
         action = "Would replace" if replaced else "Would move to"
         return True, f"{action}: {dest_path.relative_to(photos_root)}", dest_path, replaced
-    else:
-        try:
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(photo_path), str(dest_path))
-            action = "Replaced" if replaced else "Moved to"
-            return True, f"{action}: {dest_path.relative_to(photos_root)}", dest_path, replaced
-        except Exception as e:
-            return False, f"Error moving file: {e}", None, False
+
+    entry = {
+        'source': photo_path,
+        'dest': dest_path,
+        'action': 'replace' if replaced else 'move',
+        'cross_device': is_cross_device(photo_path, dest_path),
+    }
+    success, message = execute_move(entry, photos_root)
+    return success, message, dest_path if success else None, replaced if success else False
 
 
 def main():
     """Main entry point for photo ingestion."""
     # Parse arguments
-    dry_run = '--dry-run' in sys.argv
-    output_paths_file = None
-    if '--output-paths' in sys.argv:
-        i = sys.argv.index('--output-paths')
-        if i + 1 < len(sys.argv):
-            output_paths_file = Path(sys.argv[i + 1])
+    parser = argparse.ArgumentParser(description='Move photos from photos/imports/ into photos/YYYY/location/')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan without moving files')
+    parser.add_argument('--json', action='store_true', help='With --dry-run, print the plan as JSON')
+    parser.add_argument('--jobs', type=int, default=default_jobs(),
+                        help='Worker processes for metadata extraction (default: one per core)')
+    parser.add_argument('--output-paths', type=Path, metavar='FILE',
+                        help='Write the destination of every moved photo to FILE')
+    parser.add_argument('--block-duplicates', action='store_true',
+                        help='Leave near-duplicates of existing photos or other imports in imports/')
+    parser.add_argument('--duplicate-distance', type=int, default=DUPLICATE_DISTANCE, metavar='N',
+                        help=f'Maximum differing hash bits for a near-duplicate (default: {DUPLICATE_DISTANCE})')
+    args = parser.parse_args()
+    if args.json and not args.dry_run:
+        parser.error('--json requires --dry-run')
+
+    dry_run = args.dry_run
+    output_paths_file = args.output_paths
 
     # Get project root (photography directory)
     script_dir = Path(__file__).parent
@@ -148,6 +345,9 @@ def main():
 
     # Check if imports directory exists
     if not imports_dir.exists():
+        if args.json:
+            print(plan_to_json([], photos_root))
+            return 0
         print(f"Imports directory not found: {imports_dir}")
         print("Creating it now...")
         imports_dir.mkdir(parents=True, exist_ok=True)
@@ -156,8 +356,15 @@ def main():
         return 0
 
     # Find all image files in imports
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.JPG', '.JPEG', '.PNG', '.GIF'}
-    photos = [f for f in imports_dir.iterdir() if f.is_file() and f.suffix in image_extensions]
+    photos = [f for f in imports_dir.iterdir() if f.is_file() and f.suffix in IMAGE_EXTENSIONS]
+
+    # Plan every move before touching anything
+    plan = plan_ingest(photos, photos_root, jobs=args.jobs, block_duplicates=args.block_duplicates,
+                       duplicate_distance=args.duplicate_distance)
+
+    if args.json:
+        print(plan_to_json(plan, photos_root))
+        return 0 if all(e['action'] in ('move', 'replace') for e in plan) else 1
 
     if not photos:
         print(f"No photos found in {imports_dir.relative_to(project_root)}")
@@ -170,25 +377,46 @@ def main():
     print(f"{'=' * 60}")
     print(f"Found {len(photos)} photo(s) in imports/\n")
 
+    collisions = [e for e in plan if e['action'] == 'collision']
+    if collisions:
+        print(f"Refusing {len(collisions)} photo(s) that map to the same destination:")
+        for entry in collisions:
+            print(f"  ✗ {entry['source'].name} → {entry['dest'].relative_to(photos_root)}")
+        print()
+
     # Process each photo
     success_count = 0
     error_count = 0
     replaced_count = 0
+    duplicate_count = 0
     ingested_dest_paths: list[Path] = []
 
-    for photo_path in sorted(photos):
-        success, message, dest_path, replaced = ingest_photo(photo_path, photos_root, dry_run)
+    for entry in plan:
+        replaced = entry['action'] == 'replace'
+        if entry['action'] in ('error', 'collision', 'duplicate'):
+            success, message = False, entry['error']
+        elif dry_run:
+            action = "Would replace" if replaced else "Would move to"
+            success, message = True, f"{action}: {entry['dest'].relative_to(photos_root)}"
+            if entry['cross_device']:
+                message += " (copy across filesystems)"
+        else:
+            success, message = execute_move(entry, photos_root)
 
         status = "✓" if success else "✗"
-        print(f"{status} {photo_path.name}")
+        print(f"{status} {entry['source'].name}")
         print(f"  {message}")
+        if entry['duplicate_of'] is not None:
+            duplicate_count += 1
+            if entry['action'] != 'duplicate':
+                print(f"  ⚠ Looks like a duplicate of {entry['duplicate_of']} (hash distance {entry['distance']})")
 
         if success:
             success_count += 1
             if replaced:
                 replaced_count += 1
-            if dest_path is not None and not dry_run:
-                ingested_dest_paths.append(dest_path)
+            if not dry_run:
+                ingested_dest_paths.append(entry['dest'])
         else:
             error_count += 1
 
@@ -203,6 +431,11 @@ def main():
     print(f"Summary: {success_count} succeeded, {error_count} failed")
     if replaced_count > 0:
         print(f"  ({replaced_count} photo(s) replaced existing files)")
+    if duplicate_count > 0:
+        if args.block_duplicates:
+            print(f"  ({duplicate_count} near-duplicate(s) left in imports/)")
+        else:
+            print(f"  ({duplicate_count} possible duplicate(s); --block-duplicates to refuse them)")
 
     if dry_run:
         print("\nThis was a dry run. Use without --dry-run to move files.")
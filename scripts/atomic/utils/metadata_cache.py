@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+Persistent on-disk cache of parsed photo metadata.
+
+Backs get_metadata() in photo_metadata.py so repeated runs of the atomic
+scripts don't re-parse every JPG. Entries live in a SQLite database at
+.cache/photo-metadata.sqlite (gitignored), keyed by the photo's path
+relative to the repo root and validated against the file's size and mtime:
+an entry is only returned while both still match, so edited or re-exported
+photos are re-read automatically. prune() drops entries whose file no
+longer exists.
+
+Records are plain dictionaries (the same shape as the data/photos yamls);
+converting to and from PhotoMetadata is photo_metadata's job.
+
+Bump SCHEMA_VERSION whenever the record shape or the way metadata is
+extracted changes; a cache written with another version is discarded.
+"""
+
+import os
+import json
+import sqlite3
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+CACHE_PATH = REPO_ROOT / '.cache' / 'photo-metadata.sqlite'
+SCHEMA_VERSION = 3
+
+# Commit after this many writes (and at close) instead of after every put
+COMMIT_EVERY = 200
+
+
+class MetadataCache:
+    """
+    SQLite-backed metadata cache.
+
+    Lookups and writes never raise on database errors: a cache that can't be
+    read or written simply behaves as empty, and callers fall back to
+    reading the file.
+    """
+    def __init__(self, db_path=CACHE_PATH, root=REPO_ROOT):
+        self.db_path = Path(db_path)
+        self.root = os.path.abspath(root)
+        self._conn = None
+        self._pending = 0
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+
+        (version,) = conn.execute('PRAGMA user_version').fetchone()
+        if version != SCHEMA_VERSION:
+            conn.execute('DROP TABLE IF EXISTS metadata')
+            conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            ' path TEXT PRIMARY KEY,'
+            ' size INTEGER NOT NULL,'
+            ' mtime_ns INTEGER NOT NULL,'
+            ' record TEXT NOT NULL)'
+        )
+        conn.commit()
+
+        self._conn = conn
+        return conn
+
+    def key(self, photo_path):
+        """Return the cache key for a photo: its path relative to the repo root."""
+        abs_path = os.path.abspath(photo_path)
+        if abs_path.startswith(self.root + os.sep):
+            return abs_path[len(self.root) + 1:].replace(os.sep, '/')
+        return abs_path
+
+    def get(self, photo_path, stat):
+        """
+        Look up a cached record.
+
+        Args:
+            photo_path: Path to the photo
+            stat: os.stat_result for the photo (used to validate the entry)
+
+        Returns:
+            Record dictionary, or None on a miss or a stale entry
+        """
+        try:
+            row = self._connect().execute(
+                'SELECT size, mtime_ns, record FROM metadata WHERE path = ?',
+                (self.key(photo_path),),
+            ).fetchone()
+        except (sqlite3.Error, OSError):
+            return None
+
+        if row is None:
+            return None
+        size, mtime_ns, record = row
+        if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+        return json.loads(record)
+
+    def put(self, photo_path, stat, record):
+        """
+        Store a record for a photo, replacing any previous entry.
+
+        Args:
+            photo_path: Path to the photo
+            stat: os.stat_result the record was read under
+            record: JSON-serializable record dictionary
+        """
+        try:
+            self._connect().execute(
+                'INSERT OR REPLACE INTO metadata (path, size, mtime_ns, record) VALUES (?, ?, ?, ?)',
+                (self.key(photo_path), stat.st_size, stat.st_mtime_ns, json.dumps(record)),
+            )
+        except (sqlite3.Error, OSError):
+            return
+
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def rename(self, old_path, new_path):
+        """
+        Move an entry to a photo's new path after the file was moved.
+
+        A rename keeps the file's size and mtime, so the entry stays valid
+        and the photo doesn't have to be re-read at its new location.
+
+        Args:
+            old_path: Path the photo was cached under
+            new_path: Path the photo lives at now
+        """
+        try:
+            conn = self._connect()
+            conn.execute('DELETE FROM metadata WHERE path = ?', (self.key(new_path),))
+            conn.execute(
+                'UPDATE metadata SET path = ? WHERE path = ?',
+                (self.key(new_path), self.key(old_path)),
+            )
+        except (sqlite3.Error, OSError):
+            return
+
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def prune(self):
+        """
+        Drop entries whose photo no longer exists on disk.
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            conn = self._connect()
+            keys = [row[0] for row in conn.execute('SELECT path FROM metadata')]
+            missing = [
+                (k,) for k in keys
+                if not os.path.exists(k if os.path.isabs(k) else os.path.join(self.root, k))
+            ]
+            if missing:
+                conn.executemany('DELETE FROM metadata WHERE path = ?', missing)
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            return 0
+
+        return len(missing)
+
+    def commit(self):
+        """Flush pending writes to disk."""
+        if self._conn is None or not self._pending:
+            return
+        try:
+            self._conn.commit()
+        except sqlite3.Error:
+            pass
+        self._pending = 0
+
+    def close(self):
+        """Flush pending writes and close the database."""
+        self.commit()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
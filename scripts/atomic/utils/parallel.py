@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+Process-pool helpers shared by the atomic utils.
+
+Public API:
+    ordered_map(fn, items, jobs=None, window=None) -> iterator
+        Like map(), but runs fn across worker processes and yields the
+        results in input order with a bounded number of items in flight.
+
+    unordered_map(fn, items, jobs=None, window=None) -> iterator
+        Same, but yields each result as soon as it's ready.
+
+    default_jobs() -> int
+        Worker count used when --jobs isn't given (one per core).
+
+concurrent.futures is imported by the pooled paths only, so importing this
+module (or running with jobs=1) doesn't pay for it.
+"""
+
+import os
+from collections import deque
+
+
+def default_jobs():
+    """Return the default number of worker processes (one per core)."""
+    return os.cpu_count() or 1
+
+
+def ordered_map(fn, items, jobs=None, window=None):
+    """
+    Apply fn to every item across a process pool, yielding results in order.
+
+    At most `window` items are submitted ahead of the one being yielded, so
+    memory stays bounded however many items there are, and output order is
+    deterministic regardless of which worker finishes first. With jobs=1 the
+    work runs in-process without a pool.
+
+    Args:
+        fn: Picklable, module-level callable taking one item
+        items: Iterable of picklable items
+        jobs: Number of worker processes (default: one per core)
+        window: Maximum items in flight (default: 4 per worker)
+
+    Yields:
+        fn(item) for each item, in input order
+    """
+    jobs = jobs or default_jobs()
+
+    if jobs <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    window = window or jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        in_flight = deque()
+        for item in items:
+            in_flight.append(ex.submit(fn, item))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def unordered_map(fn, items, jobs=None, window=None):
+    """
+    Apply fn to every item across a process pool, yielding results as they finish.
+
+    Like ordered_map, at most `window` items are in flight, and no new item
+    is submitted while the caller is still handling a result, so a slow
+    consumer holds the workers back instead of letting results pile up.
+
+    Args:
+        fn: Picklable, module-level callable taking one item
+        items: Iterable of picklable items
+        jobs: Number of worker processes (default: one per core)
+        window: Maximum items in flight (default: 4 per worker)
+
+    Yields:
+        fn(item) for each item, in completion order
+    """
+    jobs = jobs or default_jobs()
+
+    if jobs <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+    window = window or jobs * 4
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        in_flight = set()
+        for item in items:
+            in_flight.add(ex.submit(fn, item))
+            if len(in_flight) >= window:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in as_completed(in_flight):
+            yield fut.result()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+"""
+Perceptual hashes for finding duplicate and near-duplicate photos.
+
+Lightroom re-exports a photo under a new name (Seattle-Washington--2917.jpg
+next to Seattle-Washington-2917.jpg) with slightly different bytes, so
+content digests don't match. A difference hash (dHash) does: the photo is
+shrunk to a 9x8 grayscale thumbnail and each bit records whether a pixel
+is brighter than its right-hand neighbour. Re-encodes, resizes and small
+edits flip a few of the 64 bits; different photos differ in about half.
+
+The thumbnail is taken from a draft decode (libjpeg scales by 1/8 while
+decoding). That avoids the full-size pixel buffer, but the whole file is
+still decoded: over 100 ms for a 24 MP JPG, where reading its metadata
+takes well under one. So hashes are only computed where photos get
+compared (ingest planning and generate-photo-metadata-files, through
+get_metadata_many(with_dhash=True)) and are cached with the metadata.
+
+Hashes are 16-character hex strings, stored as `dhash` in the photo yamls
+and data/catalog.json (see PhotoMetadata).
+
+Public API:
+    dhash(photo_path) -> str or None
+        Hash of an image file (None if it can't be decoded).
+
+    hamming(a, b) -> int
+        Number of differing bits between two hashes.
+
+    BKTree
+        Index of hashes supporting "everything within distance d" queries
+        without comparing against every entry.
+
+    library_index(photos_root) -> BKTree
+        Index of every hashed photo in data/catalog.json, keyed by path.
+
+    DUPLICATE_DISTANCE
+        Default distance at or under which two photos count as duplicates.
+
+Usage:
+    # List near-duplicate pairs already in the library
+    python3 scripts/atomic/utils/perceptual_hash.py [--distance 4]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+HASH_SIZE = 8
+
+# Re-exports of one photo land within a couple of bits of each other;
+# consecutive frames of a burst are usually further apart than this
+DUPLICATE_DISTANCE = 4
+
+
+def dhash(photo_path, hash_size=HASH_SIZE):
+    """
+    Compute the difference hash of an image.
+
+    Args:
+        photo_path: Path to the image
+        hash_size: Bits per row and number of rows (64-bit hash for 8)
+
+    Returns:
+        Hash as a hex string, or None if PIL is missing or the image
+        can't be decoded
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(photo_path) as img:
+            # JPEGs decode at the smallest scale that's still this big
+            img.draft('L', (hash_size * 4, hash_size * 4))
+            img = ImageOps.exif_transpose(img)
+            thumb = img.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+            pixels = thumb.tobytes()
+    except Exception:
+        return None
+
+    value = 0
+    width = hash_size + 1
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f'{value:0{hash_size * hash_size // 4}x}'
+
+
+def hamming(a, b):
+    """Number of bits that differ between two hex hashes."""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over hashes under Hamming distance.
+
+    Each child hangs off its parent by its distance to it, so a query
+    within distance d of a hash only descends into children whose edge is
+    within d of the query's own distance to the node (triangle
+    inequality). For small d that is a small fraction of the tree.
+
+    Values stored under equal hashes are kept together.
+    """
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: Optional iterable of (hash, value) pairs to add
+        """
+        self._root = None  # [hash as int, values, {distance: child}]
+        self._size = 0
+        for hash_value, value in entries:
+            self.add(hash_value, value)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, hash_value, value):
+        """Add a value under a hex hash."""
+        h = int(hash_value, 16)
+        self._size += 1
+        if self._root is None:
+            self._root = [h, [value], {}]
+            return
+        node = self._root
+        while True:
+            distance = bin(h ^ node[0]).count('1')
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [h, [value], {}]
+                return
+            node = child
+
+    def find(self, hash_value, max_distance):
+        """
+        Find every value whose hash is within max_distance of hash_value.
+
+        Returns:
+            List of (distance, value) tuples, nearest first
+        """
+        h = int(hash_value, 16)
+        matches = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = bin(h ^ node[0]).count('1')
+            if distance <= max_distance:
+                matches.extend((distance, value) for value in node[1])
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node[2].items() if low <= edge <= high)
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+
+def library_index(photos_root):
+    """
+    Index the hashes recorded in data/catalog.json.
+
+    Photos generated before hashes were recorded (or that couldn't be
+    decoded) have no dhash and aren't indexed.
+
+    Args:
+        photos_root: photos/ directory (data/ is its sibling)
+
+    Returns:
+        BKTree mapping each hash to photo paths relative to photos_root
+    """
+    from catalog_snapshot import default_catalog_path, load_catalog
+
+    catalog_path = default_catalog_path(Path(photos_root).parent / 'data' / 'photos')
+    records = load_catalog(catalog_path) or {}
+    return BKTree((record['dhash'], path) for path, record in sorted(records.items()) if record.get('dhash'))
+
+
+def main():
+    from catalog_snapshot import default_catalog_path, load_catalog
+
+    repo_root = Path(__file__).resolve().parent.parent.parent.parent
+
+    parser = argparse.ArgumentParser(description='List near-duplicate photos recorded in data/catalog.json')
+    parser.add_argument('--distance', type=int, default=DUPLICATE_DISTANCE,
+                        help=f'Maximum differing bits to count as a duplicate (default: {DUPLICATE_DISTANCE})')
+    args = parser.parse_args()
+
+    records = load_catalog(default_catalog_path(repo_root / 'data' / 'photos')) or {}
+    hashed = [(path, record['dhash']) for path, record in sorted(records.items()) if record.get('dhash')]
+    if not hashed:
+        print("No hashed photos in data/catalog.json (run generate-photo-metadata-files)")
+        return 0
+
+    # Query each photo against the ones before it, so each pair shows once
+    index = BKTree()
+    pairs = 0
+    for path, hash_value in hashed:
+        for distance, other in index.find(hash_value, args.distance):
+            print(f"{distance:2d}  {other}  {path}")
+            pairs += 1
+        index.add(hash_value, path)
+
+    print(f"{pairs} near-duplicate pair(s) among {len(hashed)} hashed photo(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""
+In-memory photo catalog with inverted indexes for filter queries.
+
+Reads every photo's metadata once and indexes it by keyword, by each
+location level (sublocation, city, state, country), by rating and by date,
+so a collection's filters resolve through set intersections instead of a
+matches_filters() call per photo. Results are identical to running
+matches_filters() over every photo.
+
+Public API:
+    PhotoCatalog.from_photos(photos_dir, jobs=None, source='catalog') -> PhotoCatalog
+        Build a catalog from every JPG under photos_dir. By default the
+        metadata comes from data/catalog.json and data/photos yamls where
+        they're up to date, and from the JPG only where they aren't
+        (source='jpeg' reads every JPG).
+
+    catalog.query(filters) -> list
+        Sorted photo paths (relative to photos_dir) matching the filters.
+
+Example:
+    from photo_catalog import PhotoCatalog
+
+    catalog = PhotoCatalog.from_photos(project_root / 'photos')
+    catalog.query({'location': 'Seattle', 'rating': '4+'})
+    # ['2025/washington/seattle/Seattle-Washington-452.jpg', ...]
+"""
+
+from bisect import bisect_left
+from pathlib import Path
+
+from photo_metadata import metadata_source
+
+# JPG files exported from Lightroom
+JPG_EXTENSIONS = {'.jpg', '.jpeg', '.JPG', '.JPEG'}
+LOCATION_LEVELS = ('sublocation', 'city', 'state', 'country')
+
+
+class PhotoCatalog:
+    """
+    Photo metadata keyed by path, plus inverted indexes.
+
+    Attributes:
+        photos: Dict mapping relative photo path to PhotoMetadata
+    """
+    def __init__(self):
+        self.photos = {}
+        self._by_keyword = {}
+        self._by_location = {level: {} for level in LOCATION_LEVELS}
+        self._by_rating = {}
+        self._dates = []  # (date string, path) pairs, sorted for prefix lookups
+        self._dates_sorted = True
+
+    @classmethod
+    def from_photos(cls, photos_dir, jobs=None, source='catalog'):
+        """
+        Build a catalog from every JPG under photos_dir.
+
+        Args:
+            photos_dir: Path to the photos directory
+            jobs: Worker processes for metadata cache misses
+            source: Metadata backend, 'catalog' or 'jpeg' (see
+                photo_metadata.metadata_source)
+
+        Returns:
+            PhotoCatalog keyed by path relative to photos_dir
+        """
+        photos_dir = Path(photos_dir)
+        catalog = cls()
+        if not photos_dir.exists():
+            return catalog
+
+        photo_files = sorted(
+            p for p in photos_dir.rglob('*')
+            if p.suffix in JPG_EXTENSIONS and p.is_file()
+        )
+        reader = metadata_source(source, photos_dir, jobs=jobs)
+        for photo_path, metadata in reader.read_many(photo_files):
+            if metadata is not None:
+                catalog.add(str(photo_path.relative_to(photos_dir)), metadata)
+        return catalog
+
+    def add(self, path, metadata):
+        """Add a photo (path relative to photos/) to the catalog and its indexes."""
+        self.photos[path] = metadata
+
+        for keyword in metadata.keywords:
+            self._by_keyword.setdefault(keyword, set()).add(path)
+
+        if metadata.location:
+            for level in LOCATION_LEVELS:
+                value = getattr(metadata.location, level)
+                if value:
+                    self._by_location[level].setdefault(value.lower(), set()).add(path)
+
+        if metadata.rating:
+            self._by_rating.setdefault(metadata.rating, set()).add(path)
+
+        if metadata.date:
+            self._dates.append((str(metadata.date), path))
+            self._dates_sorted = False
+
+    def query(self, filters):
+        """
+        Find photos matching filter criteria.
+
+        Same semantics as photo_metadata.matches_filters: keywords are ORed,
+        location matches any level case-insensitively, rating is exact or
+        "N+", date is a prefix match, and criteria are ANDed.
+
+        Args:
+            filters: Filter dictionary (as stored in a collection yaml)
+
+        Returns:
+            Sorted list of matching photo paths
+        """
+        if not filters:
+            return []
+
+        matches = set(self.photos)
+
+        if 'keywords' in filters:
+            filter_keywords = [kw.strip().lower() for kw in str(filters['keywords']).split(',')]
+            matches &= self._union(self._by_keyword.get(kw) for kw in filter_keywords)
+
+        if 'location' in filters:
+            filter_loc = str(filters['location']).lower()
+            matches &= self._union(index.get(filter_loc) for index in self._by_location.values())
+
+        if 'rating' in filters:
+            rating_filter = str(filters['rating'])
+            if '+' in rating_filter:
+                min_rating = int(rating_filter.replace('+', ''))
+                wanted = (paths for rating, paths in self._by_rating.items() if rating >= min_rating)
+            else:
+                wanted = [self._by_rating.get(int(rating_filter))]
+            matches &= self._union(wanted)
+
+        if 'date' in filters:
+            if not self._dates_sorted:
+                self._dates.sort()
+                self._dates_sorted = True
+            prefix = str(filters['date'])
+            dated = set()
+            for date, path in self._dates[bisect_left(self._dates, (prefix,)):]:
+                if not date.startswith(prefix):
+                    break
+                dated.add(path)
+            matches &= dated
+
+        return sorted(matches)
+
+    @staticmethod
+    def _union(sets):
+        result = set()
+        for s in sets:
+            if s:
+                result |= s
+        return result
@@ -4,15 +4,38 @@
 Photo metadata reading utilities for Lightroom-exported JPGs.
 
 Public API:
-    get_metadata(photo_path) -> PhotoMetadata
+    get_metadata(photo_path, use_cache=True) -> PhotoMetadata
         Returns all available metadata from a photo.
 
+    get_metadata_many(photo_paths, jobs=None, with_dhash=False) -> iterator
+        Yields (photo_path, PhotoMetadata) for many photos, parsing cache
+        misses across worker processes. Only with_dhash=True decodes the
+        images to fill in PhotoMetadata.dhash.
+
+    metadata_source(name, photos_root, jobs=None) -> source
+        A metadata backend: 'jpeg' (JpegSource) reads the photos
+        themselves, 'catalog' (CatalogSource) reads data/catalog.json and
+        data/photos/**/*.yaml, falling back to the photo when stale. Both
+        have read_many(photo_paths), yielding like get_metadata_many.
+
+    prune_metadata_cache() -> int
+        Drop cached metadata for photos that no longer exist.
+
+    move_cached_metadata(old_path, new_path)
+        Keep a moved photo's cached metadata under its new path.
+
+    flush_metadata_cache()
+        Commit pending metadata cache writes (for long-running processes).
+
     matches_filters(metadata, filters) -> bool
         Check if metadata matches filter criteria.
 
     Location - Structured location data (city, state, country)
     PhotoMetadata - Container for all photo metadata
 
+    Both use __slots__ and convert to and from plain dicts in the data/photos
+    YAML schema with to_dict() / from_dict().
+
 Example:
     from photo_metadata import get_metadata, matches_filters
 
@@ -30,13 +53,6 @@ Example:
 
 from pathlib import Path
 
-try:
-    from PIL import Image
-    from PIL.ExifTags import TAGS
-except ImportError:
-    Image = None
-    TAGS = None
-
 
 class Location:
     """
@@ -48,6 +64,8 @@ class Location:
         state: State/Province name or None
         country: Country name or None
     """
+    __slots__ = ('sublocation', 'city', 'state', 'country')
+
     def __init__(self, sublocation=None, city=None, state=None, country=None):
         self.sublocation = sublocation
         self.city = city
@@ -61,6 +79,25 @@ class Location:
         """Return True if any location field is set."""
         return bool(self.sublocation or self.city or self.state or self.country)
 
+    def to_dict(self):
+        """Return the location as a dict (most specific level first)."""
+        return {
+            'sublocation': self.sublocation,
+            'city': self.city,
+            'state': self.state,
+            'country': self.country,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Location from a dict as returned by to_dict()."""
+        return cls(
+            sublocation=data.get('sublocation'),
+            city=data.get('city'),
+            state=data.get('state'),
+            country=data.get('country'),
+        )
+
     def to_path_string(self):
         """
         Convert location to a filesystem-safe path string.
@@ -103,7 +140,17 @@ class PhotoMetadata:
         aperture: F-stop value (e.g., "2.8") or None
         shutter_speed: Exposure time (e.g., "1/125") or None
         iso: ISO speed (e.g., "400") or None
+        dhash: Perceptual hash of the image (hex string, see
+            perceptual_hash.py) or None; only filled in when asked for
+            (get_metadata_many with_dhash=True) or read from a record
     """
+    __slots__ = ('path', 'keywords', 'location', 'rating', 'date', 'camera_make', 'camera_model',
+                 'lens_model', 'focal_length', 'aperture', 'shutter_speed', 'iso', 'dhash')
+
+    # Scalar fields, copied as-is by to_dict() / from_dict()
+    SCALAR_FIELDS = ('rating', 'date', 'camera_make', 'camera_model', 'lens_model',
+                     'focal_length', 'aperture', 'shutter_speed', 'iso', 'dhash')
+
     def __init__(self, path):
         self.path = path
         self.keywords = []
@@ -117,152 +164,464 @@ class PhotoMetadata:
         self.aperture = None
         self.shutter_speed = None
         self.iso = None
+        self.dhash = None
 
     def __repr__(self):
         return f"PhotoMetadata(path={self.path}, keywords={self.keywords}, location={self.location}, rating={self.rating}, date={self.date}, camera={self.camera_make} {self.camera_model})"
 
+    def to_dict(self):
+        """
+        Return the metadata as a dict in the data/photos YAML schema.
+
+        Returns:
+            Dict with path (as a string), keywords, location (dict or None)
+            and the scalar fields, in that order
+        """
+        data = {
+            'path': None if self.path is None else str(self.path),
+            'keywords': list(self.keywords),
+            'location': None if self.location is None else self.location.to_dict(),
+        }
+        for field in self.SCALAR_FIELDS:
+            data[field] = getattr(self, field)
+        return data
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        """
+        Build PhotoMetadata from a dict as returned by to_dict().
+
+        Args:
+            data: Metadata dict (a photo YAML or a metadata cache record)
+            path: Path to use instead of data['path'] (cache records don't
+                store one)
+
+        Returns:
+            PhotoMetadata
+        """
+        metadata = cls(data.get('path') if path is None else path)
+        metadata.keywords = list(data.get('keywords') or [])
+        location = data.get('location')
+        if location is not None:
+            metadata.location = Location.from_dict(location)
+        for field in cls.SCALAR_FIELDS:
+            setattr(metadata, field, data.get(field))
+        return metadata
+
 
 # ============================================================================
 # Private implementation details below - users should not call these directly
 # ============================================================================
 
-def _read_xmp_from_jpg(photo_path):
-    """Extract XMP metadata embedded in JPG file.
+# JPEG marker bytes and APP1 payload signatures
+_JPEG_SOI = b'\xff\xd8'
+_JPEG_APP1 = 0xE1
+_JPEG_SOS = 0xDA
+_JPEG_EOI = 0xD9
+_EXIF_SIGNATURE = b'Exif\x00\x00'
+_XMP_SIGNATURE = b'http://ns.adobe.com/xap/1.0/\x00'
+
+# EXIF tags read by _collect_exif_fields, named as in PIL.ExifTags.TAGS
+_EXIF_TAG_NAMES = {
+    0x010F: 'Make',
+    0x0110: 'Model',
+    0x0132: 'DateTime',
+    0x829A: 'ExposureTime',
+    0x829D: 'FNumber',
+    0x8827: 'ISOSpeedRatings',
+    0x9003: 'DateTimeOriginal',
+    0x920A: 'FocalLength',
+    0xA434: 'LensModel',
+}
+_EXIF_IFD_POINTER = 0x8769
+
+# TIFF field type -> size in bytes of a single value
+_TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+
+
+def _read_jpeg_app1(photo_path):
+    """Read the EXIF and XMP APP1 payloads from the head of a JPG file.
+
+    Walks the JPEG marker segments from SOI and stops at SOS (start of the
+    compressed image data), seeking past every segment that isn't APP1. Only
+    the metadata header is read, however large the image is.
 
     Args:
         photo_path: Path to JPG file
 
     Returns:
-        Dictionary with keys: keywords, location, rating (or None if no XMP found)
+        Dictionary with keys 'exif' (TIFF bytes) and 'xmp' (XMP packet bytes),
+        either of which may be None. Returns None if the file is not a JPG or
+        its marker structure is malformed.
     """
-    import xml.etree.ElementTree as ET
+    segments = {'exif': None, 'xmp': None}
+
+    try:
+        with open(photo_path, 'rb') as f:
+            if f.read(2) != _JPEG_SOI:
+                return None
+
+            while True:
+                header = f.read(2)
+                if len(header) < 2 or header[0] != 0xFF:
+                    return None
+
+                marker = header[1]
+                # Any number of 0xFF fill bytes may precede a marker
+                while marker == 0xFF:
+                    fill = f.read(1)
+                    if not fill:
+                        return None
+                    marker = fill[0]
+
+                if marker in (_JPEG_SOS, _JPEG_EOI):
+                    break
+
+                # Standalone markers (TEM, RSTn) carry no length field
+                if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+                    continue
+
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    return None
+                length = int.from_bytes(length_bytes, 'big') - 2
+                if length < 0:
+                    return None
+
+                if marker != _JPEG_APP1:
+                    f.seek(length, 1)
+                    continue
+
+                payload = f.read(length)
+                if len(payload) < length:
+                    return None
+
+                if payload.startswith(_EXIF_SIGNATURE) and segments['exif'] is None:
+                    segments['exif'] = payload[len(_EXIF_SIGNATURE):]
+                elif payload.startswith(_XMP_SIGNATURE) and segments['xmp'] is None:
+                    segments['xmp'] = payload[len(_XMP_SIGNATURE):]
+
+    except OSError:
+        return None
+
+    return segments
+
+
+def _read_xmp_from_jpg(photo_path):
+    """Extract XMP metadata by scanning the whole file (fallback for non-JPGs).
+
+    Args:
+        photo_path: Path to image file
 
+    Returns:
+        Dictionary with keys: keywords, location, rating (or None if no XMP found)
+    """
     try:
         with open(photo_path, 'rb') as f:
             content = f.read()
+    except OSError:
+        return None
 
-            # Find XMP packet in JPG
-            xmp_start = content.find(b'<x:xmpmeta')
-            xmp_end = content.find(b'</x:xmpmeta>')
+    return _parse_xmp(content)
 
-            if xmp_start == -1 or xmp_end == -1:
-                return None
 
-            xmp_data = content[xmp_start:xmp_end + 12].decode('utf-8', errors='replace')
+def _parse_xmp(content):
+    """Parse an XMP packet into keywords, location and rating.
 
-            # Parse XMP as XML
-            root = ET.fromstring(xmp_data)
+    Args:
+        content: Bytes containing an <x:xmpmeta> packet
 
-            # Define namespaces
-            ns = {
-                'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
-                'dc': 'http://purl.org/dc/elements/1.1/',
-                'xmp': 'http://ns.adobe.com/xap/1.0/',
-                'photoshop': 'http://ns.adobe.com/photoshop/1.0/',
-            }
+    Returns:
+        Dictionary with keys: keywords, location, rating (or None if no XMP found)
+    """
+    import xml.etree.ElementTree as ET
 
-            xmp_metadata = {}
-
-            # Extract keywords from dc:subject
-            subject_bag = root.find('.//dc:subject/rdf:Bag', ns)
-            if subject_bag is not None:
-                keywords = []
-                for li in subject_bag.findall('rdf:li', ns):
-                    if li.text and not any(char.isdigit() or char == ',' for char in li.text):
-                        # Filter out numeric values (like color coordinates)
-                        keywords.append(li.text.strip())
-                if keywords:
-                    xmp_metadata['keywords'] = keywords
-
-            # Extract location fields from photoshop and Iptc4xmpCore namespaces (can be attributes or elements)
-            # Add Iptc4xmpCore namespace for sublocation
-            ns['Iptc4xmpCore'] = 'http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/'
-
-            sublocation = None
-            city = None
-            state = None
-            country = None
-
-            # First try to find as attributes on rdf:Description
-            for desc in root.findall('.//rdf:Description', ns):
-                if not sublocation:
-                    subloc_attr = desc.get('{http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/}Location')
-                    if subloc_attr:
-                        sublocation = subloc_attr
-
-                if not city:
-                    city_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}City')
-                    if city_attr:
-                        city = city_attr
-
-                if not state:
-                    state_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}State')
-                    if state_attr:
-                        state = state_attr
-
-                if not country:
-                    country_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}Country')
-                    if country_attr:
-                        country = country_attr
-
-            # If not found as attributes, try as elements
+    try:
+        # Find XMP packet in JPG
+        xmp_start = content.find(b'<x:xmpmeta')
+        xmp_end = content.find(b'</x:xmpmeta>')
+
+        if xmp_start == -1 or xmp_end == -1:
+            return None
+
+        xmp_data = content[xmp_start:xmp_end + 12].decode('utf-8', errors='replace')
+
+        # Parse XMP as XML
+        root = ET.fromstring(xmp_data)
+
+        # Define namespaces
+        ns = {
+            'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+            'dc': 'http://purl.org/dc/elements/1.1/',
+            'xmp': 'http://ns.adobe.com/xap/1.0/',
+            'photoshop': 'http://ns.adobe.com/photoshop/1.0/',
+        }
+
+        xmp_metadata = {}
+
+        # Extract keywords from dc:subject
+        subject_bag = root.find('.//dc:subject/rdf:Bag', ns)
+        if subject_bag is not None:
+            keywords = []
+            for li in subject_bag.findall('rdf:li', ns):
+                if li.text and not any(char.isdigit() or char == ',' for char in li.text):
+                    # Filter out numeric values (like color coordinates)
+                    keywords.append(li.text.strip())
+            if keywords:
+                xmp_metadata['keywords'] = keywords
+
+        # Extract location fields from photoshop and Iptc4xmpCore namespaces (can be attributes or elements)
+        # Add Iptc4xmpCore namespace for sublocation
+        ns['Iptc4xmpCore'] = 'http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/'
+
+        sublocation = None
+        city = None
+        state = None
+        country = None
+
+        # First try to find as attributes on rdf:Description
+        for desc in root.findall('.//rdf:Description', ns):
             if not sublocation:
-                subloc_elem = root.find('.//Iptc4xmpCore:Location', ns)
-                if subloc_elem is not None and subloc_elem.text:
-                    sublocation = subloc_elem.text
+                subloc_attr = desc.get('{http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/}Location')
+                if subloc_attr:
+                    sublocation = subloc_attr
 
             if not city:
-                city_elem = root.find('.//photoshop:City', ns)
-                if city_elem is not None and city_elem.text:
-                    city = city_elem.text
+                city_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}City')
+                if city_attr:
+                    city = city_attr
 
             if not state:
-                state_elem = root.find('.//photoshop:State', ns)
-                if state_elem is not None and state_elem.text:
-                    state = state_elem.text
+                state_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}State')
+                if state_attr:
+                    state = state_attr
 
             if not country:
-                country_elem = root.find('.//photoshop:Country', ns)
-                if country_elem is not None and country_elem.text:
-                    country = country_elem.text
-
-            # Store location data if any field is present
-            if sublocation or city or state or country:
-                xmp_metadata['location'] = {
-                    'sublocation': sublocation,
-                    'city': city,
-                    'state': state,
-                    'country': country
-                }
-
-            # Extract rating from xmp:Rating (can be attribute or element)
-            # First try to find it as an attribute on rdf:Description
-            for desc in root.findall('.//rdf:Description', ns):
-                rating_attr = desc.get('{http://ns.adobe.com/xap/1.0/}Rating')
-                if rating_attr:
-                    try:
-                        xmp_metadata['rating'] = int(rating_attr)
-                        break
-                    except ValueError:
-                        pass
-
-            # If not found as attribute, try as element
-            if 'rating' not in xmp_metadata:
-                rating = root.find('.//xmp:Rating', ns)
-                if rating is not None and rating.text:
-                    try:
-                        xmp_metadata['rating'] = int(rating.text)
-                    except ValueError:
-                        pass
-
-            return xmp_metadata if xmp_metadata else None
+                country_attr = desc.get('{http://ns.adobe.com/photoshop/1.0/}Country')
+                if country_attr:
+                    country = country_attr
+
+        # If not found as attributes, try as elements
+        if not sublocation:
+            subloc_elem = root.find('.//Iptc4xmpCore:Location', ns)
+            if subloc_elem is not None and subloc_elem.text:
+                sublocation = subloc_elem.text
+
+        if not city:
+            city_elem = root.find('.//photoshop:City', ns)
+            if city_elem is not None and city_elem.text:
+                city = city_elem.text
+
+        if not state:
+            state_elem = root.find('.//photoshop:State', ns)
+            if state_elem is not None and state_elem.text:
+                state = state_elem.text
+
+        if not country:
+            country_elem = root.find('.//photoshop:Country', ns)
+            if country_elem is not None and country_elem.text:
+                country = country_elem.text
+
+        # Store location data if any field is present
+        if sublocation or city or state or country:
+            xmp_metadata['location'] = {
+                'sublocation': sublocation,
+                'city': city,
+                'state': state,
+                'country': country
+            }
+
+        # Extract rating from xmp:Rating (can be attribute or element)
+        # First try to find it as an attribute on rdf:Description
+        for desc in root.findall('.//rdf:Description', ns):
+            rating_attr = desc.get('{http://ns.adobe.com/xap/1.0/}Rating')
+            if rating_attr:
+                try:
+                    xmp_metadata['rating'] = int(rating_attr)
+                    break
+                except ValueError:
+                    pass
+
+        # If not found as attribute, try as element
+        if 'rating' not in xmp_metadata:
+            rating = root.find('.//xmp:Rating', ns)
+            if rating is not None and rating.text:
+                try:
+                    xmp_metadata['rating'] = int(rating.text)
+                except ValueError:
+                    pass
+
+        return xmp_metadata if xmp_metadata else None
 
     except Exception as e:
         return None
 
 
+def _collect_exif_fields(tags, exif_data):
+    """Copy the EXIF fields PhotoMetadata cares about into exif_data.
+
+    Args:
+        tags: Iterable of (tag_name, value) pairs, in file order
+        exif_data: Dictionary to update in place
+    """
+    for tag_name, value in tags:
+        # Date
+        if tag_name in ('DateTime', 'DateTimeOriginal') and 'date' not in exif_data:
+            exif_data['date'] = value
+
+        # Camera make and model
+        elif tag_name == 'Make':
+            exif_data['camera_make'] = value.strip() if isinstance(value, str) else value
+        elif tag_name == 'Model':
+            exif_data['camera_model'] = value.strip() if isinstance(value, str) else value
+
+        # Lens
+        elif tag_name == 'LensModel':
+            exif_data['lens_model'] = value.strip() if isinstance(value, str) else value
+
+        # Focal length
+        elif tag_name == 'FocalLength':
+            if isinstance(value, tuple):
+                exif_data['focal_length'] = round(value[0] / value[1], 1) if value[1] != 0 else float(value[0])
+            else:
+                # Handle IFDRational, int, float, or any numeric type
+                exif_data['focal_length'] = round(float(value), 1)
+
+        # Aperture (FNumber)
+        elif tag_name == 'FNumber':
+            if isinstance(value, tuple):
+                exif_data['aperture'] = round(value[0] / value[1], 1) if value[1] != 0 else float(value[0])
+            else:
+                # Handle IFDRational, int, float, or any numeric type
+                exif_data['aperture'] = round(float(value), 1)
+
+        # Shutter speed (ExposureTime) - keep as string
+        elif tag_name == 'ExposureTime':
+            if isinstance(value, tuple):
+                if value[0] == 1:
+                    exif_data['shutter_speed'] = f"1/{value[1]}"
+                else:
+                    exif_data['shutter_speed'] = f"{value[0] / value[1]:.2f}" if value[1] != 0 else str(value[0])
+            else:
+                # Handle IFDRational, int, float, or any numeric type
+                val = float(value)
+                if val < 1:
+                    # Convert to fraction for fast shutter speeds
+                    exif_data['shutter_speed'] = f"1/{int(1/val)}"
+                else:
+                    exif_data['shutter_speed'] = f"{val:.2f}"
+
+        # ISO
+        elif tag_name in ('ISOSpeedRatings', 'ISO'):
+            exif_data['iso'] = int(value)
+
+
+def _read_tiff_ifd(tiff, offset, byte_order):
+    """Decode the entries of one TIFF IFD that _collect_exif_fields reads.
+
+    Values are decoded the way PIL presents them: ASCII as str, rationals as
+    float (num / den), single values unwrapped and multiple values as tuples.
+    The EXIF IFD pointer is kept as an int so the caller can follow it.
+
+    Returns:
+        List of (tag_id, value) pairs in file order
+    """
+    import struct
+
+    entries = []
+    (count,) = struct.unpack_from(byte_order + 'H', tiff, offset)
+
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        tag, field_type, n = struct.unpack_from(byte_order + 'HHI', tiff, entry)
+        if tag not in _EXIF_TAG_NAMES and tag != _EXIF_IFD_POINTER:
+            continue
+
+        size = _TIFF_TYPE_SIZES.get(field_type)
+        if size is None:
+            continue
+        total = size * n
+        if total <= 4:
+            data_offset = entry + 8
+        else:
+            (data_offset,) = struct.unpack_from(byte_order + 'I', tiff, entry + 8)
+        raw = tiff[data_offset:data_offset + total]
+        if len(raw) < total:
+            continue
+
+        if field_type == 2:
+            value = raw.split(b'\x00', 1)[0].decode('latin-1', errors='replace')
+        elif field_type in (5, 10):
+            fmt = byte_order + ('L' if field_type == 5 else 'l') * (2 * n)
+            parts = struct.unpack(fmt, raw)
+            values = tuple(
+                parts[j] / parts[j + 1] if parts[j + 1] else float('nan')
+                for j in range(0, len(parts), 2)
+            )
+            value = values[0] if n == 1 else values
+        elif field_type == 7:
+            value = raw
+        else:
+            fmt = {1: 'B', 3: 'H', 4: 'L', 8: 'h', 9: 'l', 11: 'f', 12: 'd'}[field_type]
+            values = struct.unpack(byte_order + fmt * n, raw)
+            value = values[0] if n == 1 else values
+
+        entries.append((tag, value))
+
+    return entries
+
+
+def _parse_exif(tiff):
+    """Parse the TIFF structure of an EXIF APP1 payload.
+
+    Reads IFD0 and then the EXIF sub-IFD, the same two directories
+    _read_exif_data asks PIL for.
+
+    Args:
+        tiff: Bytes following the "Exif\\0\\0" signature
+
+    Returns:
+        Dictionary with EXIF data (possibly empty), or None if the TIFF
+        structure could not be parsed
+    """
+    import struct
+
+    exif_data = {}
+
+    try:
+        if tiff[:2] == b'II':
+            byte_order = '<'
+        elif tiff[:2] == b'MM':
+            byte_order = '>'
+        else:
+            return None
+
+        magic, ifd0_offset = struct.unpack_from(byte_order + 'HI', tiff, 2)
+        if magic != 42:
+            return None
+
+        ifd0 = _read_tiff_ifd(tiff, ifd0_offset, byte_order)
+        _collect_exif_fields(
+            ((_EXIF_TAG_NAMES[tag], value) for tag, value in ifd0 if tag in _EXIF_TAG_NAMES),
+            exif_data,
+        )
+
+        exif_ifd_offset = next((value for tag, value in ifd0 if tag == _EXIF_IFD_POINTER), None)
+        if isinstance(exif_ifd_offset, int):
+            exif_ifd = _read_tiff_ifd(tiff, exif_ifd_offset, byte_order)
+            _collect_exif_fields(
+                ((_EXIF_TAG_NAMES[tag], value) for tag, value in exif_ifd if tag in _EXIF_TAG_NAMES),
+                exif_data,
+            )
+
+    except (struct.error, ValueError, TypeError, ZeroDivisionError, OverflowError):
+        return None
+
+    return exif_data
+
+
 def _read_exif_data(photo_path):
-    """Read EXIF data from photo (private helper).
+    """Read EXIF data from photo with PIL (fallback for _parse_exif).
 
     Args:
         photo_path: Path to JPG file
@@ -270,7 +629,12 @@ def _read_exif_data(photo_path):
     Returns:
         Dictionary with EXIF data or empty dict
     """
-    if not Image:
+    # PIL is only needed for files _parse_exif couldn't read, so it's
+    # imported here rather than by every caller of this module
+    try:
+        from PIL import Image
+        from PIL.ExifTags import TAGS
+    except ImportError:
         return {}
 
     exif_data = {}
@@ -285,67 +649,12 @@ def _read_exif_data(photo_path):
         # Get EXIF IFD (where most camera settings are stored)
         exif_ifd = exif.get_ifd(0x8769)  # EXIF IFD tag
 
-        # Helper function to process tags from either main EXIF or EXIF IFD
-        def process_tags(tag_dict):
-            for tag_id, value in tag_dict.items():
-                tag_name = TAGS.get(tag_id, tag_id)
-
-                # Date
-                if tag_name in ('DateTime', 'DateTimeOriginal') and 'date' not in exif_data:
-                    exif_data['date'] = value
-
-                # Camera make and model
-                elif tag_name == 'Make':
-                    exif_data['camera_make'] = value.strip() if isinstance(value, str) else value
-                elif tag_name == 'Model':
-                    exif_data['camera_model'] = value.strip() if isinstance(value, str) else value
-
-                # Lens
-                elif tag_name == 'LensModel':
-                    exif_data['lens_model'] = value.strip() if isinstance(value, str) else value
-
-                # Focal length
-                elif tag_name == 'FocalLength':
-                    if isinstance(value, tuple):
-                        exif_data['focal_length'] = round(value[0] / value[1], 1) if value[1] != 0 else float(value[0])
-                    else:
-                        # Handle IFDRational, int, float, or any numeric type
-                        exif_data['focal_length'] = round(float(value), 1)
-
-                # Aperture (FNumber)
-                elif tag_name == 'FNumber':
-                    if isinstance(value, tuple):
-                        exif_data['aperture'] = round(value[0] / value[1], 1) if value[1] != 0 else float(value[0])
-                    else:
-                        # Handle IFDRational, int, float, or any numeric type
-                        exif_data['aperture'] = round(float(value), 1)
-
-                # Shutter speed (ExposureTime) - keep as string
-                elif tag_name == 'ExposureTime':
-                    if isinstance(value, tuple):
-                        if value[0] == 1:
-                            exif_data['shutter_speed'] = f"1/{value[1]}"
-                        else:
-                            exif_data['shutter_speed'] = f"{value[0] / value[1]:.2f}" if value[1] != 0 else str(value[0])
-                    else:
-                        # Handle IFDRational, int, float, or any numeric type
-                        val = float(value)
-                        if val < 1:
-                            # Convert to fraction for fast shutter speeds
-                            exif_data['shutter_speed'] = f"1/{int(1/val)}"
-                        else:
-                            exif_data['shutter_speed'] = f"{val:.2f}"
-
-                # ISO
-                elif tag_name in ('ISOSpeedRatings', 'ISO'):
-                    exif_data['iso'] = int(value)
-
         # Process main EXIF tags
-        process_tags(exif)
+        _collect_exif_fields(((TAGS.get(tag_id, tag_id), value) for tag_id, value in exif.items()), exif_data)
 
         # Process EXIF IFD tags (where camera settings usually are)
         if exif_ifd:
-            process_tags(exif_ifd)
+            _collect_exif_fields(((TAGS.get(tag_id, tag_id), value) for tag_id, value in exif_ifd.items()), exif_data)
 
     except Exception as e:
         pass
@@ -353,19 +662,133 @@ def _read_exif_data(photo_path):
     return exif_data
 
 
+def _read_metadata(photo_path):
+    """Read metadata straight from the photo file, bypassing the cache.
+
+    Args:
+        photo_path: Path to an existing JPG file
+
+    Returns:
+        PhotoMetadata object
+    """
+    metadata = PhotoMetadata(photo_path)
+
+    # Read the APP1 segments (EXIF + XMP) from the JPG header in one pass.
+    # Non-JPGs and malformed headers fall back to the full-file readers.
+    segments = _read_jpeg_app1(photo_path)
+    if segments is None:
+        xmp_data = _read_xmp_from_jpg(photo_path)
+        exif_data = _read_exif_data(photo_path)
+    else:
+        xmp_data = _parse_xmp(segments['xmp']) if segments['xmp'] else None
+        exif_data = _parse_exif(segments['exif']) if segments['exif'] else {}
+        if exif_data is None:
+            exif_data = _read_exif_data(photo_path)
+
+    # Embedded XMP contains keywords, location, rating
+    if xmp_data:
+        if 'keywords' in xmp_data:
+            metadata.keywords = [kw.lower() for kw in xmp_data['keywords']]
+        if 'location' in xmp_data:
+            loc_data = xmp_data['location']
+            metadata.location = Location(
+                sublocation=loc_data.get('sublocation'),
+                city=loc_data.get('city'),
+                state=loc_data.get('state'),
+                country=loc_data.get('country')
+            )
+        if 'rating' in xmp_data:
+            metadata.rating = xmp_data['rating']
+
+    # EXIF contains camera info, date, etc.
+    if exif_data:
+        metadata.date = exif_data.get('date')
+        metadata.camera_make = exif_data.get('camera_make')
+        metadata.camera_model = exif_data.get('camera_model')
+        metadata.lens_model = exif_data.get('lens_model')
+        metadata.focal_length = exif_data.get('focal_length')
+        metadata.aperture = exif_data.get('aperture')
+        metadata.shutter_speed = exif_data.get('shutter_speed')
+        metadata.iso = exif_data.get('iso')
+
+    return metadata
+
+
+def _read_metadata_with_dhash(photo_path):
+    """Read metadata like _read_metadata and also hash the image.
+
+    Hashing decodes the pixels, so it costs far more than the header parse;
+    only the callers that compare photos (ingest planning, the metadata
+    file generator) ask for it.
+    """
+    from perceptual_hash import dhash
+
+    metadata = _read_metadata(photo_path)
+    metadata.dhash = dhash(photo_path)
+    return metadata
+
+
+# Cached in place of a dhash the image couldn't be hashed for, so it isn't
+# decoded again on every run; a record with no dhash key was never hashed
+_DHASH_FAILED = ''
+
+
+def _metadata_to_record(metadata, hashed=False):
+    """Convert PhotoMetadata to a plain dict for the metadata cache (path omitted).
+
+    Args:
+        metadata: PhotoMetadata
+        hashed: Whether the read tried to fill in metadata.dhash
+    """
+    record = metadata.to_dict()
+    del record['path']
+    if record['dhash'] is None:
+        if hashed:
+            record['dhash'] = _DHASH_FAILED
+        else:
+            del record['dhash']
+    return record
+
+
+def _metadata_from_record(photo_path, record):
+    """Rebuild PhotoMetadata from a metadata cache record."""
+    metadata = PhotoMetadata.from_dict(record, path=photo_path)
+    metadata.dhash = metadata.dhash or None
+    return metadata
+
+
+_cache = None
+
+
+def _get_cache():
+    """Return the process-wide MetadataCache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        import atexit
+        from metadata_cache import MetadataCache
+
+        _cache = MetadataCache()
+        atexit.register(_cache.close)
+    return _cache
+
+
 # ============================================================================
 # Public API
 # ============================================================================
 
-def get_metadata(photo_path):
+def get_metadata(photo_path, use_cache=True):
     """
     Get all metadata from a photo.
 
     This is the main entry point for reading photo metadata. It handles all
     the technical details of reading XMP, IPTC, and EXIF data automatically.
 
+    Results are cached on disk by path, size and mtime (see metadata_cache.py),
+    so unchanged photos are only parsed once across runs.
+
     Args:
         photo_path: Path or string path to JPG file
+        use_cache: If False, always read the file and leave the cache untouched
 
     Returns:
         PhotoMetadata object with:
@@ -384,42 +807,230 @@ def get_metadata(photo_path):
     """
     photo_path = Path(photo_path)
 
-    if not photo_path.exists():
+    try:
+        stat = photo_path.stat()
+    except OSError:
         return None
 
-    metadata = PhotoMetadata(photo_path)
+    cache = _get_cache() if use_cache else None
+    if cache is not None:
+        record = cache.get(photo_path, stat)
+        if record is not None:
+            return _metadata_from_record(photo_path, record)
 
-    # Read embedded metadata (XMP contains keywords, location, rating)
-    xmp_data = _read_xmp_from_jpg(photo_path)
-    if xmp_data:
-        if 'keywords' in xmp_data:
-            metadata.keywords = [kw.lower() for kw in xmp_data['keywords']]
-        if 'location' in xmp_data:
-            loc_data = xmp_data['location']
-            metadata.location = Location(
-                sublocation=loc_data.get('sublocation'),
-                city=loc_data.get('city'),
-                state=loc_data.get('state'),
-                country=loc_data.get('country')
-            )
-        if 'rating' in xmp_data:
-            metadata.rating = xmp_data['rating']
+    metadata = _read_metadata(photo_path)
 
-    # Read EXIF data (camera info, date, etc.)
-    exif_data = _read_exif_data(photo_path)
-    if exif_data:
-        metadata.date = exif_data.get('date')
-        metadata.camera_make = exif_data.get('camera_make')
-        metadata.camera_model = exif_data.get('camera_model')
-        metadata.lens_model = exif_data.get('lens_model')
-        metadata.focal_length = exif_data.get('focal_length')
-        metadata.aperture = exif_data.get('aperture')
-        metadata.shutter_speed = exif_data.get('shutter_speed')
-        metadata.iso = exif_data.get('iso')
+    if cache is not None:
+        cache.put(photo_path, stat, _metadata_to_record(metadata))
 
     return metadata
 
 
+def get_metadata_many(photo_paths, jobs=None, use_cache=True, with_dhash=False):
+    """
+    Get metadata for many photos, reading cache misses in parallel.
+
+    Cache hits are resolved in-process; only the photos that actually need
+    parsing are fanned out across worker processes. Results come back in
+    the same order as photo_paths.
+
+    Args:
+        photo_paths: Iterable of photo paths
+        jobs: Number of worker processes for cache misses (default: one per core)
+        use_cache: If False, read every file and leave the cache untouched
+        with_dhash: Also fill in each photo's perceptual hash. This decodes
+            the image, so cached records that were never hashed count as
+            misses (one that failed to hash isn't retried until it changes)
+
+    Yields:
+        (photo_path, PhotoMetadata or None) tuples, in input order
+    """
+    from parallel import ordered_map
+
+    cache = _get_cache() if use_cache else None
+
+    entries = []
+    misses = []
+    for photo_path in photo_paths:
+        photo_path = Path(photo_path)
+        try:
+            stat = photo_path.stat()
+        except OSError:
+            entries.append((photo_path, None, None))
+            continue
+
+        record = cache.get(photo_path, stat) if cache is not None else None
+        if record is not None and not (with_dhash and 'dhash' not in record):
+            entries.append((photo_path, stat, _metadata_from_record(photo_path, record)))
+        else:
+            entries.append((photo_path, stat, None))
+            misses.append(photo_path)
+
+    read_results = ordered_map(_read_metadata_with_dhash if with_dhash else _read_metadata, misses, jobs=jobs)
+
+    for photo_path, stat, metadata in entries:
+        if stat is not None and metadata is None:
+            metadata = next(read_results)
+            if cache is not None:
+                cache.put(photo_path, stat, _metadata_to_record(metadata, hashed=with_dhash))
+        yield photo_path, metadata
+
+
+class JpegSource:
+    """Metadata read from the photos themselves (through the metadata cache)."""
+    name = 'jpeg'
+
+    def __init__(self, jobs=None):
+        self.jobs = jobs
+
+    def read_many(self, photo_paths):
+        """Yield (photo_path, PhotoMetadata or None) in input order."""
+        return get_metadata_many(photo_paths, jobs=self.jobs)
+
+
+class CatalogSource:
+    """
+    Metadata read from what generate-photo-metadata-files wrote, without
+    opening the photos.
+
+    A photo's record is taken from the data/catalog.json snapshot, or its
+    data/photos/<path>.yaml if the snapshot lacks it, only while the photo
+    has exactly the size and mtime_ns it had when the record was rendered
+    (.cache/catalog-sources.json, see catalog_snapshot.py). Photos without
+    a matching stamp (new, replaced, or changed since the last generate
+    run) are read from the JPEG, so results always match JpegSource.
+
+    Attributes:
+        photos_root: photos/ directory the photo paths are under
+        data_photos_dir: data/photos directory holding the yamls
+        catalog_path: data/catalog.json
+        sources_path: .cache/catalog-sources.json
+    """
+    name = 'catalog'
+
+    def __init__(self, photos_root, jobs=None):
+        from catalog_snapshot import default_catalog_path, default_sources_path
+
+        self.photos_root = Path(photos_root)
+        self.data_photos_dir = self.photos_root.parent / 'data' / 'photos'
+        self.catalog_path = default_catalog_path(self.data_photos_dir)
+        self.sources_path = default_sources_path(self.data_photos_dir)
+        self.fallback = JpegSource(jobs)
+        self._snapshot = None
+
+    def _load_snapshot(self):
+        """Return (records by relative path, stamps by relative path), read once."""
+        if self._snapshot is None:
+            from catalog_snapshot import load_catalog, load_sources
+
+            sources = load_sources(self.sources_path)
+            records = load_catalog(self.catalog_path) if sources else None
+            self._snapshot = (records or {}, sources)
+        return self._snapshot
+
+    def _read_yaml(self, rel):
+        """The photo's yaml record, or None."""
+        from yaml_io import load_yaml, YAMLError
+
+        yaml_path = self.data_photos_dir / Path(rel).with_suffix('.yaml')
+        try:
+            record = load_yaml(yaml_path)
+        except (OSError, YAMLError):
+            return None
+        return record if isinstance(record, dict) else None
+
+    def read_many(self, photo_paths):
+        """Yield (photo_path, PhotoMetadata or None) in input order."""
+        records, sources = self._load_snapshot()
+
+        entries = []
+        stale = []
+        for photo_path in photo_paths:
+            photo_path = Path(photo_path)
+            try:
+                stat = photo_path.stat()
+                rel = photo_path.relative_to(self.photos_root).as_posix()
+            except (OSError, ValueError):
+                entries.append((photo_path, None))
+                stale.append(photo_path)
+                continue
+
+            record = None
+            if sources.get(rel) == (stat.st_size, stat.st_mtime_ns):
+                record = records.get(rel)
+                if record is None:
+                    record = self._read_yaml(rel)
+
+            if record is not None:
+                entries.append((photo_path, PhotoMetadata.from_dict(record, path=photo_path)))
+            else:
+                entries.append((photo_path, None))
+                stale.append(photo_path)
+
+        fresh_reads = self.fallback.read_many(stale)
+        for photo_path, metadata in entries:
+            if metadata is None:
+                photo_path, metadata = next(fresh_reads)
+            yield photo_path, metadata
+
+
+METADATA_SOURCES = ('jpeg', 'catalog')
+
+
+def metadata_source(name, photos_root, jobs=None):
+    """
+    Create a metadata backend.
+
+    Args:
+        name: 'jpeg' or 'catalog'
+        photos_root: photos/ directory the photo paths are under
+        jobs: Worker processes for photos that have to be parsed
+
+    Returns:
+        JpegSource or CatalogSource
+    """
+    if name == 'jpeg':
+        return JpegSource(jobs)
+    if name == 'catalog':
+        return CatalogSource(photos_root, jobs)
+    raise ValueError(f"Unknown metadata source: {name!r} (expected one of {', '.join(METADATA_SOURCES)})")
+
+
+def prune_metadata_cache():
+    """
+    Drop metadata cache entries for photos that no longer exist.
+
+    Returns:
+        Number of entries removed
+    """
+    return _get_cache().prune()
+
+
+def move_cached_metadata(old_path, new_path):
+    """
+    Carry a photo's metadata cache entry over to the path it was moved to.
+
+    Args:
+        old_path: Where the photo was
+        new_path: Where the photo is now
+    """
+    _get_cache().rename(old_path, new_path)
+
+
+def flush_metadata_cache():
+    """
+    Commit pending metadata cache writes.
+
+    The cache batches its writes into one transaction, which holds the
+    database's write lock until it commits (every COMMIT_EVERY writes or at
+    exit). Processes that stay up, like the watcher and the worker, call
+    this after each unit of work so other scripts can write the cache
+    meanwhile.
+    """
+    if _cache is not None:
+        _cache.commit()
+
+
 def matches_filters(metadata, filters):
     """
     Check if photo metadata matches filter criteria.
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Path lists for targeted runs of the atomic scripts.
+
+generate-photo-metadata-files, build-r2, build-and-sync-r2 and sync-to-r2
+accept --paths-from FILE (or - for stdin): one photo path per line, as
+written by ingest-photos --output-paths. Only those photos and the files
+derived from them are touched, instead of everything under photos/.
+
+Public API:
+    read_path_list(source) -> list
+        Non-empty, stripped lines from a file path or '-' (stdin).
+
+    to_photo_relative(path, photos_root) -> str or None
+        A listed path as a path relative to photos/, or None if it points
+        outside photos/.
+
+    read_photo_paths(source, photos_root) -> (list, list)
+        Both of the above: (relative paths, lines that were rejected).
+"""
+
+import sys
+from pathlib import Path
+
+
+def read_path_list(source):
+    """
+    Read a path list.
+
+    Args:
+        source: Path to a file with one path per line, or '-' for stdin
+
+    Returns:
+        List of paths (strings), blank lines dropped, order kept
+    """
+    if str(source) == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source) as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def to_photo_relative(path, photos_root):
+    """
+    Convert a listed path to a path relative to photos/.
+
+    Accepts absolute paths (what ingest-photos writes), paths relative to
+    the working directory (e.g. photos/2025/foo.jpg from the repo root) and
+    paths already relative to photos/ (2025/foo.jpg). The file doesn't have
+    to exist, so deleted photos can be listed too.
+
+    Args:
+        path: Path string from a path list
+        photos_root: The photos/ directory
+
+    Returns:
+        POSIX-style path relative to photos/, or None if outside photos/
+    """
+    photos_root = Path(photos_root).resolve()
+    candidate = Path(path)
+
+    if candidate.is_absolute():
+        candidates = [candidate]
+    else:
+        candidates = [Path.cwd() / candidate, photos_root / candidate]
+
+    for c in candidates:
+        try:
+            return c.resolve().relative_to(photos_root).as_posix()
+        except ValueError:
+            continue
+    return None
+
+
+def read_photo_paths(source, photos_root):
+    """
+    Read a path list and convert every entry to a photos/-relative path.
+
+    Args:
+        source: Path to the list, or '-' for stdin
+        photos_root: The photos/ directory
+
+    Returns:
+        (relative paths without duplicates, in listed order,
+         entries that are not under photos/)
+    """
+    relative = []
+    rejected = []
+    seen = set()
+    for line in read_path_list(source):
+        rel = to_photo_relative(line, photos_root)
+        if rel is None:
+            rejected.append(line)
+        elif rel not in seen:
+            seen.add(rel)
+            relative.append(rel)
+    return relative, rejected
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""
+Build manifest for the local r2/ tree.
+
+r2/.manifest.json records what every generated variant was built from, so
+build-r2 can decide what to rebuild by content rather than by mtime, and
+sync-to-r2 can reuse the output digests instead of re-hashing files:
+
+    {
+      "version": 1,
+      "sources": {
+        "2025/washington/foo.jpg":
+          {"size": ..., "mtime_ns": ..., "sha256": "..."}
+      },
+      "outputs": {
+        "small/2025/washington/foo.webp":
+          {"source": "2025/washington/foo.jpg", "source_sha256": "...",
+           "params": "...", "size": ..., "mtime_ns": ..., "md5": "..."}
+      }
+    }
+
+"sources" doubles as a digest cache: a source is only re-hashed when its
+size or mtime changes. An output is stale when its source hash or encode
+parameter hash differs from the recorded one. Output keys are the R2 object
+keys (paths relative to r2/), and "md5" matches the ETag R2 reports for a
+single-part upload.
+
+The manifest is a dotfile, so sync-to-r2 never uploads it.
+
+sync-to-r2 keeps its own state next to it in r2/.sync-state.json:
+
+    {
+      "version": 1,
+      "digests": {"small/2025/washington/foo.webp":
+                    {"size": ..., "mtime_ns": ..., "md5": "..."}},
+      "remote": {"bucket": "...", "complete": true,
+                 "objects": {"small/2025/washington/foo.webp":
+                               {"size": ..., "md5": "..."}}}
+    }
+
+"digests" caches the md5 of every local file sync has seen, by size and
+mtime, for files the build manifest doesn't cover. "remote" is sync's
+snapshot of what the bucket holds, so it doesn't have to list it each run;
+"complete" is set once the whole bucket has been listed into it.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+
+from atomic_file import write_json_atomic
+
+MANIFEST_NAME = '.manifest.json'
+MANIFEST_VERSION = 1
+SYNC_STATE_NAME = '.sync-state.json'
+SYNC_STATE_VERSION = 1
+
+# Read size for hashing large files
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path, algorithm='sha256'):
+    """Return the hex digest of a file's contents."""
+    h = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def params_hash(params):
+    """Return a stable short hash of a JSON-serializable parameter structure."""
+    encoded = json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def empty_manifest():
+    return {'version': MANIFEST_VERSION, 'sources': {}, 'outputs': {}}
+
+
+def load_manifest(r2_root):
+    """
+    Load r2/.manifest.json.
+
+    Returns:
+        Manifest dictionary; an empty one if the file is missing, unreadable
+        or from another manifest version
+    """
+    try:
+        with open(Path(r2_root) / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty_manifest()
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return empty_manifest()
+    manifest.setdefault('sources', {})
+    manifest.setdefault('outputs', {})
+    return manifest
+
+
+def save_manifest(r2_root, manifest):
+    """Atomically write r2/.manifest.json."""
+    write_json_atomic(Path(r2_root) / MANIFEST_NAME, manifest)
+
+
+def output_digest(manifest, key, stat):
+    """
+    Look up the recorded md5 of an output file.
+
+    Args:
+        manifest: Manifest dictionary
+        key: Output key (path relative to r2/)
+        stat: os.stat_result of the file on disk now
+
+    Returns:
+        Hex md5, or None if there's no record or the file changed since
+    """
+    record = manifest['outputs'].get(key)
+    if not record:
+        return None
+    if record.get('size') != stat.st_size or record.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return record.get('md5')
+
+
+def empty_sync_state():
+    return {'version': SYNC_STATE_VERSION, 'digests': {}}
+
+
+def load_sync_state(r2_root):
+    """
+    Load r2/.sync-state.json.
+
+    Returns:
+        Sync state dictionary; an empty one if the file is missing,
+        unreadable or from another version
+    """
+    try:
+        with open(Path(r2_root) / SYNC_STATE_NAME) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty_sync_state()
+
+    if not isinstance(state, dict) or state.get('version') != SYNC_STATE_VERSION:
+        return empty_sync_state()
+    state.setdefault('digests', {})
+    return state
+
+
+def save_sync_state(r2_root, state):
+    """Atomically write r2/.sync-state.json."""
+    write_json_atomic(Path(r2_root) / SYNC_STATE_NAME, state)
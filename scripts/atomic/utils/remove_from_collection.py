@@ -15,9 +15,11 @@ Usage:
 """
 
 import sys
-import yaml
 from pathlib import Path
 
+from collection_index import record_collection
+from yaml_io import load_yaml, write_yaml
+
 
 def main():
     if len(sys.argv) != 3:
@@ -34,8 +36,7 @@ def main():
         print(f"Error: collection '{collection_name}' not found at {col_file}", file=sys.stderr)
         sys.exit(1)
 
-    with open(col_file) as f:
-        col = yaml.safe_load(f) or {}
+    col = load_yaml(col_file) or {}
 
     photos_list = col.get('photos') or []
     new_photos = [p for p in photos_list if (p or {}).get('path') != photo_path]
@@ -51,8 +52,8 @@ def main():
     if changed_cover:
         col['cover_path'] = new_photos[0]['path'] if new_photos else ''
 
-    with open(col_file, 'w') as f:
-        yaml.dump(col, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_yaml(col_file, col)
+    record_collection(col_file, col)
 
     print(f"Removed '{photo_path}' from collection '{collection_name}'.")
     print(f"Photos remaining: {len(new_photos)}")
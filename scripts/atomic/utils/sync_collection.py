@@ -2,36 +2,30 @@
 
 import os
 import sys
-import yaml
 from pathlib import Path
 
 # Import photo metadata utilities
-from photo_metadata import get_metadata, matches_filters
+from photo_catalog import PhotoCatalog
+from collection_index import record_collection
+from yaml_io import load_yaml, write_yaml
 
 
-def scan_photos(project_root, filters):
-    """Scan all photos in the photos directory and return matching paths."""
-    photos_dir = project_root / 'photos'
-    matching_photos = []
+def scan_photos(project_root, filters, catalog=None, source='catalog'):
+    """
+    Return the sorted paths (relative to photos/) of photos matching filters.
 
-    if not photos_dir.exists():
-        return matching_photos
+    Args:
+        project_root: Repository root
+        filters: Collection filter dictionary
+        catalog: PhotoCatalog to query; built from photos/ if not given.
+            Pass one in to share a single metadata read across collections.
+        source: Metadata backend for building the catalog: 'catalog'
+            (data/catalog.json and yamls, JPG only where stale) or 'jpeg'
+    """
+    if catalog is None:
+        catalog = PhotoCatalog.from_photos(project_root / 'photos', source=source)
 
-    # Get all JPG files (exported from Lightroom)
-    image_extensions = {'.jpg', '.jpeg', '.JPG', '.JPEG'}
-
-    for photo_path in photos_dir.rglob('*'):
-        if photo_path.is_file() and photo_path.suffix in image_extensions:
-            # Read metadata
-            metadata = get_metadata(photo_path)
-
-            # Check if matches filters
-            if matches_filters(metadata, filters):
-                # Convert to relative path from photos directory
-                relative_path = photo_path.relative_to(photos_dir)
-                matching_photos.append(str(relative_path))
-
-    return sorted(matching_photos)
+    return catalog.query(filters)
 
 
 def load_collection(collection_file):
@@ -40,23 +34,22 @@ def load_collection(collection_file):
         print(f"Error: Collection file not found at {collection_file}")
         sys.exit(1)
 
-    with open(collection_file, 'r') as f:
-        collection = yaml.safe_load(f)
-        if collection is None:
-            print(f"Error: Invalid collection file")
-            sys.exit(1)
+    collection = load_yaml(collection_file)
+    if collection is None:
+        print(f"Error: Invalid collection file")
+        sys.exit(1)
 
     return collection
 
 
 def save_collection(collection_file, collection):
     """Save collection to YAML file."""
-    with open(collection_file, 'w') as f:
-        yaml.dump(collection, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_yaml(collection_file, collection)
+    record_collection(collection_file, collection)
 
 
-def sync_single_collection(collection_file, project_root):
-    """Sync a single collection."""
+def sync_single_collection(collection_file, project_root, catalog=None, source='catalog'):
+    """Sync a single collection, querying catalog if one is given."""
     collection = load_collection(collection_file)
     collection_name = collection_file.stem
 
@@ -69,7 +62,7 @@ def sync_single_collection(collection_file, project_root):
 
     # Scan photos
     print(f"Scanning photos for collection '{collection_name}'...")
-    matching_photos = scan_photos(project_root, filters)
+    matching_photos = scan_photos(project_root, filters, catalog, source)
 
     # Update collection
     old_count = len(collection.get('photos', []))
@@ -97,8 +90,16 @@ def sync_single_collection(collection_file, project_root):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: sync_collection.py <collection-name> | --all")
+    # Metadata comes from data/catalog.json and data/photos yamls unless
+    # they're out of date; --from-jpeg reads every photo instead
+    args = sys.argv[1:]
+    source = 'catalog'
+    if '--from-jpeg' in args:
+        args.remove('--from-jpeg')
+        source = 'jpeg'
+
+    if len(args) < 1:
+        print("Usage: sync_collection.py (<collection-name> | --all) [--from-jpeg]")
         sys.exit(1)
 
     # Get project root
@@ -107,14 +108,17 @@ def main():
     collections_dir = project_root / 'data' / 'collections'
 
     # Sync all or single collection
-    if sys.argv[1] == '--all':
+    if args[0] == '--all':
         print("\n=== Syncing All Filtered Collections ===\n")
 
         synced_count = 0
         skipped_count = 0
 
+        # Read every photo's metadata once and share it across collections
+        catalog = PhotoCatalog.from_photos(project_root / 'photos', source=source)
+
         for collection_file in sorted(collections_dir.glob('*.yaml')):
-            if sync_single_collection(collection_file, project_root):
+            if sync_single_collection(collection_file, project_root, catalog):
                 synced_count += 1
             else:
                 skipped_count += 1
@@ -125,11 +129,11 @@ def main():
         print(f"Skipped: {skipped_count} collections (manual)")
 
     else:
-        collection_name = sys.argv[1]
+        collection_name = args[0]
         collection_file = collections_dir / f'{collection_name}.yaml'
 
         print(f"\n=== Syncing Collection '{collection_name}' ===\n")
-        sync_single_collection(collection_file, project_root)
+        sync_single_collection(collection_file, project_root, source=source)
 
 
 if __name__ == '__main__':
@@ -12,7 +12,31 @@ Reads configuration from .r2config file in the project root.
 This script ensures R2 perfectly mirrors r2/ by:
 - Uploading new files that exist locally but not in R2
 - Deleting files from R2 that no longer exist locally
-- Re-uploading files where local version is newer
+- Re-uploading files whose content differs from the object in R2
+
+Changes are detected by content: each local file's md5 (reused from the
+build manifest or sync state's digest cache while its size and mtime are
+unchanged) is compared with the object's ETag, or with the md5 stored in
+x-amz-meta-md5 for multipart uploads. Unchanged bytes are never re-sent.
+
+What's in the bucket is read from a snapshot in r2/.sync-state.json that is
+updated after every successful upload and delete, so publishing one photo
+costs a request per change instead of a listing of the whole bucket. The
+first full sync (or one with --verify) lists the bucket and rebuilds the
+snapshot; run --verify occasionally, or after anything else has written to
+the bucket, to reconcile.
+
+--paths-from limits a sync to the variants of the listed photos: only
+those keys are compared, uploaded or deleted, and nothing is scanned or
+listed (without a snapshot, each key is looked up with head_object).
+
+Uploads run concurrently over one pooled client (--workers), large files go
+up as multipart uploads, and deletions are batched through delete_objects.
+Every object is retried with backoff on its own; objects that still fail are
+listed at the end (exit status 1) without aborting the rest of the sync.
+
+boto3 and botocore are imported when the client is created, so --help,
+usage and configuration errors don't wait on them.
 
 Usage:
     # Sync all of r2/ to the bucket
@@ -20,19 +44,44 @@ Usage:
 
     # Sync only r2/small/ to small/ in the bucket
     python3 scripts/utils/sync_to_r2.py small
+
+    # Use 32 concurrent transfers
+    python3 scripts/utils/sync_to_r2.py --workers 32
+
+    # List the bucket and reconcile the snapshot
+    python3 scripts/utils/sync_to_r2.py --verify
+
+    # Only the variants of the photos listed in a file (or '-' for stdin),
+    # e.g. the --output-paths file from ingest-photos
+    python3 scripts/utils/sync_to_r2.py --paths-from ingested.txt
 """
 
 import os
 import sys
+import time
+import random
+import argparse
 import mimetypes
 import configparser
 from pathlib import Path
-from datetime import datetime, timezone
-import boto3
-from botocore.client import Config
+
+from r2_manifest import load_manifest, load_sync_state, save_sync_state, output_digest, file_digest
+from photo_paths import read_photo_paths
 
 CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
+# Concurrent transfers (one pooled HTTP connection each)
+DEFAULT_WORKERS = 16
+# Files at least this large are uploaded in parts
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+# delete_objects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+# Per-object retries with exponential backoff + jitter
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+
 def load_r2_config():
     """Load R2 configuration from .r2config file."""
     script_path = Path(__file__).resolve()
@@ -63,10 +112,18 @@ def load_r2_config():
 
     return config['r2']
 
-def get_r2_client():
-    """Create and return an S3 client configured for Cloudflare R2."""
+def get_r2_client(workers=DEFAULT_WORKERS):
+    """
+    Create and return an S3 client configured for Cloudflare R2.
+
+    The client is shared by every transfer thread (boto3 clients are
+    thread-safe), with a connection pool sized to the worker count.
+    """
     r2_config = load_r2_config()
 
+    import boto3
+    from botocore.client import Config
+
     endpoint_url = f'https://{r2_config["account_id"]}.r2.cloudflarestorage.com'
 
     return boto3.client(
@@ -74,7 +131,7 @@ def get_r2_client():
         endpoint_url=endpoint_url,
         aws_access_key_id=r2_config['access_key_id'],
         aws_secret_access_key=r2_config['secret_access_key'],
-        config=Config(signature_version='s3v4'),
+        config=Config(signature_version='s3v4', max_pool_connections=max(workers, 10)),
         region_name='auto'
     ), r2_config['bucket_name']
 
@@ -83,7 +140,7 @@ def list_r2_objects(client, bucket_name, prefix=''):
     List all objects in R2 bucket with given prefix, handling pagination.
 
     Returns:
-        Dict mapping object key to object metadata (Size, LastModified)
+        Dict mapping object key to object metadata (Size, ETag)
     """
     objects = {}
     continuation_token = None
@@ -106,7 +163,7 @@ def list_r2_objects(client, bucket_name, prefix=''):
             for obj in response['Contents']:
                 objects[obj['Key']] = {
                     'Size': obj['Size'],
-                    'LastModified': obj['LastModified']
+                    'ETag': obj.get('ETag', '').strip('"')
                 }
 
         if response.get('IsTruncated'):
@@ -116,16 +173,18 @@ def list_r2_objects(client, bucket_name, prefix=''):
 
     return objects
 
-def get_local_files(directory, base_prefix):
+def get_local_files(directory, base_prefix, keys=None):
     """
     Get all files in local directory recursively.
 
     Args:
         directory: Path to directory to scan
         base_prefix: The prefix to prepend to relative paths (e.g., 'photos/dev/')
+        keys: Optional R2 keys to look up instead of scanning the directory;
+            keys with no local file are left out
 
     Returns:
-        Dict mapping R2 key to file metadata (size, mtime)
+        Dict mapping R2 key to file metadata (path, size, mtime_ns)
     """
     directory = Path(directory)
 
@@ -135,6 +194,21 @@ def get_local_files(directory, base_prefix):
 
     files = {}
 
+    if keys is not None:
+        for r2_key in keys:
+            file_path = directory / r2_key[len(base_prefix):]
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            files[r2_key] = {
+                'path': file_path,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'stat': stat,
+            }
+        return files
+
     for file_path in directory.rglob('*'):
         if file_path.is_file() and not file_path.name.startswith('.'):
             # Get path relative to the directory we're scanning
@@ -147,52 +221,349 @@ def get_local_files(directory, base_prefix):
             files[r2_key] = {
                 'path': file_path,
                 'size': stat.st_size,
-                'mtime': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+                'mtime_ns': stat.st_mtime_ns,
+                'stat': stat,
             }
 
     return files
 
-def upload_file(client, bucket_name, local_path, r2_key):
-    """Upload a file to R2."""
-    try:
-        content_type, _ = mimetypes.guess_type(str(local_path))
-        with open(local_path, 'rb') as f:
-            kwargs = {
-                'Bucket': bucket_name,
-                'Key': r2_key,
-                'Body': f,
-                'CacheControl': CACHE_CONTROL,
-            }
-            if content_type:
-                kwargs['ContentType'] = content_type
-            client.put_object(**kwargs)
-        return True
-    except Exception as e:
-        print(f"Error uploading {r2_key}: {e}", file=sys.stderr)
-        return False
+def head_r2_objects(client, bucket_name, r2_keys):
+    """
+    Look up specific objects with head_object instead of listing the bucket.
+
+    Returns:
+        Dict mapping each key that exists to its metadata (Size, ETag)
+    """
+    from botocore.exceptions import ClientError
+
+    objects = {}
+    for r2_key in r2_keys:
+        try:
+            head = client.head_object(Bucket=bucket_name, Key=r2_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                continue
+            raise
+        objects[r2_key] = {
+            'Size': head['ContentLength'],
+            'ETag': head.get('ETag', '').strip('"'),
+        }
+    return objects
+
+
+def variant_keys(r2_root, photo_paths):
+    """
+    R2 keys of every variant of the given photos.
+
+    Variants are the subdirectories of r2/ (small/, large/); a photo at
+    2025/foo.jpg maps to small/2025/foo.webp, large/2025/foo.webp.
+
+    Args:
+        r2_root: The local r2/ directory
+        photo_paths: Photo paths relative to photos/
+
+    Returns:
+        Sorted list of keys
+    """
+    r2_root = Path(r2_root)
+    variants = [d.name for d in r2_root.iterdir() if d.is_dir() and not d.name.startswith('.')] \
+        if r2_root.exists() else []
+    return sorted(
+        f"{variant}/{Path(rel).with_suffix('.webp').as_posix()}"
+        for variant in variants
+        for rel in photo_paths
+    )
+
+
+def attach_local_digests(local_files, manifest, state, prefix, keys=None):
+    """
+    Set local_files[key]['md5'] for every local file.
+
+    Digests come from the build manifest when it has a record for the file
+    at its current size and mtime, then from sync state's digest cache, and
+    are only computed from the file's bytes when neither is current. The
+    digest cache in state is updated in place.
+
+    Args:
+        local_files: Result of get_local_files
+        manifest: Build manifest (r2_manifest.load_manifest)
+        state: Sync state (r2_manifest.load_sync_state)
+        prefix: Key prefix being synced (cache entries under it for files
+            that no longer exist are dropped)
+        keys: For a targeted sync, the keys being synced; only these cache
+            entries are considered for dropping
+
+    Returns:
+        Number of files that had to be hashed
+    """
+    digests = state['digests']
+
+    hashed = 0
+    for key, meta in local_files.items():
+        stat = meta['stat']
+        md5 = output_digest(manifest, key, stat)
+        if md5 is None:
+            cached = digests.get(key)
+            if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+                md5 = cached['md5']
+            else:
+                md5 = file_digest(meta['path'], 'md5')
+                hashed += 1
+        digests[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'md5': md5}
+        meta['md5'] = md5
+
+    candidates = digests if keys is None else [k for k in keys if k in digests]
+    for key in [k for k in candidates if k.startswith(prefix) and k not in local_files]:
+        del digests[key]
+
+    return hashed
+
+
+def remote_snapshot(state, bucket_name):
+    """
+    Return the snapshot of bucket_name's objects kept in sync state.
+
+    The snapshot maps object key to {'md5', 'size'}. A snapshot taken of a
+    different bucket is discarded. It only describes the whole bucket once
+    the whole bucket has been listed (see mark_snapshot_complete); until
+    then it may hold just the objects seen by prefix or targeted syncs.
+
+    Returns:
+        (objects dict, whether it is a complete snapshot of the bucket)
+    """
+    remote = state.get('remote')
+    if remote and remote.get('bucket') == bucket_name:
+        return remote['objects'], bool(remote.get('complete'))
+    state['remote'] = {'bucket': bucket_name, 'complete': False, 'objects': {}}
+    return state['remote']['objects'], False
+
+
+def mark_snapshot_complete(state):
+    """Record that the snapshot now reflects a listing of the whole bucket."""
+    state['remote']['complete'] = True
+
+
+def record_listing(snapshot, r2_objects, prefix=''):
+    """
+    Replace the snapshot's entries under prefix with a fresh bucket listing.
+
+    With prefix=None the objects are only added, nothing is dropped.
+    """
+    if prefix is not None:
+        for key in [k for k in snapshot if k.startswith(prefix) and k not in r2_objects]:
+            del snapshot[key]
+    for key, obj in r2_objects.items():
+        snapshot[key] = {'md5': obj['ETag'], 'size': obj['Size']}
+
 
-def delete_file(client, bucket_name, r2_key):
-    """Delete a file from R2."""
+def list_snapshot_objects(snapshot, prefix=''):
+    """Return snapshot entries under prefix in list_r2_objects' format."""
+    return {
+        key: {'Size': obj['size'], 'ETag': obj['md5']}
+        for key, obj in snapshot.items()
+        if key.startswith(prefix)
+    }
+
+
+def remote_digest(client, bucket_name, r2_key, r2_meta):
+    """
+    Return the md5 of an object's contents as R2 knows it, or None.
+
+    For single-part uploads the ETag is the md5. Multipart ETags aren't, so
+    for those the md5 stored in x-amz-meta-md5 at upload time is fetched.
+    """
+    etag = r2_meta.get('ETag', '')
+    if etag and '-' not in etag:
+        return etag
     try:
-        client.delete_object(
-            Bucket=bucket_name,
-            Key=r2_key
-        )
-        return True
-    except Exception as e:
-        print(f"Error deleting {r2_key}: {e}", file=sys.stderr)
-        return False
+        head = client.head_object(Bucket=bucket_name, Key=r2_key)
+    except Exception:
+        return None
+    return head.get('Metadata', {}).get('md5')
+
+
+def with_retries(action, description):
+    """
+    Run action(), retrying with exponential backoff and jitter.
+
+    Args:
+        action: Zero-argument callable
+        description: What is being attempted, for error messages
+
+    Returns:
+        (result, None) on success, or (None, error message) once
+        MAX_ATTEMPTS have failed
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return action(), None
+        except Exception as e:
+            if attempt == MAX_ATTEMPTS:
+                return None, f"{description}: {e}"
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+
+def upload_file(client, bucket_name, local_path, r2_key, md5=None):
+    """
+    Upload a file to R2, retrying on failure.
+
+    Files of MULTIPART_THRESHOLD or more go up as a multipart upload. The
+    content md5 is stored as x-amz-meta-md5 so later syncs can compare
+    against it even when the ETag isn't an md5.
+
+    Returns:
+        None on success, or an error message
+    """
+    content_type, _ = mimetypes.guess_type(str(local_path))
+    extra_args = {
+        'CacheControl': CACHE_CONTROL,
+        'Metadata': {'md5': md5 or file_digest(local_path, 'md5')},
+    }
+    if content_type:
+        extra_args['ContentType'] = content_type
+
+    from boto3.s3.transfer import TransferConfig
+
+    transfer_config = TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=4,
+    )
+
+    _, error = with_retries(
+        lambda: client.upload_file(
+            str(local_path), bucket_name, r2_key,
+            ExtraArgs=extra_args, Config=transfer_config,
+        ),
+        f"uploading {r2_key}",
+    )
+    return error
+
+
+def upload_files(client, bucket_name, uploads, workers=DEFAULT_WORKERS, on_done=None):
+    """
+    Upload many files concurrently.
+
+    A failed object is reported and skipped; it never aborts the others.
+
+    Args:
+        client: S3 client (shared across threads)
+        bucket_name: Target bucket
+        uploads: List of (r2_key, local_path, md5) tuples
+        workers: Number of concurrent transfers
+        on_done: Optional callback(r2_key, error) run as each upload finishes
+            (error is None on success); called from the main thread
+
+    Returns:
+        Dict mapping each failed key to its error message
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def sync_directory(local_dir, r2_prefix=''):
+    failed = {}
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            ex.submit(upload_file, client, bucket_name, local_path, r2_key, md5): r2_key
+            for r2_key, local_path, md5 in uploads
+        }
+        for fut in as_completed(futures):
+            r2_key = futures[fut]
+            error = fut.result()
+            if error:
+                failed[r2_key] = error
+                print(f"Error {error}", file=sys.stderr)
+            if on_done:
+                on_done(r2_key, error)
+    return failed
+
+
+def delete_files(client, bucket_name, r2_keys):
+    """
+    Delete many objects with delete_objects, DELETE_BATCH_SIZE keys at a time.
+
+    Keys that R2 reports as failed are retried (with backoff) on their own;
+    a batch request that fails outright is retried as a whole.
+
+    Returns:
+        Dict mapping each key that could not be deleted to its error message
+    """
+    failed = {}
+
+    for start in range(0, len(r2_keys), DELETE_BATCH_SIZE):
+        remaining = list(r2_keys[start:start + DELETE_BATCH_SIZE])
+        errors = {}
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                response = client.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={'Objects': [{'Key': k} for k in remaining], 'Quiet': True},
+                )
+                errors = {e['Key']: f"deleting {e['Key']}: {e.get('Code')} {e.get('Message', '')}".strip()
+                          for e in response.get('Errors', [])}
+            except Exception as e:
+                errors = {k: f"deleting {k}: {e}" for k in remaining}
+
+            remaining = [k for k in remaining if k in errors]
+            if not remaining or attempt == MAX_ATTEMPTS:
+                break
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+
+        for k in remaining:
+            failed[k] = errors[k]
+            print(f"Error {errors[k]}", file=sys.stderr)
+
+    return failed
+
+
+def r2_root_for(local_dir, prefix):
+    """Return the r2/ root for a synced directory (local_dir minus prefix)."""
+    r2_root = Path(local_dir)
+    for _ in Path(prefix).parts:
+        r2_root = r2_root.parent
+    return r2_root
+
+
+def sync_directory(local_dir, r2_prefix='', workers=DEFAULT_WORKERS, client=None, bucket_name=None,
+                   verify=False, keys=None):
     """
     Sync local directory to R2.
 
+    The bucket's contents are taken from the remote snapshot in sync state,
+    which is updated as each upload or delete succeeds, so a sync costs one
+    request per change rather than a listing of the whole bucket. The bucket
+    is listed (and the snapshot rebuilt under r2_prefix) when there is no
+    snapshot yet or verify is set.
+
     Args:
         local_dir: Path to local directory to sync (e.g., 'photos')
         r2_prefix: Prefix to use in R2 (empty string means sync contents to bucket root)
+        workers: Number of concurrent transfers
+        client: S3 client to use instead of the .r2config one (e.g. a local
+            S3-compatible stand-in); requires bucket_name
+        bucket_name: Bucket to sync to when passing client
+        verify: List the bucket instead of trusting the snapshot
+        keys: Only sync these R2 keys (a targeted sync): each is uploaded if
+            it exists locally and differs, or deleted if it doesn't exist
+            locally. Neither side is scanned; without a snapshot (or with
+            verify) the keys are looked up individually.
+
+    Returns:
+        True if every transfer succeeded, False if any object failed
     """
-    client, bucket_name = get_r2_client()
+    if client is None:
+        client, bucket_name = get_r2_client(workers)
+
+    r2_root = r2_root_for(local_dir, r2_prefix.rstrip('/') + '/' if r2_prefix else '')
+    state = load_sync_state(r2_root)
+    try:
+        return _sync_directory(local_dir, r2_prefix, workers, client, bucket_name, verify,
+                               load_manifest(r2_root), state, keys)
+    finally:
+        save_sync_state(r2_root, state)
+
 
+def _sync_directory(local_dir, r2_prefix, workers, client, bucket_name, verify, manifest, state, keys):
     # Normalize the directory path
     local_dir = Path(local_dir)
 
@@ -206,9 +577,13 @@ def sync_directory(local_dir, r2_prefix=''):
         print(f"Syncing {local_dir} to R2 bucket '{bucket_name}' with prefix '{prefix}'")
     print("-" * 80)
 
+    if keys is not None:
+        keys = [k for k in keys if k.startswith(prefix)]
+        print(f"Targeted sync of {len(keys)} keys")
+
     # Get local files
     print("Scanning local files...")
-    local_files = get_local_files(local_dir, prefix)
+    local_files = get_local_files(local_dir, prefix, keys)
     print(f"Found {len(local_files)} local files")
     if local_files:
         print("Local file keys:")
@@ -218,8 +593,24 @@ def sync_directory(local_dir, r2_prefix=''):
             print(f"  ... and {len(local_files) - 5} more")
 
     # Get R2 files
-    print("\nListing R2 objects...")
-    r2_objects = list_r2_objects(client, bucket_name, prefix)
+    snapshot, complete = remote_snapshot(state, bucket_name)
+    if complete and not verify:
+        print("\nReading R2 objects from snapshot (--verify to list the bucket)...")
+        r2_objects = list_snapshot_objects(snapshot, prefix)
+        if keys is not None:
+            r2_objects = {k: r2_objects[k] for k in keys if k in r2_objects}
+    elif keys is not None:
+        print("\nLooking up R2 objects...")
+        r2_objects = head_r2_objects(client, bucket_name, keys)
+        for key in keys:
+            snapshot.pop(key, None)
+        record_listing(snapshot, r2_objects, prefix=None)
+    else:
+        print("\nListing R2 objects...")
+        r2_objects = list_r2_objects(client, bucket_name, prefix)
+        record_listing(snapshot, r2_objects, prefix)
+        if prefix == '':
+            mark_snapshot_complete(state)
     print(f"Found {len(r2_objects)} R2 objects with prefix '{prefix}'")
     if r2_objects:
         print("R2 object keys:")
@@ -233,20 +624,23 @@ def sync_directory(local_dir, r2_prefix=''):
     to_upload = []
     to_delete = []
 
+    # Compare content digests, not timestamps
+    hashed = attach_local_digests(local_files, manifest, state, prefix, keys)
+    if hashed:
+        print(f"Hashed {hashed} new or changed local files")
+
     # Check which local files need to be uploaded
     for local_key, local_meta in local_files.items():
         if local_key not in r2_objects:
             # File doesn't exist in R2
             to_upload.append((local_key, 'new'))
-        else:
-            # File exists - check if local is newer
-            r2_modified = r2_objects[local_key]['LastModified']
-            local_modified = local_meta['mtime']
-
-            # Compare timestamps (allowing 1 second tolerance for filesystem differences)
-            from datetime import timedelta
-            if local_modified > r2_modified + timedelta(seconds=1):
-                to_upload.append((local_key, 'updated'))
+            continue
+        md5 = remote_digest(client, bucket_name, local_key, r2_objects[local_key])
+        if md5:
+            snapshot[local_key]['md5'] = md5
+        if md5 != local_meta['md5']:
+            # File exists but its bytes differ
+            to_upload.append((local_key, 'updated'))
 
     # Check which R2 files need to be deleted
     for r2_key in r2_objects:
@@ -262,66 +656,106 @@ def sync_directory(local_dir, r2_prefix=''):
 
     if not to_upload and not to_delete:
         print("✓ Everything is already in sync!")
-        return
+        return True
+
+    failed = {}
 
     # Execute uploads
     if to_upload:
-        print(f"Uploading {len(to_upload)} files...")
-        uploaded = 0
-        for local_key, reason in to_upload:
-            local_meta = local_files[local_key]
-            size_mb = local_meta['size'] / (1024 * 1024)
-
-            print(f"  {'↑' if reason == 'new' else '↻'} {local_key} ({size_mb:.2f} MB) [{reason}]")
-
-            if upload_file(client, bucket_name, local_meta['path'], local_key):
-                uploaded += 1
+        print(f"Uploading {len(to_upload)} files ({workers} at a time)...")
+        reasons = dict(to_upload)
+
+        def report_upload(local_key, error):
+            if not error:
+                snapshot[local_key] = {'md5': local_files[local_key]['md5'],
+                                       'size': local_files[local_key]['size']}
+            size_mb = local_files[local_key]['size'] / (1024 * 1024)
+            reason = reasons[local_key]
+            symbol = '!' if error else ('↑' if reason == 'new' else '↻')
+            print(f"  {symbol} {local_key} ({size_mb:.2f} MB) [{reason}]")
+
+        upload_failures = upload_files(
+            client, bucket_name,
+            [(local_key, local_files[local_key]['path'], local_files[local_key]['md5'])
+             for local_key, _ in to_upload],
+            workers=workers, on_done=report_upload,
+        )
+        failed.update(upload_failures)
 
-        print(f"✓ Uploaded {uploaded}/{len(to_upload)} files")
+        print(f"✓ Uploaded {len(to_upload) - len(upload_failures)}/{len(to_upload)} files")
         print()
 
     # Execute deletions
     if to_delete:
         print(f"Deleting {len(to_delete)} files...")
-        deleted = 0
         for r2_key in to_delete:
             print(f"  ✗ {r2_key}")
 
-            if delete_file(client, bucket_name, r2_key):
-                deleted += 1
+        delete_failures = delete_files(client, bucket_name, to_delete)
+        failed.update(delete_failures)
+        for r2_key in to_delete:
+            if r2_key not in delete_failures:
+                snapshot.pop(r2_key, None)
 
-        print(f"✓ Deleted {deleted}/{len(to_delete)} files")
+        print(f"✓ Deleted {len(to_delete) - len(delete_failures)}/{len(to_delete)} files")
         print()
 
     print("-" * 80)
+    if failed:
+        print(f"✗ Sync finished with {len(failed)} failed object(s):", file=sys.stderr)
+        for r2_key in sorted(failed):
+            print(f"  ! {failed[r2_key]}", file=sys.stderr)
+        return False
+
     print("✓ Sync complete!")
+    return True
 
 def main():
     # Get project root (same as config loading)
     script_path = Path(__file__).resolve()
     project_root = script_path.parent.parent.parent.parent
 
+    parser = argparse.ArgumentParser(
+        description='Mirror the local r2/ directory (or one subdirectory of it) to the R2 bucket',
+        epilog="""
+Examples:
+  %(prog)s          # sync all of r2/
+  %(prog)s small    # sync r2/small/ to small/
+  %(prog)s large    # sync r2/large/ to large/
+  %(prog)s --verify # list the bucket instead of trusting the snapshot
+  %(prog)s --paths-from ingested.txt   # only the variants of these photos
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('subdirectory', nargs='?', help='Only sync r2/<subdirectory> to <subdirectory>/ in R2')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent transfers (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--verify', action='store_true',
+                        help='List the whole bucket and reconcile the local snapshot of it')
+    parser.add_argument('--paths-from', metavar='FILE',
+                        help="Only sync the variants of the photos listed in FILE, one per line ('-' for stdin)")
+    args = parser.parse_args()
+
     # Determine what to sync
-    if len(sys.argv) == 1:
+    if args.subdirectory is None:
         # No argument: sync entire r2/ directory
         local_dir = project_root / 'r2'
         r2_prefix = ''
-    elif len(sys.argv) == 2:
-        # Subdirectory provided: sync r2/<subdir> to <subdir>/ in R2
-        subdir = sys.argv[1]
-        local_dir = project_root / 'r2' / subdir
-        r2_prefix = subdir
     else:
-        print("Usage: python3 scripts/utils/sync_to_r2.py [subdirectory]", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("Examples:", file=sys.stderr)
-        print("  python3 scripts/utils/sync_to_r2.py          # sync all of r2/", file=sys.stderr)
-        print("  python3 scripts/utils/sync_to_r2.py small    # sync r2/small/ to small/", file=sys.stderr)
-        print("  python3 scripts/utils/sync_to_r2.py large    # sync r2/large/ to large/", file=sys.stderr)
-        sys.exit(1)
+        # Subdirectory provided: sync r2/<subdir> to <subdir>/ in R2
+        local_dir = project_root / 'r2' / args.subdirectory
+        r2_prefix = args.subdirectory
+
+    keys = None
+    if args.paths_from:
+        photo_paths, rejected = read_photo_paths(args.paths_from, project_root / 'photos')
+        for path in rejected:
+            print(f"Warning: not within photos/, ignoring: {path}", file=sys.stderr)
+        keys = variant_keys(project_root / 'r2', photo_paths)
 
     try:
-        sync_directory(local_dir, r2_prefix)
+        if not sync_directory(local_dir, r2_prefix, workers=args.workers, verify=args.verify, keys=keys):
+            sys.exit(1)
     except KeyboardInterrupt:
         print("\n\nSync interrupted by user", file=sys.stderr)
         sys.exit(1)
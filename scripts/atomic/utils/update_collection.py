@@ -10,10 +10,12 @@ Usage:
 """
 
 import sys
-import yaml
 import argparse
 from pathlib import Path
 
+from collection_index import record_collection
+from yaml_io import load_yaml, write_yaml
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -41,8 +43,7 @@ def main():
         print(f"Error: collection '{args.collection_name}' not found at {col_file}", file=sys.stderr)
         sys.exit(1)
 
-    with open(col_file) as f:
-        col = yaml.safe_load(f) or {}
+    col = load_yaml(col_file) or {}
 
     if args.title is not None:
         col['title'] = args.title
@@ -51,8 +52,8 @@ def main():
     if args.cover_path is not None:
         col['cover_path'] = args.cover_path
 
-    with open(col_file, 'w') as f:
-        yaml.dump(col, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    write_yaml(col_file, col)
+    record_collection(col_file, col)
 
     print(f"Updated collection '{args.collection_name}'.")
     if args.title is not None:
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+"""
+Watch photos/imports/ and ingest, generate and sync each photo as it lands.
+
+A long-running equivalent of the ingest-and-sync workflow for exports
+arriving one at a time. Once a file in imports/ has kept the same size and
+mtime for --settle seconds (so a half-written Lightroom export is never
+picked up), it goes through the same stages in-process:
+
+    ingest-photos → add-to-collection (with --collection) →
+    generate-photo-metadata-files → build-and-sync-r2
+
+each run on just the photos that became ready together. The R2 client, the
+metadata cache connection and the imported modules stay loaded between
+photos, and the build manifest and remote snapshot are read from r2/ rather
+than listing the bucket, so a new export is live within seconds.
+
+File events come from watchdog (inotify, FSEvents, ...) when it is
+installed; otherwise imports/ is polled every --interval seconds. Either
+way, listing one directory is all the watcher does while idle.
+
+Photos that can't be ingested (unreadable metadata, two exports with the
+same destination, or with --block-duplicates a near-duplicate of a photo
+already in the library) stay in imports/ and are reported once; they are
+retried when the file changes. Photos that were moved into the library but
+failed to generate or sync are retried with the next batch, or after
+RETRY_INTERVAL seconds if none arrives.
+
+Usage:
+    python3 scripts/utils/watch_imports.py [--collection NAME]
+        [--settle 2] [--interval 1] [--workers 16] [--jobs N] [--block-duplicates]
+
+Requires .r2config (see sync_to_r2.py). Optional: pip3 install watchdog
+"""
+
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+
+from ingest_photos import IMAGE_EXTENSIONS, plan_ingest, execute_move
+from add_to_collection import load_or_create_collection, add_photo_to_collection, save_collection
+from generate_photo_metadata_files import generate_metadata_files
+from build_and_sync_r2 import build_and_sync
+from parallel import default_jobs
+from photo_metadata import flush_metadata_cache
+from sync_to_r2 import DEFAULT_WORKERS, get_r2_client
+
+# With watchdog, how often to rescan anyway in case an event was missed
+RESCAN_INTERVAL = 30
+
+# Seconds before photos that failed to generate or sync are tried again
+RETRY_INTERVAL = 60
+
+
+def _start_observer(directory, wake):
+    """
+    Start a watchdog observer that sets wake on any change in directory.
+
+    Returns:
+        The running observer, or None if watchdog isn't installed
+    """
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake.set()
+
+    observer = Observer()
+    observer.schedule(WakeHandler(), str(directory), recursive=False)
+    observer.start()
+    return observer
+
+
+class StableFiles:
+    """
+    Tracks files in a directory until their size and mtime stop changing.
+
+    Attributes:
+        directory: Directory being watched
+        settle: Seconds a file must stay unchanged before it's ready
+    """
+    def __init__(self, directory, settle):
+        self.directory = Path(directory)
+        self.settle = settle
+        self.pending = {}   # path -> ((size, mtime_ns), first seen with that stamp)
+        self.rejected = {}  # path -> (size, mtime_ns) when it was last rejected
+
+    def scan(self, now=None):
+        """
+        List the directory and return the files that have settled.
+
+        Args:
+            now: Current time.monotonic() (for tests)
+
+        Returns:
+            Sorted list of Paths that have been unchanged for `settle`
+            seconds and weren't rejected in their current state
+        """
+        now = time.monotonic() if now is None else now
+        seen = set()
+        ready = []
+        try:
+            entries = list(self.directory.iterdir())
+        except OSError:
+            entries = []
+
+        for path in entries:
+            if path.name.startswith('.') or path.suffix not in IMAGE_EXTENSIONS:
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if not path.is_file() or st.st_size == 0:
+                continue
+            stamp = (st.st_size, st.st_mtime_ns)
+            seen.add(path)
+            if self.rejected.get(path) == stamp:
+                continue
+
+            previous = self.pending.get(path)
+            if previous is None or previous[0] != stamp:
+                self.pending[path] = (stamp, now)
+            elif now - previous[1] >= self.settle:
+                ready.append(path)
+
+        for path in [p for p in self.pending if p not in seen]:
+            del self.pending[path]
+        for path in [p for p in self.rejected if p not in seen]:
+            del self.rejected[path]
+        return sorted(ready)
+
+    def done(self, path):
+        """Forget a file that was ingested."""
+        self.pending.pop(path, None)
+
+    def reject(self, path):
+        """Skip a file until it changes."""
+        self.pending.pop(path, None)
+        try:
+            st = path.stat()
+        except OSError:
+            return
+        self.rejected[path] = (st.st_size, st.st_mtime_ns)
+
+
+def process_batch(paths, photos_root, files, collection=None, workers=DEFAULT_WORKERS, jobs=None,
+                  client=None, bucket_name=None, block_duplicates=False, unpublished=None):
+    """
+    Ingest settled imports and carry them through to R2.
+
+    Args:
+        paths: Settled files in imports/ (may be empty when only retrying)
+        photos_root: photos/ root
+        files: StableFiles tracking imports/
+        collection: Optional collection name to add the photos to
+        workers: Concurrent uploads
+        jobs: Upper bound on encoder processes
+        client: S3 client
+        bucket_name: Bucket to sync to
+        block_duplicates: Leave near-duplicates in imports/ (see plan_ingest)
+        unpublished: List of photo paths (relative to photos_root) already
+            moved into the library but not yet generated and synced. They
+            go through the later stages with this batch, photos moved by
+            this batch are appended, and it's emptied once they all made
+            it, so after a failure it holds what still needs doing.
+
+    Returns:
+        List of photo paths relative to photos_root that were published
+        (empty if generating or syncing any of them failed)
+    """
+    repo_root = photos_root.parent
+    if unpublished is None:
+        unpublished = []
+    plan = plan_ingest(paths, photos_root, jobs=1, block_duplicates=block_duplicates) if paths else []
+
+    for entry in plan:
+        if entry['action'] in ('error', 'collision', 'duplicate'):
+            print(f"✗ {entry['source'].name}\n  {entry['error']}", file=sys.stderr)
+            files.reject(entry['source'])
+            continue
+        success, message = execute_move(entry, photos_root)
+        print(f"{'✓' if success else '✗'} {entry['source'].name}\n  {message}")
+        if entry['duplicate_of'] is not None:
+            print(f"  ⚠ Looks like a duplicate of {entry['duplicate_of']} (hash distance {entry['distance']})")
+        if success:
+            files.done(entry['source'])
+            unpublished.append(str(entry['dest'].relative_to(photos_root)))
+        else:
+            files.reject(entry['source'])
+
+    ingested = sorted(set(unpublished))
+    if not ingested:
+        return ingested
+
+    if collection:
+        collection_file = repo_root / 'data' / 'collections' / f'{collection}.yaml'
+        col = load_or_create_collection(collection_file, collection)
+        existing_paths = {photo['path'] for photo in col['photos']}
+        added = [p for p in ingested if add_photo_to_collection(col, p, existing_paths)]
+        if added:
+            save_collection(collection_file, col)
+            print(f"Added {len(added)} photo(s) to '{collection}'")
+
+    # A handful of photos at a time: don't spin up more encoders than that
+    jobs = min(jobs or default_jobs(), len(ingested))
+    stats = generate_metadata_files(photos_root, repo_root / 'data' / 'photos', jobs=jobs, only=ingested)
+    synced = build_and_sync(photos_root, repo_root / 'r2', workers=workers, jobs=jobs,
+                            client=client, bucket_name=bucket_name, only=ingested)
+    if stats['errors'] or not synced:
+        return []
+    del unpublished[:]
+    return ingested
+
+
+def watch(photos_root, collection=None, settle=2.0, interval=1.0, workers=DEFAULT_WORKERS, jobs=None,
+          client=None, bucket_name=None, block_duplicates=False):
+    """
+    Watch photos_root/imports until interrupted.
+
+    Args:
+        photos_root: photos/ root
+        collection: Optional collection name to add ingested photos to
+        settle: Seconds a file's size and mtime must hold before it's ingested
+        interval: Polling interval when watchdog isn't available
+        workers: Concurrent uploads
+        jobs: Upper bound on encoder processes
+        client: S3 client to use instead of the .r2config one; requires
+            bucket_name
+        bucket_name: Bucket to sync to when passing client
+        block_duplicates: Leave near-duplicates in imports/ (see plan_ingest)
+    """
+    photos_root = Path(photos_root)
+    imports_dir = photos_root / 'imports'
+    imports_dir.mkdir(parents=True, exist_ok=True)
+    if client is None:
+        client, bucket_name = get_r2_client(workers)
+
+    wake = threading.Event()
+    observer = _start_observer(imports_dir, wake)
+    if observer is not None:
+        idle_timeout = RESCAN_INTERVAL
+        print(f"Watching {imports_dir} (file events)")
+    else:
+        idle_timeout = interval
+        print(f"Watching {imports_dir} (polling every {interval:g}s; pip3 install watchdog for file events)")
+    if collection:
+        print(f"New photos go into collection '{collection}'")
+
+    files = StableFiles(imports_dir, settle)
+    unpublished = []
+    retry_at = None
+    try:
+        while True:
+            ready = files.scan()
+            retry = bool(unpublished) and time.monotonic() >= retry_at
+            if ready or retry:
+                if ready:
+                    print(f"\n=== {len(ready)} new photo(s) ===")
+                if unpublished:
+                    print(f"\n=== Retrying {len(unpublished)} photo(s) that didn't make it to R2 ===")
+                try:
+                    process_batch(ready, photos_root, files, collection=collection, workers=workers, jobs=jobs,
+                                  client=client, bucket_name=bucket_name, block_duplicates=block_duplicates,
+                                  unpublished=unpublished)
+                except Exception as e:
+                    # Keep watching: imports that weren't moved stay in
+                    # imports/, moved ones are retried below
+                    print(f"Error: {e}", file=sys.stderr)
+                    for path in ready:
+                        if path.exists():
+                            files.reject(path)
+                finally:
+                    # Don't hold the cache's write lock while idle
+                    flush_metadata_cache()
+                if unpublished:
+                    retry_at = time.monotonic() + RETRY_INTERVAL
+                    print(f"\nNot generated and synced yet (retrying in {RETRY_INTERVAL}s, or run "
+                          "generate-photo-metadata-files and build-and-sync-r2 with --paths-from):",
+                          file=sys.stderr)
+                    for rel in unpublished:
+                        print(f"  {rel}", file=sys.stderr)
+                print(f"\nWatching {imports_dir}")
+                continue
+
+            # Something is still being written: check back once it could
+            # have settled
+            timeout = min(idle_timeout, settle / 2) if files.pending else idle_timeout
+            if unpublished:
+                timeout = max(0, min(timeout, retry_at - time.monotonic()))
+            wake.wait(timeout)
+            wake.clear()
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def main():
+    repo_root = Path(__file__).resolve().parent.parent.parent.parent
+    photos_root = repo_root / 'photos'
+
+    parser = argparse.ArgumentParser(
+        description='Watch photos/imports/ and ingest, generate and sync each photo as it arrives',
+    )
+    parser.add_argument('--collection', metavar='NAME', help='Add ingested photos to this collection')
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help="Seconds an import's size must hold before it's ingested (default: 2)")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='Polling interval without watchdog (default: 1)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent transfers (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Encoder processes (default: one per core)')
+    parser.add_argument('--block-duplicates', action='store_true',
+                        help='Leave near-duplicates of existing photos in imports/')
+    args = parser.parse_args()
+
+    try:
+        watch(photos_root, collection=args.collection, settle=args.settle, interval=args.interval,
+              workers=args.workers, jobs=args.jobs, block_duplicates=args.block_duplicates)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+"""
+Resident worker that runs the atomic scripts in-process over stdio.
+
+Every atomic call from the interface used to spawn a bash wrapper and a
+fresh Python interpreter, which then re-imported PyYAML (and PIL, boto3,
+...) before doing a few milliseconds of work. The worker pays that cost
+once: it imports the scripts' modules at startup and runs each request by
+calling the module's main() with sys.argv set as the wrapper would, so
+behavior, output and exit codes are exactly those of the CLI. Requests run
+one at a time, in order.
+
+Between requests it keeps parsed yamls in memory (yaml_io's load cache,
+validated against each file's size, mtime and inode, so edits made by
+other processes are always seen) and the metadata cache connection open,
+committing the cache after each request.
+Writes go through the same atomic temp file + rename as the CLI.
+
+Protocol: JSON-RPC 2.0, one message per line on stdin / stdout.
+
+    → {"jsonrpc": "2.0", "id": 1, "method": "run",
+       "params": {"script": "atomic/add-to-collection",
+                  "args": ["favorites", "2025/wa/foo.jpg"]}}
+    ← {"jsonrpc": "2.0", "id": 1,
+       "result": {"ok": true, "code": 0, "stdout": "...", "stderr": ""}}
+
+    → {"jsonrpc": "2.0", "id": 2, "method": "scripts"}
+    ← {"jsonrpc": "2.0", "id": 2, "result": ["atomic/add-to-collection", ...]}
+
+A script the worker doesn't run in-process (long-running ones like
+ingest-photos or build-and-sync-r2) gets a -32601 error, and the caller
+should spawn it instead.
+
+Usage:
+    python3 scripts/atomic/utils/worker.py
+"""
+
+import io
+import sys
+import json
+import traceback
+import importlib
+from contextlib import redirect_stdout, redirect_stderr
+
+import yaml_io
+from photo_metadata import flush_metadata_cache
+
+# Wrapper name (relative to scripts/) → (module whose main() it runs,
+# arguments the wrapper passes before its own)
+SCRIPTS = {
+    'atomic/add-to-collection': ('add_to_collection', []),
+    'atomic/create-collection': ('create_collection', []),
+    'atomic/delete-photo': ('delete_photo', []),
+    'atomic/rebuild-collection-index': ('collection_index', ['--rebuild']),
+    'atomic/remove-from-collection': ('remove_from_collection', []),
+    'atomic/sync-collection': ('sync_collection', []),
+    'atomic/update-collection': ('update_collection', []),
+}
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+class RequestError(Exception):
+    """A JSON-RPC error to send back for one request."""
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def run_script(script, args):
+    """
+    Run an atomic script's main() in-process.
+
+    Args:
+        script: Wrapper name, e.g. 'atomic/delete-photo'
+        args: Command-line arguments
+
+    Returns:
+        Dict with ok, code, stdout and stderr, as the CLI would produce
+    """
+    if script not in SCRIPTS:
+        raise RequestError(METHOD_NOT_FOUND, f"Not run in-process: {script}")
+    if not isinstance(args, list) or not all(isinstance(a, str) for a in args):
+        raise RequestError(INVALID_PARAMS, "args must be a list of strings")
+
+    module_name, wrapper_args = SCRIPTS[script]
+    module = importlib.import_module(module_name)
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    sys.argv = [module.__file__] + wrapper_args + args
+    # The real stdin carries the requests; `--paths-from -` reads nothing
+    sys.stdin = io.StringIO()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                result = module.main()
+                code = result if isinstance(result, int) else 0
+            except SystemExit as e:
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+        # Commit now rather than at exit, which may be hours away, so the
+        # CLI scripts can write the cache in between
+        flush_metadata_cache()
+
+    return {'ok': code == 0, 'code': code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+def handle(message):
+    """
+    Handle one decoded request.
+
+    Returns:
+        The result to send back
+
+    Raises:
+        RequestError: For malformed requests and unknown methods/scripts
+    """
+    if not isinstance(message, dict) or not isinstance(message.get('method'), str):
+        raise RequestError(INVALID_REQUEST, "Invalid request")
+    params = message.get('params') or {}
+    if message['method'] == 'run':
+        if not isinstance(params, dict) or not isinstance(params.get('script'), str):
+            raise RequestError(INVALID_PARAMS, "params.script is required")
+        return run_script(params['script'], params.get('args', []))
+    if message['method'] == 'scripts':
+        return sorted(SCRIPTS)
+    raise RequestError(METHOD_NOT_FOUND, f"Unknown method: {message['method']}")
+
+
+def serve(stdin, stdout):
+    """Answer requests from stdin until it closes."""
+    for line in stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                raise RequestError(PARSE_ERROR, "Parse error")
+            if isinstance(message, dict):
+                request_id = message.get('id')
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': handle(message)}
+        except RequestError as e:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': e.message}}
+        stdout.write(json.dumps(response) + '\n')
+        stdout.flush()
+
+
+def main():
+    # Pay every import up front so the first request is as fast as the rest
+    for module_name, _ in SCRIPTS.values():
+        importlib.import_module(module_name)
+    yaml_io.enable_load_cache()
+
+    # Responses are the only thing written to the real stdout; a script
+    # printing outside a request would corrupt the stream
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        serve(sys.stdin, protocol_out)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+"""
+Shared YAML reading and writing for the atomic utils.
+
+Uses PyYAML's libyaml bindings (CSafeLoader / CSafeDumper) when PyYAML was
+built with them, which parse and emit several times faster than the
+pure-Python implementation, and falls back to SafeLoader / SafeDumper
+otherwise. Output is byte-identical to the
+yaml.dump(..., default_flow_style=False, sort_keys=False, allow_unicode=True)
+calls it replaces, so files don't churn when switching implementations.
+The two emitters only differ on strings that contain control characters
+(including newlines and tabs), characters outside the Basic Multilingual
+Plane such as emoji, or a few special code points: libyaml escapes some
+of these differently and wraps long double-quoted strings at other
+points. Documents containing such a string are rendered with the Python
+dumper; everything else goes through libyaml.
+
+PyYAML itself is imported on the first load or dump, so scripts that import
+this module but exit early (usage errors, nothing to do) don't pay for it.
+
+Public API:
+    load_yaml(path) -> object
+        Parse a YAML file (None for an empty document).
+
+    loads_yaml(text) -> object
+        Parse a YAML string.
+
+    dump_yaml(data) -> str
+        Render data in the repo's YAML style.
+
+    write_yaml(path, data)
+        Render data and write it atomically (temp file + rename).
+
+    enable_load_cache(max_entries=LOAD_CACHE_SIZE)
+        Keep parsed files in memory for long-running processes; see below.
+
+    YAMLError
+        Raised for parse errors (chained from PyYAML's exception).
+
+    LIBYAML
+        True if the libyaml bindings are in use.
+
+Example:
+    from yaml_io import load_yaml, write_yaml
+
+    col = load_yaml(col_file) or {}
+    col['title'] = 'Street'
+    write_yaml(col_file, col)
+
+Load cache:
+    A long-running process (the interface worker) can call
+    enable_load_cache() so load_yaml() keeps every file it parses, keyed by
+    path and validated against the file's size, mtime and inode on each
+    call. A file changed by anyone, including an atomic rename over it, is
+    re-parsed. Each call returns a fresh copy (unpickled, which is many
+    times cheaper than parsing), so callers can mutate what they get.
+"""
+
+import os
+import re
+import pickle
+from collections import OrderedDict
+
+from atomic_file import write_file_atomic
+
+LOAD_CACHE_SIZE = 4096
+
+DUMP_OPTIONS = {'default_flow_style': False, 'sort_keys': False, 'allow_unicode': True}
+
+# Any character outside these ranges can make libyaml's output differ from
+# the Python emitter's: controls, NEL, line/paragraph separators, BOM,
+# non-characters and everything beyond the BMP (compiled by _yaml(); the
+# character class takes a few ms to build)
+_LIBYAML_DIVERGENT_PATTERN = '[^\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd]'
+_LIBYAML_DIVERGENT = None
+
+
+def _libyaml_safe(data):
+    """True if libyaml renders data exactly like the Python emitter."""
+    if isinstance(data, str):
+        return _LIBYAML_DIVERGENT.search(data) is None
+    if isinstance(data, dict):
+        return all(_libyaml_safe(k) and _libyaml_safe(v) for k, v in data.items())
+    if isinstance(data, (list, tuple)):
+        return all(_libyaml_safe(v) for v in data)
+    return True
+
+
+class YAMLError(Exception):
+    """A document that isn't valid YAML (raised from PyYAML's YAMLError)."""
+
+
+# PyYAML and the loader / dumper classes, set by _yaml() on first use
+_pyyaml = None
+Loader = None
+Dumper = None
+
+
+def _yaml():
+    """Import PyYAML on first use, picking the libyaml classes if built with them."""
+    global _pyyaml, Loader, Dumper, LIBYAML, _LIBYAML_DIVERGENT
+    if _pyyaml is None:
+        import yaml
+        _LIBYAML_DIVERGENT = re.compile(_LIBYAML_DIVERGENT_PATTERN)
+        LIBYAML = yaml.__with_libyaml__
+        if LIBYAML:
+            Loader, Dumper = yaml.CSafeLoader, yaml.CSafeDumper
+        else:
+            Loader, Dumper = yaml.SafeLoader, yaml.SafeDumper
+        _pyyaml = yaml
+    return _pyyaml
+
+
+def __getattr__(name):
+    # LIBYAML is only known once PyYAML has been imported
+    if name == 'LIBYAML':
+        _yaml()
+        return LIBYAML
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _parse(stream):
+    yaml = _yaml()
+    try:
+        return yaml.load(stream, Loader=Loader)
+    except yaml.YAMLError as e:
+        raise YAMLError(str(e)) from e
+
+
+# abspath -> ((size, mtime_ns, inode), pickled document); None when disabled
+_load_cache = None
+_load_cache_size = LOAD_CACHE_SIZE
+
+
+def enable_load_cache(max_entries=LOAD_CACHE_SIZE):
+    """
+    Keep parsed documents in memory, re-parsing a file only when it changes.
+
+    Args:
+        max_entries: Files kept before the least recently loaded is dropped
+    """
+    global _load_cache, _load_cache_size
+    _load_cache = OrderedDict()
+    _load_cache_size = max_entries
+
+
+def load_yaml(path):
+    """
+    Parse a YAML file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Parsed document (None if the file is empty)
+    """
+    with open(path, 'rb') as f:
+        if _load_cache is None:
+            return _parse(f)
+
+        st = os.fstat(f.fileno())
+        stamp = (st.st_size, st.st_mtime_ns, st.st_ino)
+        key = os.path.abspath(path)
+        cached = _load_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            _load_cache.move_to_end(key)
+            return pickle.loads(cached[1])
+
+        data = _parse(f)
+
+    _load_cache[key] = (stamp, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    _load_cache.move_to_end(key)
+    while len(_load_cache) > _load_cache_size:
+        _load_cache.popitem(last=False)
+    return data
+
+
+def loads_yaml(text):
+    """Parse a YAML document from a string."""
+    return _parse(text)
+
+
+def dump_yaml(data):
+    """
+    Render data as YAML in the repo's style (block style, keys in insertion
+    order, unicode kept as-is).
+
+    Returns:
+        YAML text
+    """
+    yaml = _yaml()
+    dumper = Dumper if _libyaml_safe(data) else yaml.SafeDumper
+    return yaml.dump(data, Dumper=dumper, **DUMP_OPTIONS)
+
+
+def write_yaml(path, data):
+    """
+    Write data as YAML via a temp file + rename so readers never see a
+    partially written file.
+
+    Args:
+        path: Destination path (parent directories are created)
+        data: Data to render
+    """
+    write_file_atomic(path, dump_yaml(data).encode('utf-8'))